@@ -0,0 +1,118 @@
+"""
+업종 통계 CSV 적재 벤치마크
+합성 seoul_business_stats.csv (1990-01-01 부터 --days 일 × 업종 --industries 개 중 하루 약 35%) 를 임시 디렉터리에 만들고
+  기존: pd.read_csv (형식 추론) → build_cube
+  현재: business_stats.read_csv (고정 타입 · 날짜 형식) → build_cube
+  사이드카: load_cube 가 Parquet 사이드카에서 큐브를 바로 읽는 경우
+의 시간을 비교하고 세 큐브가 같은지 확인한다. --app 을 주면 business_dashboard 의 첫 AppTest 실행 시간도
+새 프로세스에서 사이드카 없이 / 있을 때로 나눠 잰다.
+
+예) python benchmarks/bench_business_cube.py --repeat 3 --app
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import business_stats  # noqa: E402
+
+DATA_FILE = "seoul_business_stats.csv"
+
+
+def synthetic_csv(path, days, industries, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("1990-01-01", periods=days, freq="D")
+    names = np.array([f"업종{i:03d}" for i in range(industries)], dtype=object)
+    day = np.repeat(dates.values, industries)
+    industry = np.tile(names, days)
+    keep = rng.random(len(day)) < 0.35
+    weight = np.tile(rng.gamma(1.5, 2, industries), days)[keep]
+    df = pd.DataFrame({
+        "일자": pd.to_datetime(day[keep]).strftime("%Y-%m-%d"),
+        "업종명": industry[keep],
+        "창업수": rng.poisson(weight),
+        "폐업수": rng.poisson(weight * 0.8),
+    })
+    df.to_csv(path, index=False)
+    return len(df)
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def load_from_sidecar(path, cache_dir):
+    # load_cube 의 프로세스 내 캐시를 비워 매번 사이드카를 읽게 함
+    business_stats._loaded.clear()
+    return business_stats.load_cube(path, cache_dir)
+
+
+def first_app_run(work_dir, cache_dir):
+    """새 프로세스에서 business_dashboard 첫 실행 시간(ms)"""
+    code = ("import sys, time; from streamlit.testing.v1 import AppTest\n"
+            f"at = AppTest.from_file({os.path.join(BASE_DIR, 'business_dashboard.py')!r}, default_timeout=300)\n"
+            "started = time.perf_counter(); at.run(); elapsed = time.perf_counter() - started\n"
+            "assert not at.exception, at.exception\n"
+            "print(f'{elapsed * 1000:.0f}')\n")
+    env = {**os.environ, "BUSINESS_CACHE_DIR": cache_dir}
+    out = subprocess.run([sys.executable, "-c", code], cwd=work_dir, env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=12965, help="1990-01-01 부터의 일 수 (기본: 2025-06-30 까지)")
+    parser.add_argument("--industries", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--app", action="store_true", help="대시보드 첫 실행 시간도 측정 (새 프로세스, 느림)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(work_dir, DATA_FILE)
+        cache_dir = os.path.join(work_dir, "cache")
+        rows = synthetic_csv(path, args.days, args.industries)
+        print(f"합성 CSV {rows:,}행 · {os.path.getsize(path) / 2 ** 20:.1f} MB")
+
+        old_time, old = best_of(lambda: business_stats.build_cube(pd.read_csv(path)), args.repeat)
+        new_time, new = best_of(lambda: business_stats.build_cube(business_stats.read_csv(path)), args.repeat)
+        business_stats.load_cube(path, cache_dir)
+        sidecar_time, cached = best_of(lambda: load_from_sidecar(path, cache_dir), args.repeat)
+        pd.testing.assert_frame_equal(new, old)
+        pd.testing.assert_frame_equal(cached, old)
+        print(f"  큐브 {len(new):,}행 (세 경로 결과 동일), 최소값 {args.repeat}회")
+        print(f"  pd.read_csv + build_cube: {old_time * 1000:.0f} ms")
+        print(f"  고정 타입 read_csv + build_cube: {new_time * 1000:.0f} ms")
+        print(f"  사이드카 읽기: {sidecar_time * 1000:.0f} ms")
+
+        if args.app:
+            empty_dir = os.path.join(work_dir, "empty_cache")
+            no_sidecar = []
+            for _ in range(args.repeat):
+                shutil.rmtree(empty_dir, ignore_errors=True)
+                no_sidecar.append(first_app_run(work_dir, empty_dir))
+            with_sidecar = [first_app_run(work_dir, cache_dir) for _ in range(args.repeat)]
+            print(f"  대시보드 첫 실행 (새 프로세스 {args.repeat}회 중앙값): 사이드카 없음 "
+                  f"{statistics.median(no_sidecar):.0f} ms · 사이드카 있음 {statistics.median(with_sidecar):.0f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
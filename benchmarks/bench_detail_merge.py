@@ -0,0 +1,86 @@
+"""
+detailed_analysis 상세 지표 병합 벤치마크
+dashboard_data.json 의 행정동을 --scale 배로 늘린 합성 데이터에서, 예전 행 단위 df.apply 병합(지표마다 한 번씩)과
+정규화 키 한 번 + reindex 병합(dashboard_snapshot.build_frames 와 같은 방식)의 시간을 비교한다.
+두 결과와 build_frames 의 df_dong 이 같은지도 확인한다.
+
+예) python benchmarks/bench_detail_merge.py --scale 1 10 --repeat 7
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from dashboard_snapshot import DETAIL_METRICS, build_frames  # noqa: E402
+
+
+def load_sources():
+    with open(os.path.join(BASE_DIR, "dashboard_data.json"), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    with open(os.path.join(BASE_DIR, "detailed_analysis.json"), "r", encoding="utf-8") as f:
+        detailed_data = json.load(f)
+    return data, detailed_data
+
+
+def rowwise_merge(df_dong, detailed_data):
+    """예전 경로: 지표마다 df.apply 로 행정동명을 다시 정규화해 조회"""
+    df = df_dong.copy()
+
+    def get_detailed_metric(row, metric):
+        name = row['dong_name'].replace('·', '').replace('.', '').replace('•', '').strip()
+        return detailed_data.get(name, {}).get(metric, 0)
+
+    for m in DETAIL_METRICS:
+        df[m] = df.apply(lambda r: get_detailed_metric(r, m), axis=1)
+    return df
+
+
+def vectorized_merge(df_dong, detailed_data):
+    """현재 경로: 정규화 키 한 번 → 상세 지표 DataFrame 에 reindex"""
+    dong_key = df_dong['dong_name'].str.replace(r'[·.•]', '', regex=True).str.strip()
+    df_detail = (pd.DataFrame.from_dict(detailed_data, orient='index')
+                 .reindex(columns=DETAIL_METRICS, fill_value=0).fillna(0))
+    return pd.concat([df_dong, df_detail.reindex(dong_key, fill_value=0).set_axis(df_dong.index)], axis=1)
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10], help="행정동 수 배율 (여러 개 가능)")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    data, detailed_data = load_sources()
+    # build_frames 의 df_dong 과 상세 지표 열이 같은지 (이 스크립트의 병합이 실제 코드와 어긋나지 않았는지)
+    df_dong = build_frames(data, detailed_data)[0]
+    base = pd.DataFrame(data["dong_data"])
+    expected = vectorized_merge(base, detailed_data)
+    for m in DETAIL_METRICS:
+        assert df_dong[m].equals(expected[m]), m
+
+    for scale in args.scale:
+        dongs = pd.concat([base] * scale, ignore_index=True)
+        old_time, old = best_of(lambda: rowwise_merge(dongs, detailed_data), args.repeat)
+        new_time, new = best_of(lambda: vectorized_merge(dongs, detailed_data), args.repeat)
+        same = all(old[m].equals(new[m]) for m in DETAIL_METRICS)
+        print(f"행정동 {len(dongs):,}개: 행 단위 apply {old_time * 1000:7.1f} ms → reindex {new_time * 1000:6.1f} ms "
+              f"(최소값, {args.repeat}회) · 결과 동일 {same}")
+
+
+if __name__ == "__main__":
+    main()
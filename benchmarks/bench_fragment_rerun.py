@@ -0,0 +1,110 @@
+"""
+카페 대시보드 탭 상호작용 지연 벤치마크 (streamlit AppTest, 번들 데이터)
+탭 안의 필터를 바꿀 때마다 전체 스크립트 재실행 시간과, 그중 탭 프래그먼트 본문 실행 시간을 잰다.
+실제 브라우저에서는 탭 안 위젯이 프래그먼트만 다시 실행하므로 후자가 상호작용 지연에 해당한다
+(AppTest.run 은 항상 전체 스크립트를 실행하므로 st.fragment 를 감싸 본문 시간만 따로 잰다).
+사이드바(테마 · 메뉴 · 가중치)를 바꾸는 경우처럼 전체 재실행이 필요한 탭은 스크립트 시간만 본다.
+
+예) python benchmarks/bench_fragment_rerun.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(BASE_DIR, "main_app.py")
+
+# 프래그먼트 함수 이름 → 이번 실행에서 본문에 걸린 시간 목록
+FRAGMENT_TIMES = {}
+
+
+def install_fragment_timer():
+    """main_app 이 쓰는 st.fragment 를 본문 실행 시간을 기록하는 것으로 바꿔 끼움"""
+    fragment = st.fragment
+
+    def timed_fragment(func=None, **kwargs):
+        def wrap(f):
+            def body(*args, **kw):
+                started = time.perf_counter()
+                try:
+                    return f(*args, **kw)
+                finally:
+                    FRAGMENT_TIMES.setdefault(f.__name__, []).append(time.perf_counter() - started)
+            body.__name__, body.__qualname__, body.__module__ = f.__name__, f.__qualname__, f.__module__
+            return fragment(body, **kwargs)
+        return wrap(func) if func is not None else wrap
+
+    st.fragment = timed_fragment
+
+
+def widget(elements, label):
+    return next(w for w in elements if w.label == label)
+
+
+def measure(at, interact, runs):
+    """interact() 후 재실행을 runs 번 → (스크립트 중앙값 ms, 프래그먼트 본문 중앙값 ms)"""
+    script, body = [], []
+    for i in range(runs):
+        interact(i)
+        FRAGMENT_TIMES.clear()
+        started = time.perf_counter()
+        at.run()
+        script.append(time.perf_counter() - started)
+        body.append(sum(sum(v) for v in FRAGMENT_TIMES.values()))
+        assert not at.exception, at.exception
+    return statistics.median(script) * 1000, statistics.median(body) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(os.path.join(BASE_DIR, "dashboard_data.json"), "r", encoding="utf-8") as f:
+        brands = json.load(f)["brands"]
+
+    install_fragment_timer()
+    at = AppTest.from_file(APP, default_timeout=180)
+    at.run()
+    assert not at.exception, at.exception
+
+    def open_tab(name):
+        widget(at.sidebar.radio, "분석 메뉴").set_value(name)
+        at.run()
+        assert not at.exception, at.exception
+
+    results = []
+    for tab in ("📊 브랜드 개요", "📊 분석 시각화"):
+        open_tab(tab)
+        results.append((f"전체 재실행 · {tab}", *measure(at, lambda i: None, args.runs), False))
+
+    open_tab("🗺️ 지도")
+    results.append(("지도 · 브랜드 선택 변경", *measure(
+        at, lambda i: widget(at.multiselect, "표시할 브랜드").set_value(brands[:1 + i % 2]), args.runs), True))
+
+    open_tab("🏙️ 행정동 분석")
+    sorts = ["attractiveness_score", "monthly_sales", "total_brand_count"]
+    results.append(("행정동 분석 · 정렬 기준 변경", *measure(
+        at, lambda i: widget(at.selectbox, "정렬 기준").set_value(sorts[i % len(sorts)]), args.runs), True))
+
+    open_tab("⭐ 입지 추천")
+    choices = brands + ["전체"]
+    results.append(("입지 추천 · 브랜드 변경", *measure(
+        at, lambda i: widget(at.selectbox, "브랜드 선택").set_value(choices[i % len(choices)]), args.runs), True))
+
+    print(f"중앙값, {args.runs}회")
+    for name, script_ms, body_ms, fragment_only in results:
+        line = f"  {name:<28} 전체 스크립트 {script_ms:6.0f} ms"
+        if fragment_only:
+            line += f" · 프래그먼트 본문 {body_ms:5.0f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+지도 레이어 데이터 준비 벤치마크
+합성 매장 --points 개 · 브랜드 --brands 개 중 --selected 개를 고른 지도 탭 재실행 한 번의 레이어 준비 시간과
+pydeck Deck.to_json (브라우저로 보내는 JSON) 시간 · 크기를 비교한다.
+  기존: 선택 행 복사 → 점마다 hex → [r, g, b, a] 리스트 컬럼 (get_fill_color="color")
+  현재: main_app.get_map_payloads 와 같은 방식 — 브랜드 색 조회표로 r/g/b uint8 컬럼을 한 번 만들고
+        브랜드별 레코드 목록을 캐시해 두었다가 이어 붙임 (get_fill_color="[r, g, b, 200]")
+
+예) python benchmarks/bench_map_payload.py --points 100000 --brands 20 --selected 15
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+
+
+def synthetic_stores(points, brands, seed=0):
+    rng = np.random.default_rng(seed)
+    names = [f"브랜드{i}" for i in range(brands)]
+    colors = {b: f"#{int(rng.integers(0, 2 ** 24)):06x}" for b in names}
+    df_map = pd.DataFrame({
+        "brand": rng.choice(names, points),
+        "name": [f"매장{i}" for i in range(points)],
+        "lat": rng.uniform(37.43, 37.70, points),
+        "lng": rng.uniform(126.76, 127.18, points),
+        # 실제 df_map 처럼 행정동 열도 둠 (기존 경로는 이 열까지 브라우저로 보냄)
+        "dong_code": "1168064000",
+        "dong_name": "역삼1동",
+    })
+    return df_map, names, colors
+
+
+def old_layer(df_map, selected, colors):
+    """기존 경로: 재실행마다 선택 행을 복사하고 점마다 색 리스트를 만듦"""
+    filtered_map = df_map[df_map["brand"].isin(selected)]
+
+    def hex_to_rgb(h):
+        h = h.lstrip("#")
+        return [int(h[i:i + 2], 16) for i in (0, 2, 4)] + [200]
+
+    filtered_map = filtered_map.copy()
+    filtered_map["color"] = filtered_map["brand"].map(lambda b: hex_to_rgb(colors.get(b, "#888888")))
+    return pdk.Layer("ScatterplotLayer", data=filtered_map, get_position=["lng", "lat"], get_fill_color="color",
+                     get_radius=80, pickable=True, auto_highlight=True)
+
+
+def brand_rgb_array(brands, colors, default="#888888"):
+    """main_app.brand_rgb_array 와 같음"""
+    codes, uniques = pd.factorize(brands)
+    lut = np.array(
+        [[int(colors.get(b, default).lstrip("#")[i:i + 2], 16) for i in (0, 2, 4)] for b in uniques],
+        dtype=np.uint8,
+    ).reshape(-1, 3)
+    return lut[codes]
+
+
+def build_payloads(df_map, colors):
+    """main_app.get_map_payloads 본문 (Streamlit 캐시 없이) — 테마 · 데이터가 같으면 한 번만 실행"""
+    payload = df_map[["lng", "lat", "brand", "name"]].copy()
+    rgb = brand_rgb_array(payload["brand"], colors)
+    payload["r"], payload["g"], payload["b"] = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    blocks = {brand: block.to_dict(orient="records") for brand, block in payload.groupby("brand", sort=False)}
+    return payload, blocks
+
+
+def new_layer(blocks, selected):
+    """현재 경로: 캐시된 브랜드별 레코드를 이어 붙이기만 함"""
+    records = [rec for brand in selected for rec in blocks.get(brand, [])]
+    return pdk.Layer("ScatterplotLayer", data=records, get_position=["lng", "lat"], get_fill_color="[r, g, b, 200]",
+                     get_radius=80, pickable=True, auto_highlight=True)
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--brands", type=int, default=20)
+    parser.add_argument("--selected", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df_map, names, colors = synthetic_stores(args.points, args.brands)
+    selected = names[:args.selected]
+
+    build_time, (payload, blocks) = best_of(lambda: build_payloads(df_map, colors), 1)
+    old_time, old = best_of(lambda: old_layer(df_map, selected, colors), args.repeat)
+    new_time, new = best_of(lambda: new_layer(blocks, selected), args.repeat)
+
+    # 같은 점 · 같은 색인지 (pydeck 이 data 를 레코드 목록으로 바꿔 둠, 순서는 브랜드별로 묶이므로 매장명 기준 비교)
+    old_colors = {rec["name"]: tuple(rec["color"]) for rec in old.data}
+    new_colors = {rec["name"]: (rec["r"], rec["g"], rec["b"], 200) for rec in new.data}
+    assert old_colors == new_colors
+
+    json_repeat = max(1, args.repeat // 2)
+    old_json_time, old_json = best_of(lambda: pdk.Deck(layers=[old]).to_json(), json_repeat)
+    new_json_time, new_json = best_of(lambda: pdk.Deck(layers=[new]).to_json(), json_repeat)
+
+    print(f"매장 {args.points:,}개 · 브랜드 {args.brands}개 중 {args.selected}개 선택 (표시 {len(new.data):,}개)")
+    print(f"  레이어 준비 (재실행마다): {old_time * 1000:7.1f} ms → {new_time * 1000:6.1f} ms "
+          f"(캐시 최초 생성 {build_time * 1000:.0f} ms)")
+    print(f"  Deck.to_json:            {old_json_time * 1000:7.0f} ms / {len(old_json) / 1e6:.1f} MB → "
+          f"{new_json_time * 1000:.0f} ms / {len(new_json) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
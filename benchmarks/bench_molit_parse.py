@@ -0,0 +1,91 @@
+"""
+MOLIT XML 디코딩 마이크로 벤치마크
+1000건짜리 합성 응답 한 페이지를 기존 경로(ET.fromstring → item dict 목록 → DataFrame → 타입 변환)와
+parse_molit_xml 로 각각 디코딩해 시간 · tracemalloc 최대 메모리 · 결과 DataFrame 크기를 비교한다.
+
+예) python benchmarks/bench_molit_parse.py --rows 1000 --repeat 100
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from molit_client import CATEGORY_COLS, INT16_COLS, parse_molit_xml  # noqa: E402
+
+
+def synthetic_page(rows, lawd_cd="11680", deal_ymd="202401"):
+    items = "".join(
+        f"<item><buildYear>{1980 + n % 40}</buildYear><buildingAr>{100 + n}.5</buildingAr>"
+        f"<buildingUse>{'제2종근린생활' if n % 2 else '업무'}</buildingUse><dealAmount>{1000 + n:,}</dealAmount>"
+        f"<dealDay>{1 + n % 28}</dealDay><dealMonth>{int(deal_ymd[4:])}</dealMonth><dealYear>{deal_ymd[:4]}</dealYear>"
+        f"<floor>{n % 10}</floor><jibun>{n}</jibun><sggCd>{lawd_cd}</sggCd><sggNm>강남구</sggNm><umdNm>동{n % 5}</umdNm></item>"
+        for n in range(rows)
+    )
+    return (f"<?xml version='1.0' encoding='UTF-8'?><response><header><resultCode>000</resultCode>"
+            f"<resultMsg>OK</resultMsg></header><body><items>{items}</items><numOfRows>{rows}</numOfRows>"
+            f"<pageNo>1</pageNo><totalCount>{rows}</totalCount></body></response>").encode("utf-8")
+
+
+def dict_path(content):
+    """기존 경로: 트리 전체 → item dict 목록 → DataFrame → 숫자 변환"""
+    root = ET.fromstring(content)
+    df = pd.DataFrame([{child.tag: child.text for child in item} for item in root.iter("item")])
+    df["dealAmount"] = df["dealAmount"].str.replace(",", "").astype(float)
+    df["buildingAr"] = pd.to_numeric(df["buildingAr"], errors="coerce")
+    df["floor"] = pd.to_numeric(df["floor"], errors="coerce")
+    return df
+
+
+def dict_path_typed(content):
+    """기존 경로에 parse_molit_xml 과 같은 Int16 / 범주형 변환까지 더한 것 (같은 결과 기준 비교)"""
+    df = dict_path(content)
+    for col in INT16_COLS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int16")
+    for col in CATEGORY_COLS:
+        df[col] = df[col].astype("category")
+    return df
+
+
+def new_path(content):
+    return parse_molit_xml(content)[0]
+
+
+def measure(func, content, repeat):
+    func(content)
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        df = func(content)
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    func(content)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), min(times), peak, df.memory_usage(deep=True).sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    content = synthetic_page(args.rows)
+    print(f"{args.rows}건 응답 {len(content) / 1024:.0f} KB, {args.repeat}회 반복")
+    for name, func in (("기존 (dict → DataFrame)", dict_path), ("기존 + 같은 타입 변환", dict_path_typed),
+                       ("parse_molit_xml", new_path)):
+        median, best, peak, frame = measure(func, content, args.repeat)
+        print(f"  {name:<24} 중앙값 {median * 1000:6.1f} ms · 최소 {best * 1000:6.1f} ms · "
+              f"최대 메모리 {peak / 2 ** 20:5.2f} MB · 결과 {frame / 1024:4.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+카페 대시보드 데이터 콜드 로드 벤치마크
+새 프로세스마다 (1) JSON 파싱 + build_frames, (2) Arrow 스냅샷 메모리 매핑(load_snapshot, 원본 해시 확인 포함)으로
+df_dong / df_map 을 만들고, 걸린 시간과 import 이후 늘어난 최대 RSS 를 비교한다.
+스냅샷은 임시 디렉터리에 만들어 쓰므로 data/snapshot 은 건드리지 않는다. (resource 모듈을 쓰므로 Linux / macOS 전용)
+Linux 에서는 최대 RSS 가 exec 뒤에도 부모 값에서 이어지므로, 부모 프로세스는 pandas 도 import 하지 않고 실행만 맡는다.
+
+예) python benchmarks/bench_snapshot_load.py --runs 3
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+
+def max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 바이트
+    return rss / 2 ** 20 if sys.platform == "darwin" else rss / 1024
+
+
+def run_once(mode, out_dir):
+    """이 프로세스에서 한 번 로드 → '시간(ms) RSS증가(MB)' 출력"""
+    import pandas as pd
+    import dashboard_snapshot
+
+    before = max_rss_mb()
+    started = time.perf_counter()
+    if mode == "json":
+        frames = dashboard_snapshot.build_frames(*dashboard_snapshot._read_sources(BASE_DIR))[:2]
+    else:
+        frames = dashboard_snapshot.load_snapshot(BASE_DIR, out_dir)[1:]
+    elapsed = time.perf_counter() - started
+    assert all(isinstance(df, pd.DataFrame) for df in frames)
+    print(f"{elapsed * 1000:.1f} {max_rss_mb() - before:.1f}")
+
+
+def build(out_dir):
+    """스냅샷 생성 → 생성 시간(ms) 출력, 스냅샷으로 읽은 프레임이 JSON 경로와 같은지 확인"""
+    import pandas as pd
+    import dashboard_snapshot
+
+    started = time.perf_counter()
+    dashboard_snapshot.build_snapshot(BASE_DIR, out_dir)
+    print(f"{(time.perf_counter() - started) * 1000:.0f}")
+    json_frames = dashboard_snapshot.build_frames(*dashboard_snapshot._read_sources(BASE_DIR))[:2]
+    for expected, loaded in zip(json_frames, dashboard_snapshot.load_snapshot(BASE_DIR, out_dir)[1:]):
+        pd.testing.assert_frame_equal(loaded, expected)
+
+
+def child(mode, out_dir):
+    return subprocess.run([sys.executable, os.path.abspath(__file__), "--mode", mode, "--out-dir", out_dir],
+                          capture_output=True, text=True, check=True).stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="방식별 새 프로세스 실행 횟수")
+    parser.add_argument("--mode", choices=["build", "json", "snapshot"], help=argparse.SUPPRESS)
+    parser.add_argument("--out-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode == "build":
+        build(args.out_dir)
+        return
+    if args.mode:
+        run_once(args.mode, args.out_dir)
+        return
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        print(f"스냅샷 생성 {child('build', out_dir)[0]} ms (JSON 경로와 결과 동일)")
+        for mode, label in (("json", "JSON 파싱"), ("snapshot", "Arrow 스냅샷")):
+            results = []
+            for _ in range(args.runs):
+                out = child(mode, out_dir)
+                results.append((float(out[0]), float(out[1])))
+            times = ", ".join(f"{t:.0f}" for t, _ in results)
+            print(f"  {label:<12} {times} ms · import 이후 최대 RSS +{max(r for _, r in results):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
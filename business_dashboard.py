@@ -5,88 +5,111 @@ import plotly.graph_objects as go
 import os
 from datetime import datetime
 
+import business_stats
+import figure_cache
+from period_compare import CI_LEVEL, PeriodComparison
+
 # 페이지 설정
 st.set_page_config(page_title="서울시 업종별 고도화 분석 대시보드", layout="wide")
 
-@st.cache_data
+DATA_FILE = "seoul_business_stats.csv"
+
+# 데이터 버전 (파일 수정 시각 · 크기) — 집계 캐시와 차트 캐시 필터 키에 사용
+DATA_VERSION = (f"{os.stat(DATA_FILE).st_mtime_ns}-{os.stat(DATA_FILE).st_size}"
+                if os.path.exists(DATA_FILE) else None)
+
 def load_data():
-    file_path = "seoul_business_stats.csv"
+    file_path = DATA_FILE
     if not os.path.exists(file_path):
         st.error(f"데이터 파일을 찾을 수 없습니다: {file_path}")
         return None
     
-    df = pd.read_csv(file_path)
-    df['일자'] = pd.to_datetime(df['일자'])
-    df['Year'] = df['일자'].dt.year
-    df['Month'] = df['일자'].dt.month
-    return df
+    # 일 단위 원본은 (연도, 월, 업종) 큐브로 접고 버림 — 이후 모든 섹션은 큐브만 조회
+    # CSV 가 바뀌지 않았으면 Parquet 사이드카에서 큐브를 바로 읽고, 큰 CSV 는 블록 단위로 읽으며 진행률 표시
+    # 진행률 요소는 st.cache_data 재생 대상이 되면 안 되므로 캐시는 load_cube 의 프로세스 내 캐시에 맡김
+    progress_bar = st.empty()
+
+    def show_progress(done, total):
+        progress_bar.progress(done / total, text=f"업종 통계 집계 중... {done / 2 ** 20:,.0f} / {total / 2 ** 20:,.0f} MB")
+
+    cube = business_stats.load_cube(file_path, progress=show_progress)
+    progress_bar.empty()
+    return cube
+
+@st.cache_data
+def yearly_top_industries(_cube, data_version, k=10):
+    """연도별 창업 / 폐업 상위 k개 업종 호버 문자열 → DataFrame (Year, top10_details_start, top10_details_close)
+
+    (연도, 업종) 한 번의 groupby 로 전체 연도를 계산해 두고, 연도 범위가 바뀌면 행만 골라 쓴다.
+    """
+    by_year = business_stats.totals(_cube, ['Year', '업종명'])
+    out = pd.DataFrame({'Year': by_year['Year'].unique()}).set_index('Year')
+    for col, label, name in (('창업수', '창업', 'top10_details_start'), ('폐업수', '폐업', 'top10_details_close')):
+        # 연도 안에서 건수 내림차순 (같으면 업종명 순, nlargest 와 동일)
+        top = by_year.sort_values(['Year', col], ascending=[True, False], kind='stable').groupby('Year').head(k)
+        rank = top.groupby('Year').cumcount() + 1
+        lines = rank.astype(str) + ". " + top['업종명'] + " (" + top[col].map('{:,}'.format) + "건)"
+        out[name] = f"<b>[{label} 상위 {k}개 업종]</b><br>" + lines.groupby(top['Year']).agg("<br>".join)
+    return out.reset_index()
+
+@st.cache_resource
+def get_period_comparison(data_version):
+    """기간 비교 엔진 (연월 × 업종 행렬은 한 번, 기간 조합별 결과는 엔진 내부 LRU 캐시)"""
+    return PeriodComparison(cube)
 
 st.title("🚀 서울시 업종별 데이터 심층 분석 대시보드")
 st.markdown("분석 섹션별로 수치를 입력하여 실시간으로 변화하는 데이터를 확인해 보세요.")
 
-data_raw = load_data()
+cube = load_data()
 
-if data_raw is not None:
+if cube is not None:
     # 1. 연도별 전체 추이 섹션
     with st.expander("📅 1. 연도별 전체 창업/폐업 추이 분석", expanded=True):
         st.subheader("연도 범위 설정")
         col1, col2 = st.columns(2)
         with col1:
-            start_y = st.number_input("시작 연도", min_value=int(data_raw['Year'].min()), max_value=int(data_raw['Year'].max()), value=1990, key="y_start")
+            start_y = st.number_input("시작 연도", min_value=int(cube['Year'].min()), max_value=int(cube['Year'].max()), value=1990, key="y_start")
         with col2:
             # 종료 연도 설정: 데이터의 최대 연도와 2025 중 큰 값을 max_value로 설정
-            max_year_data = int(data_raw['Year'].max())
+            max_year_data = int(cube['Year'].max())
             max_bound = max(2025, max_year_data)
             # 기본값(value)은 2025로 하되, 데이터가 그보다 적으면 데이터 최대값으로 설정
             default_end = min(2025, max_year_data)
             
             end_y = st.number_input("종료 연도", 
-                                    min_value=int(data_raw['Year'].min()), 
+                                    min_value=int(cube['Year'].min()), 
                                     max_value=max_bound, 
                                     value=default_end, 
                                     key="y_end")
         
-        y_df_base = data_raw[(data_raw['Year'] >= start_y) & (data_raw['Year'] <= end_y)]
-        yearly_total = y_df_base.groupby('Year')[['창업수', '폐업수']].sum().reset_index()
-        
-        # 호버 시 상위 10개 업종 정보를 보여주기 위한 사전 계산
-        top10_info_start = []
-        top10_info_close = []
-        for year in yearly_total['Year']:
-            year_data = y_df_base[y_df_base['Year'] == year]
-            
-            # 창업 상위 10
-            top10_s = year_data.groupby('업종명')['창업수'].sum().nlargest(10)
-            info_str_s = "<br>".join([f"{i+1}. {name} ({count:,}건)" for i, (name, count) in enumerate(top10_s.items())])
-            top10_info_start.append(f"<b>[창업 상위 10개 업종]</b><br>{info_str_s}")
-            
-            # 폐업 상위 10
-            top10_c = year_data.groupby('업종명')['폐업수'].sum().nlargest(10)
-            info_str_c = "<br>".join([f"{i+1}. {name} ({count:,}건)" for i, (name, count) in enumerate(top10_c.items())])
-            top10_info_close.append(f"<b>[폐업 상위 10개 업종]</b><br>{info_str_c}")
-        
-        yearly_total['top10_details_start'] = top10_info_start
-        yearly_total['top10_details_close'] = top10_info_close
-
-        fig1 = go.Figure()
-        # 창업수 라인
-        fig1.add_trace(go.Scatter(x=yearly_total['Year'], y=yearly_total['창업수'], name='창업수', mode='lines+markers',
-                                  customdata=yearly_total['top10_details_start'],
-                                  hovertemplate='<b>연도: %{x}</b><br>창업수: %{y:,}건<br>%{customdata}<extra></extra>'))
-        # 폐업수 라인
-        fig1.add_trace(go.Scatter(x=yearly_total['Year'], y=yearly_total['폐업수'], name='폐업수', mode='lines+markers',
-                                  customdata=yearly_total['top10_details_close'],
-                                  hovertemplate='<b>연도: %{x}</b><br>폐업수: %{y:,}건<br>%{customdata}<extra></extra>'))
+        def build_yearly_trend():
+            yearly_total = business_stats.totals(cube, 'Year', years=range(start_y, end_y + 1))
+
+            # 호버 시 상위 10개 업종 정보 (전체 연도를 한 번에 계산해 둔 결과에서 조회)
+            yearly_total = yearly_total.merge(yearly_top_industries(cube, DATA_VERSION), on='Year', how='left')
+
+            fig1 = go.Figure()
+            # 창업수 라인
+            fig1.add_trace(go.Scatter(x=yearly_total['Year'], y=yearly_total['창업수'], name='창업수', mode='lines+markers',
+                                      customdata=yearly_total['top10_details_start'],
+                                      hovertemplate='<b>연도: %{x}</b><br>창업수: %{y:,}건<br>%{customdata}<extra></extra>'))
+            # 폐업수 라인
+            fig1.add_trace(go.Scatter(x=yearly_total['Year'], y=yearly_total['폐업수'], name='폐업수', mode='lines+markers',
+                                      customdata=yearly_total['top10_details_close'],
+                                      hovertemplate='<b>연도: %{x}</b><br>폐업수: %{y:,}건<br>%{customdata}<extra></extra>'))
         
-        fig1.update_layout(title='서울시 연도별 전체 창업/폐업 추이', xaxis_title='연도', yaxis_title='건수', template='plotly_white')
-        st.plotly_chart(fig1, use_container_width=True)
+            fig1.update_layout(title='서울시 연도별 전체 창업/폐업 추이', xaxis_title='연도', yaxis_title='건수', template='plotly_white')
+            return fig1
+
+        figure_cache.plotly_chart("business.yearly_trend", "default", (DATA_VERSION, start_y, end_y),
+                                  build_yearly_trend, use_container_width=True)
 
     # 2. 업종별 비교 섹션
     with st.expander("📊 2. 주요 업종별 누적 현황 비교", expanded=True):
         st.subheader("업종 개수 및 검색어 필터")
         col1, col2 = st.columns(2)
         
-        industry_all = data_raw.groupby('업종명')[['창업수', '폐업수']].sum().reset_index()
+        industry_all = business_stats.totals(cube, '업종명')
         industry_list_sorted = industry_all.sort_values(by='창업수', ascending=False)['업종명'].tolist()
         
         with col1:
@@ -99,10 +122,14 @@ if data_raw is not None:
         else:
             industry_display = industry_all.sort_values(by='창업수', ascending=False).head(top_n)
         
-        fig2 = px.bar(industry_display, x='업종명', y=['창업수', '폐업수'], barmode='group',
-                      title=f"업종별 누적 현황 현황",
-                      labels={'value': '누적 건수'})
-        st.plotly_chart(fig2, use_container_width=True)
+        def build_industry_compare():
+            fig2 = px.bar(industry_display, x='업종명', y=['창업수', '폐업수'], barmode='group',
+                          title=f"업종별 누적 현황 현황",
+                          labels={'value': '누적 건수'})
+            return fig2
+
+        figure_cache.plotly_chart("business.industry_compare", "default", (DATA_VERSION, top_n, tuple(filter_industries)),
+                                  build_industry_compare, use_container_width=True)
 
     # 3. 생존 지수 섹션
     with st.expander("🛡️ 3. 업종별 상대적 생존 지수 (안정성 분석)", expanded=True):
@@ -113,17 +140,21 @@ if data_raw is not None:
         with col2:
             survival_n = st.number_input("표시할 상위 안정 업종 수", min_value=5, max_value=50, value=20)
             
-        recent_10 = data_raw[data_raw['Year'] >= (datetime.now().year - 10)].groupby('업종명')[['창업수', '폐업수']].sum().reset_index()
-        recent_10 = recent_10[recent_10['창업수'] >= min_startups]
-        recent_10['폐업비율'] = (recent_10['폐업수'] / recent_10['창업수']) * 100
+        def build_survival():
+            recent_10 = business_stats.totals(cube, '업종명', years=range(datetime.now().year - 10, int(cube['Year'].max()) + 1))
+            recent_10 = recent_10[recent_10['창업수'] >= min_startups]
+            recent_10['폐업비율'] = (recent_10['폐업수'] / recent_10['창업수']) * 100
         
-        survival_top = recent_10.nsmallest(survival_n, '폐업비율')
+            survival_top = recent_10.nsmallest(survival_n, '폐업비율')
         
-        fig3 = px.bar(survival_top, x='업종명', y='폐업비율', color='폐업비율',
-                      title=f"안정성이 높은 TOP {survival_n} 업종 (창업 {min_startups}건 이상)",
-                      labels={'폐업비율': '창업 대비 폐업 비율 (%)'},
-                      color_continuous_scale='RdYlGn_r')
-        st.plotly_chart(fig3, use_container_width=True)
+            fig3 = px.bar(survival_top, x='업종명', y='폐업비율', color='폐업비율',
+                          title=f"안정성이 높은 TOP {survival_n} 업종 (창업 {min_startups}건 이상)",
+                          labels={'폐업비율': '창업 대비 폐업 비율 (%)'},
+                          color_continuous_scale='RdYlGn_r')
+            return fig3
+
+        figure_cache.plotly_chart("business.survival", "default", (DATA_VERSION, datetime.now().year, min_startups, survival_n),
+                                  build_survival, use_container_width=True)
 
     # 4. 팬데믹 전후 비교 섹션
     with st.expander("🦠 4. 팬데믹 전후 비즈니스 트렌드 변화", expanded=True):
@@ -135,20 +166,34 @@ if data_raw is not None:
             post_years = st.multiselect("팬데믹 이후 연도 선택", options=range(2021, 2026), default=[2021, 2022, 2023])
             
         if pre_years and post_years:
-            pre_avg = data_raw[data_raw['Year'].isin(pre_years)].groupby('업종명')[['창업수', '폐업수']].mean().reset_index()
-            post_avg = data_raw[data_raw['Year'].isin(post_years)].groupby('업종명')[['창업수', '폐업수']].mean().reset_index()
-            
-            p_merge = pd.merge(pre_avg, post_avg, on='업종명', suffixes=('_전', '_후'))
-            p_merge['변화량'] = p_merge['창업수_후'] - p_merge['창업수_전']
-            
             display_n = st.slider("표시할 변화량 상위 업종 수", 5, 30, 15)
-            p_top = p_merge.sort_values(by='변화량', key=abs, ascending=False).head(display_n)
-            
-            fig4 = go.Figure()
-            fig4.add_trace(go.Bar(name='이전 평균', x=p_top['업종명'], y=p_top['창업수_전']))
-            fig4.add_trace(go.Bar(name='이후 평균', x=p_top['업종명'], y=p_top['창업수_후']))
-            fig4.update_layout(title=f"팬데믹 전후 연평균 창업수 변화 (상위 {display_n}개)", barmode='group')
-            st.plotly_chart(fig4, use_container_width=True)
+            # 원본 행 기준 평균 (큐브의 합계 ÷ 원본 행 수) 과 변화량의 부트스트랩 신뢰구간
+            p_merge = get_period_comparison(DATA_VERSION).compare((tuple(pre_years), tuple(post_years)))
+
+            def build_pandemic():
+                p_top = p_merge.sort_values(by='변화량_1', key=abs, ascending=False).head(display_n)
+                # 신뢰구간이 0을 포함하지 않는 업종은 이름 앞에 * 표시
+                significant = (p_top['하한_1'] > 0) | (p_top['상한_1'] < 0)
+                labels = p_top['업종명'].where(~significant, "*" + p_top['업종명'])
+
+                fig4 = go.Figure()
+                fig4.add_trace(go.Bar(name='이전 평균', x=labels, y=p_top['평균_0']))
+                fig4.add_trace(go.Bar(
+                    name='이후 평균', x=labels, y=p_top['평균_1'],
+                    customdata=p_top[['변화량_1', '변화율_1', '하한_1', '상한_1']].to_numpy(),
+                    hovertemplate=("이후 평균: %{y:.2f}<br>변화량: %{customdata[0]:+.2f} (%{customdata[1]:+.1f}%)"
+                                   f"<br>{CI_LEVEL:.0%} 신뢰구간: " "[%{customdata[2]:+.2f}, %{customdata[3]:+.2f}]"),
+                ))
+                fig4.update_layout(title=f"팬데믹 전후 연평균 창업수 변화 (상위 {display_n}개)", barmode='group')
+                return fig4
+
+            if p_merge.empty:
+                st.warning("선택한 이전 · 이후 연도 모두에 데이터가 있는 업종이 없습니다. 비교 연도를 바꿔 주세요.")
+            else:
+                figure_cache.plotly_chart("business.pandemic", "default",
+                                          (DATA_VERSION, tuple(pre_years), tuple(post_years), display_n),
+                                          build_pandemic, use_container_width=True)
+                st.caption(f"* 변화량의 {CI_LEVEL:.0%} 신뢰구간(연월 단위 부트스트랩)이 0을 포함하지 않는 업종")
         else:
             st.warning("비교할 연도를 최소 하나 이상 선택해 주세요.")
 
@@ -157,29 +202,27 @@ if data_raw is not None:
         st.subheader("분석 대상 업종 및 시간 단위 설정")
         col1, col2 = st.columns(2)
         with col1:
-            all_unique = ["전체"] + sorted(list(data_raw['업종명'].unique()))
+            all_unique = ["전체"] + business_stats.industries(cube)
             target_ind = st.selectbox("업종 선택 (미리보기 지원)", all_unique, key="ind_select")
         with col2:
             time_unit = st.radio("시간 단위 선택", ("월별 (Month)", "년별 (Year)"), horizontal=True)
         
-        if target_ind == "전체":
-            m_df = data_raw
-        else:
-            m_df = data_raw[data_raw['업종명'] == target_ind]
-            
-        group_col = 'Month' if "월별" in time_unit else 'Year'
-        unit_label = '월' if "월별" in time_unit else '연도'
-        
-        time_stats = m_df.groupby(group_col)[['창업수', '폐업수']].sum().reset_index()
-        
-        fig5 = px.bar(time_stats, x=group_col, y=['창업수', '폐업수'], barmode='group',
-                      title=f"[{target_ind}] 기준 {unit_label} 누적 패턴",
-                      labels={'value': '건수', group_col: unit_label})
+        def build_time_pattern():
+            group_col = 'Month' if "월별" in time_unit else 'Year'
+            unit_label = '월' if "월별" in time_unit else '연도'
+
+            time_stats = business_stats.totals(cube, group_col, industry=None if target_ind == "전체" else target_ind)
         
-        if group_col == 'Month':
-            fig5.update_layout(xaxis=dict(tickmode='linear', tick0=1, dtick=1))
+            fig5 = px.bar(time_stats, x=group_col, y=['창업수', '폐업수'], barmode='group',
+                          title=f"[{target_ind}] 기준 {unit_label} 누적 패턴",
+                          labels={'value': '건수', group_col: unit_label})
         
-        st.plotly_chart(fig5, use_container_width=True)
+            if group_col == 'Month':
+                fig5.update_layout(xaxis=dict(tickmode='linear', tick0=1, dtick=1))
+            return fig5
+
+        figure_cache.plotly_chart("business.time_pattern", "default", (DATA_VERSION, target_ind, time_unit),
+                                  build_time_pattern, use_container_width=True)
 
 else:
     st.info("데이터를 불러오는 데 실패했습니다.")
\ No newline at end of file
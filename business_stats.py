@@ -0,0 +1,274 @@
+"""
+서울시 업종별 창업 / 폐업 통계 큐브
+일 단위 원본(seoul_business_stats.csv)을 (연도, 월, 업종) 합계 큐브로 접어 두고, 대시보드 각 섹션은 큐브만 조회한다.
+큐브 크기는 연도 × 월 × 업종 수로 정해지므로 원본 행 수와 무관하다.
+만든 큐브는 Parquet 사이드카로 저장해 두고, 원본 CSV 가 그대로면 CSV 를 다시 읽지 않는다.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 큐브 사이드카 저장 위치 (data/ 아래라 git에는 포함되지 않음)
+CACHE_DIR = os.getenv("BUSINESS_CACHE_DIR", os.path.join(BASE_DIR, "data", "business"))
+
+# 큐브 형식이 바뀌면 올려서 기존 사이드카를 무효화
+CUBE_VERSION = 1
+
+CUBE_KEYS = ['Year', 'Month', '업종명']
+COUNT_COLS = ['창업수', '폐업수']
+# 셀에 접힌 원본 행 수 — 원본 행 기준 평균(섹션 4, period_compare)을 큐브에서 그대로 재현하는 데 사용
+ROWS_COL = '행수'
+
+# 이 크기(MB) 이상의 CSV 는 한 번에 읽지 않고 블록 단위로 읽으며 큐브에 접어 넣음
+STREAM_THRESHOLD_MB = int(os.getenv("BUSINESS_STREAM_THRESHOLD_MB", "256"))
+# 스트리밍 블록 크기 (MB) — 집계 중 메모리 사용량은 블록 크기의 10배 정도까지 늘어남
+STREAM_BLOCK_MB = int(os.getenv("BUSINESS_STREAM_BLOCK_MB", "32"))
+# pandas 추론 경로로 스트리밍할 때의 블록 행 수
+STREAM_CHUNK_ROWS = 1_000_000
+
+# 원본 CSV 컬럼 타입 / 날짜 형식 (형식 추론 없이 한 번에 변환)
+DATE_FORMAT = '%Y-%m-%d'
+CSV_TYPES = {
+    '일자': pa.timestamp('s'),
+    '업종명': pa.dictionary(pa.int32(), pa.string()),
+    '창업수': pa.int32(),
+    '폐업수': pa.int32(),
+}
+
+
+def _convert_options():
+    return pa_csv.ConvertOptions(include_columns=list(CSV_TYPES), column_types=CSV_TYPES,
+                                 timestamp_parsers=[DATE_FORMAT])
+
+
+def read_csv(path):
+    """원본 CSV → DataFrame (일자 datetime64, 업종명 범주형, 건수 int32 — 빈 건수가 있는 컬럼은 float)
+
+    날짜 · 건수가 정해진 형식과 다르면 pandas 의 형식 추론 경로로 다시 읽는다.
+    """
+    try:
+        return pa_csv.read_csv(path, convert_options=_convert_options()).to_pandas()
+    except pa.ArrowInvalid:
+        return pd.read_csv(path, usecols=list(CSV_TYPES), dtype={'업종명': 'category'})
+
+
+def _sorted_category(values):
+    """범주형으로 바꾸고 범주 순서를 가나다순으로 고정 (읽은 순서와 무관하게 같은 큐브)"""
+    industry = values.astype('category')
+    return industry.cat.reorder_categories(sorted(industry.cat.categories))
+
+
+def build_cube(df):
+    """원본 (일자, 업종명, 창업수, 폐업수) → 큐브 DataFrame (Year, Month, 업종명, 창업수, 폐업수, 행수)
+
+    업종명은 범주형, 건수는 int32. 빈 건수는 0으로 본다.
+    """
+    dates = pd.to_datetime(df['일자'])
+    keys = [
+        dates.dt.year.astype('int16').rename('Year'),
+        dates.dt.month.astype('int8').rename('Month'),
+        _sorted_category(df['업종명']),
+    ]
+    grouped = df[COUNT_COLS].fillna(0).astype('int64').groupby(keys, observed=True)
+    cube = grouped.sum()
+    cube[ROWS_COL] = grouped.size()
+    return cube.reset_index().astype({c: 'int32' for c in COUNT_COLS + [ROWS_COL]})
+
+
+def merge_cubes(cubes):
+    """부분 큐브 여러 개 → 큐브 하나 (같은 셀은 건수 · 행수 합산)"""
+    # 블록마다 업종 범주가 다르므로 문자열로 맞춰 합친 뒤 다시 범주형으로
+    merged = pd.concat([c.astype({'업종명': str}) for c in cubes], ignore_index=True)
+    keys = [merged['Year'], merged['Month'], _sorted_category(merged['업종명'])]
+    cube = merged[COUNT_COLS + [ROWS_COL]].astype('int64').groupby(keys, observed=True).sum()
+    return cube.reset_index().astype({c: 'int32' for c in COUNT_COLS + [ROWS_COL]})
+
+
+def _fold_chunks(chunks, f, total, progress):
+    cube = None
+    for chunk in chunks:
+        part = build_cube(chunk)
+        cube = part if cube is None else merge_cubes([cube, part])
+        if progress is not None:
+            progress(min(f.tell(), total), total)
+    if cube is None:
+        cube = build_cube(pd.DataFrame({col: [] for col in CSV_TYPES}))
+    return cube
+
+
+def _csv_blocks(f, block_bytes):
+    """파일을 줄 경계에서 자른 약 block_bytes 크기 블록 (각 블록 앞에 헤더 줄을 붙임)
+
+    pyarrow.csv.open_csv 는 앞쪽 블록을 제한 없이 미리 읽어 메모리가 원본 크기만큼 늘어나므로 직접 자른다.
+    값 안의 줄바꿈은 pyarrow 기본 설정(newlines_in_values=False)과 같이 지원하지 않는다.
+    """
+    header = f.readline()
+    rest = b""
+    while True:
+        data = f.read(block_bytes)
+        if not data:
+            break
+        data = rest + data
+        cut = data.rfind(b"\n") + 1
+        rest = data[cut:]
+        if cut:
+            yield header + data[:cut]
+    if rest.strip():
+        yield header + rest
+
+
+def stream_cube(path, block_mb=STREAM_BLOCK_MB, progress=None):
+    """원본 CSV 를 블록 단위로 읽으며 바로 큐브에 접어 넣는다 → 큐브 (build_cube(read_csv(path)) 와 같다)
+
+    메모리에는 블록 하나와 누적 큐브만 올라가므로 원본이 메모리보다 커도 된다.
+    progress(읽은 바이트, 전체 바이트) 를 블록마다 호출한다.
+    """
+    total = os.path.getsize(path)
+    try:
+        with open(path, "rb") as f:
+            chunks = (pa_csv.read_csv(pa.py_buffer(block), convert_options=_convert_options()).to_pandas()
+                      for block in _csv_blocks(f, block_mb * 2 ** 20))
+            return _fold_chunks(chunks, f, total, progress)
+    except pa.ArrowInvalid:
+        # 형식이 다른 블록을 만나면 처음부터 pandas 추론 경로로
+        with open(path, "rb") as f:
+            chunks = pd.read_csv(f, usecols=list(CSV_TYPES), dtype={'업종명': 'category'},
+                                 chunksize=STREAM_CHUNK_ROWS)
+            return _fold_chunks(chunks, f, total, progress)
+
+
+def select(cube, years=None, industry=None):
+    """연도 목록 / 업종으로 큐브 행 필터 (None 이면 전체)"""
+    mask = np.ones(len(cube), dtype=bool)
+    if years is not None:
+        mask &= cube['Year'].isin(list(years)).to_numpy()
+    if industry is not None:
+        mask &= (cube['업종명'] == industry).to_numpy()
+    return cube[mask]
+
+
+def totals(cube, by, years=None, industry=None, cols=COUNT_COLS):
+    """by 기준 건수 합계 (int64) → DataFrame (by 컬럼 + cols)"""
+    part = select(cube, years, industry)
+    out = part[cols].astype('int64').groupby([part[c] for c in np.atleast_1d(by)], observed=True).sum().reset_index()
+    # 업종명은 원본과 같은 문자열 컬럼으로 돌려줌 (차트 축 순서가 범주 순서를 따르지 않도록)
+    if '업종명' in out.columns:
+        out['업종명'] = out['업종명'].astype(str)
+    return out
+
+
+def industries(cube):
+    """큐브의 업종명 목록 (가나다순)"""
+    return sorted(cube['업종명'].unique())
+
+
+# ──────────────────────────────────────────────
+# Parquet 사이드카
+# ──────────────────────────────────────────────
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _sidecar_paths(path, cache_dir):
+    name = os.path.basename(path)
+    return os.path.join(cache_dir, f"{name}.cube.parquet"), os.path.join(cache_dir, f"{name}.meta.json")
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _tmp_path(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = _tmp_path(meta_path)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, meta_path)
+
+
+def _write_sidecar(cube_path, meta_path, cube, meta):
+    os.makedirs(os.path.dirname(cube_path), exist_ok=True)
+    # 동시에 읽는 쪽이 쓰다 만 파일을 보지 않도록 임시 파일에 쓴 뒤 교체, meta 는 마지막에
+    tmp_path = _tmp_path(cube_path)
+    cube.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cube_path)
+    _write_meta(meta_path, meta)
+
+
+# 프로세스 안에서 원본 경로별로 마지막에 불러온 큐브 ((수정 시각, 크기), 큐브)
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def load_cube(path, cache_dir=CACHE_DIR, write=True, progress=None):
+    """원본 CSV → 큐브 (사이드카가 최신이면 사이드카에서)
+
+    수정 시각 · 크기가 사이드카 기록과 같으면 바로 재사용하고, 수정 시각만 달라졌으면 sha256 으로 내용을 비교한다.
+    STREAM_THRESHOLD_MB 이상인 CSV 는 stream_cube 로 읽는다 (progress 는 이때만 호출).
+    저장 위치에 쓸 수 없으면 저장은 건너뛰고 만든 큐브만 반환한다.
+    같은 프로세스에서 수정 시각 · 크기가 그대로면 앞서 불러온 큐브를 그대로 돌려준다 (세션끼리 공유하므로 수정하지 않는다).
+    """
+    stat = os.stat(path)
+    source = {"path": os.path.abspath(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    version = (source["mtime_ns"], source["size"])
+    # 잠금을 쥔 채 불러와 여러 세션이 같은 CSV 를 동시에 집계하지 않게 함
+    with _loaded_lock:
+        loaded = _loaded.get(source["path"])
+        if loaded is not None and loaded[0] == version:
+            return loaded[1]
+        cube = _load_cube(path, source, cache_dir, write, progress)
+        _loaded[source["path"]] = (version, cube)
+    return cube
+
+
+def _load_cube(path, source, cache_dir, write, progress):
+    cube_path, meta_path = _sidecar_paths(path, cache_dir)
+    meta = _read_meta(meta_path)
+    sha256 = None
+    if (meta is not None and meta.get("version") == CUBE_VERSION
+            and meta.get("path") == source["path"] and meta.get("size") == source["size"]
+            and os.path.exists(cube_path)):
+        if meta.get("mtime_ns") == source["mtime_ns"]:
+            return pd.read_parquet(cube_path)
+        sha256 = file_sha256(path)
+        if meta.get("sha256") == sha256:
+            # 내용은 같고 수정 시각만 바뀜 (복사 · touch) — 기록만 갱신
+            if write:
+                try:
+                    _write_meta(meta_path, {**meta, **source})
+                except OSError:
+                    pass
+            return pd.read_parquet(cube_path)
+
+    if source["size"] >= STREAM_THRESHOLD_MB * 2 ** 20:
+        cube = stream_cube(path, progress=progress)
+    else:
+        cube = build_cube(read_csv(path))
+    if write:
+        meta = {"version": CUBE_VERSION, **source, "sha256": sha256 or file_sha256(path), "rows": len(cube)}
+        try:
+            _write_sidecar(cube_path, meta_path, cube, meta)
+        except OSError as e:
+            print(f"큐브 사이드카를 저장하지 못했습니다 ({cache_dir}): {e}", file=sys.stderr)
+    return cube
@@ -1,11 +1,16 @@
 import streamlit as st
 import pandas as pd
-import requests
-import xml.etree.ElementTree as ET
+import numpy as np
 import os
+import uuid
 from dotenv import load_dotenv
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import figure_cache
+from molit_client import (SEOUL_SIGUNGU_CODES, fetch_molit_bulk, sync_molit_partitions, merge_molit_partitions,
+                          retry_failures)
+from molit_store import DATA_DIR, MolitStore, current_ymd
 
 # .env 파일 로드
 load_dotenv()
@@ -72,20 +77,6 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# 데이터 디렉토리
-DATA_DIR = r'E:\fastcampus\icb6\project1\data'
-
-# 서울 주요 자치구 법정동 코드
-SEOUL_SIGUNGU_CODES = {
-    '종로구': '11110', '중구': '11140', '용산구': '11170', '성동구': '11200',
-    '광진구': '11215', '동대문구': '11230', '중랑구': '11260', '성북구': '11290',
-    '강북구': '11305', '도봉구': '11320', '노원구': '11350', '은평구': '11380',
-    '서대문구': '11410', '마포구': '11440', '양천구': '11470', '강서구': '11500',
-    '구로구': '11530', '금천구': '11545', '영등포구': '11560', '동작구': '11590',
-    '관악구': '11620', '서초구': '11650', '강남구': '11680', '송파구': '11710',
-    '강동구': '11740'
-}
-
 # --- 컬럼 한글 매핑 사전 ---
 COLUMN_MAP = {
     'dealAmount': '거래금액(만원)',
@@ -103,43 +94,146 @@ COLUMN_MAP = {
     'jibun': '지번'
 }
 
-def fetch_molit_data(lawd_cd, deal_ymd):
-    """국토교통부 실거래가 API 연동 함수"""
-    service_key = os.getenv("MOLIT_API_KEY")
-    if not service_key:
-        st.error(".env 파일에 MOLIT_API_KEY가 설정되어 있지 않습니다.")
-        return None
-        
-    url = "http://apis.data.go.kr/1613000/RTMSDataSvcNrgTrade/getRTMSDataSvcNrgTrade"
-    params = {
-        'serviceKey': service_key,
-        'LAWD_CD': lawd_cd,
-        'DEAL_YMD': deal_ymd,
-        'numOfRows': 1000, 
-        'pageNo': 1
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        root = ET.fromstring(response.content)
-        
-        header = root.find('header')
-        result_msg = header.find('resultMsg').text
-        if result_msg not in ['NORMAL SERVICE.', 'OK']:
-            st.warning(f"API 호출 결과: {result_msg}")
-            return None
-            
-        items = root.findall('.//item')
-        data_list = []
-        for item in items:
-            row = {child.tag: child.text for child in item}
-            data_list.append(row)
-            
-        return pd.DataFrame(data_list) if data_list else None
-    except Exception as e:
-        st.error(f"데이터를 가져오는 중 오류가 발생했습니다: {e}")
-        return None
+# --- 집계 큐브 (자치구 × 법정동 × 연월 × 건물용도) ---
+CUBE_DIMS = ['sggNm', 'umdNm', 'ym', 'buildingUse']
+# 가격 스케치용 로그 구간: 10^2 ~ 10^7 만원을 60개 구간으로 (구간별 건수를 셀마다 보관)
+PRICE_SKETCH_BINS = np.logspace(2, 7, 61)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_molit_cube(_df, version):
+    """거래 데이터를 (자치구, 법정동, 연월, 건물용도) 셀 단위로 한 번만 집계
+
+    셀마다 거래건수 / 금액 건수·합계·최소·최대와 로그 구간별 건수(가격 스케치)를 담는다.
+    데이터셋이 바뀔 때마다 새 version을 주므로 같은 데이터에 대해서는 캐시를 재사용한다.
+    """
+    keys = pd.DataFrame({c: _df[c] for c in ('sggNm', 'umdNm', 'buildingUse') if c in _df.columns})
+    if 'dealYear' in _df.columns and 'dealMonth' in _df.columns:
+        keys['ym'] = _df['dealYear'].astype('Int32') * 100 + _df['dealMonth'].astype('Int32')
+    dims = [c for c in CUBE_DIMS if c in keys.columns]
+    price = pd.to_numeric(_df['dealAmount'], errors='coerce') if 'dealAmount' in _df.columns else pd.Series(np.nan, index=_df.index)
+
+    grouped = keys.assign(price=price.to_numpy()).groupby(dims, observed=True, dropna=False, sort=True)
+    cube = grouped['price'].agg(count='size', price_n='count', price_sum='sum', price_min='min', price_max='max').reset_index()
+    cube['count'] = cube['count'].astype('int32')
+    cube['price_n'] = cube['price_n'].astype('int32')
+    if 'ym' in cube.columns:
+        ym = cube['ym']
+        cube['ym'] = (ym // 100).astype(str) + "-" + (ym % 100).astype(str).str.zfill(2)
+
+    # 가격 스케치: (셀, 로그 구간) 건수 행렬
+    n_bins = len(PRICE_SKETCH_BINS) - 1
+    gid = grouped.ngroup().to_numpy()
+    values = price.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    bins = np.clip(np.searchsorted(PRICE_SKETCH_BINS, values[valid], side='right') - 1, 0, n_bins - 1)
+    sketch = np.bincount(gid[valid] * n_bins + bins, minlength=len(cube) * n_bins)
+    return cube, sketch.reshape(len(cube), n_bins).astype(np.int32)
+
+def sketch_quantile(counts, q):
+    """가격 스케치(구간별 건수)로 q 분위 가격을 추정 (해당 구간의 기하 중앙값)"""
+    total = counts.sum()
+    if total == 0:
+        return np.nan
+    idx = int(np.searchsorted(np.cumsum(counts), q * total))
+    return float(np.sqrt(PRICE_SKETCH_BINS[idx] * PRICE_SKETCH_BINS[idx + 1]))
+
+# --- 차트 다운샘플링 (브라우저로 보내는 점 개수 제한) ---
+# 차트당 최대 점 수 기본값 (사이드바 없이 화면에서 조정 가능)
+CHART_POINT_BUDGET = int(os.getenv("MOLIT_CHART_POINTS", "5000"))
+CHART_POINT_BUDGETS = [1000, 2000, 5000, 10000, 20000]
+
+def _group_codes(df, group_col):
+    if group_col is None or group_col not in df.columns:
+        return np.zeros(len(df), dtype=np.int64)
+    return pd.factorize(df[group_col], use_na_sentinel=False)[0]
+
+def downsample_points(df, budget, value_cols, group_col=None, seed=0):
+    """그룹별 비례 층화 표본 + 이상치(Tukey 울타리 밖)와 그룹별 최소·최대값은 항상 포함
+
+    행 수가 budget 이하면 그대로 반환한다. 이상치가 많으면 울타리에서 먼 순으로 budget의 절반까지만 남긴다.
+    """
+    n = len(df)
+    if n <= budget:
+        return df
+    codes = _group_codes(df, group_col)
+    keep = np.zeros(n, dtype=bool)
+    outlier_score = np.zeros(n)
+    for col in value_cols:
+        v = pd.Series(pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float))
+        g = v.groupby(codes)
+        q1, q3 = g.transform('quantile', 0.25).to_numpy(), g.transform('quantile', 0.75).to_numpy()
+        iqr = np.where(q3 > q1, q3 - q1, 1.0)
+        dist = np.fmax(q1 - 1.5 * iqr - v.to_numpy(), v.to_numpy() - (q3 + 1.5 * iqr)) / iqr
+        outlier_score = np.fmax(outlier_score, np.nan_to_num(dist, nan=0.0))
+        keep |= (v == g.transform('min')).to_numpy() | (v == g.transform('max')).to_numpy()
+    outliers = np.flatnonzero(outlier_score > 0)
+    if len(outliers) > budget // 2:
+        outliers = outliers[np.argsort(-outlier_score[outliers])[:budget // 2]]
+    keep[outliers] = True
+
+    # 나머지 자리는 그룹 크기에 비례해 무작위로 채움 (그룹마다 최소 1개)
+    rest = np.flatnonzero(~keep)
+    remaining = budget - int(keep.sum())
+    if remaining > 0 and len(rest):
+        rest_codes = codes[rest]
+        sizes = np.bincount(rest_codes)
+        quota = np.maximum(1, np.floor(remaining * sizes / len(rest))).astype(np.int64)
+        rank = pd.Series(np.random.default_rng(seed).random(len(rest))).groupby(rest_codes).rank(method='first').to_numpy()
+        keep[rest[rank <= quota[rest_codes]]] = True
+    return df.iloc[np.flatnonzero(keep)]
+
+def box_stats(df, value_col, group_col):
+    """그룹별 상자그림 통계 (plotly 기본 linear 사분위, 울타리는 1.5 IQR 안쪽의 실제 최소·최대값)"""
+    rows = []
+    for name, v in df.groupby(group_col, observed=True, sort=True)[value_col]:
+        v = pd.to_numeric(v, errors='coerce').dropna().to_numpy(dtype=float)
+        if not len(v):
+            continue
+        q1, median, q3 = np.quantile(v, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        inside = v[(v >= q1 - 1.5 * iqr) & (v <= q3 + 1.5 * iqr)]
+        rows.append({'name': name, 'q1': q1, 'median': median, 'q3': q3, 'mean': v.mean(),
+                     'lowerfence': inside.min(), 'upperfence': inside.max(), 'values': v})
+    return rows
+
+def kde_curve(v, grid_size=256):
+    """히스토그램 + 가우시안 평활(Scott 대역폭)로 계산한 밀도 곡선 (y 격자, 밀도)"""
+    v = v[~np.isnan(v)]
+    lo, hi = v.min(), v.max()
+    if hi <= lo:
+        return np.array([lo]), np.array([1.0])
+    counts, edges = np.histogram(v, bins=grid_size, range=(lo, hi))
+    step = edges[1] - edges[0]
+    bandwidth = 1.06 * v.std() * len(v) ** (-1 / 5)
+    sigma = max(bandwidth / step, 0.5)
+    offsets = np.arange(-int(4 * sigma) - 1, int(4 * sigma) + 2)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    density = np.convolve(counts, kernel / kernel.sum(), mode='same')
+    return (edges[:-1] + edges[1:]) / 2, density / (len(v) * step)
+
+def set_molit_df(df, partitions):
+    """수집 결과를 세션에 저장하고 데이터셋 버전(집계 큐브 캐시 키)을 새로 발급"""
+    st.session_state['molit_df'] = df
+    st.session_state['molit_partitions'] = partitions
+    st.session_state['molit_version'] = uuid.uuid4().hex
+
+@st.cache_resource
+def get_molit_store():
+    """세션 간에 공유하는 실거래가 로컬 저장소 (적중/미적중 카운터 포함)"""
+    return MolitStore(DATA_DIR)
+
+def show_fetch_failures(failures):
+    """수집 실패 항목 표시 (회로 차단으로 건너뛴 항목은 한 줄로 요약)"""
+    skipped = [f for f in failures if f.kind == "circuit_open"]
+    for f in failures:
+        if f.kind == "api":
+            st.warning(f"{f.gu_name} - {f.deal_ymd}: {f.error}")
+        elif f.kind != "circuit_open":
+            st.error(f"데이터를 가져오는 중 오류가 발생했습니다 ({f.gu_name} - {f.deal_ymd}): {f.error}")
+    if skipped:
+        cause = next((f.cause for f in skipped if f.cause is not None), None)
+        st.error(f"API 서버 장애로 {len(skipped)}개 월의 요청을 보내지 않았습니다. 잠시 후 '실패 항목 다시 수집'을 눌러주세요."
+                 + (f"\n\n마지막 오류: {type(cause).__name__}: {cause}" if cause is not None else ""))
 
 def main():
     st.title("🏙️ 서울 상업용 부동산 분석 대시보드")
@@ -158,7 +252,13 @@ def main():
             year_options = sorted(range(2021, 2027), reverse=True)
             year = st.selectbox("연도 선택", year_options, index=0)
         
-        if fetch_mode == "월별":
+        sync_mode = st.checkbox("🔄 증분 동기화 (저장소에 없는 달과 이번 달만 수집)",
+                                help="이미 불러온 달은 그대로 두고, 저장소에 없거나 아직 신고가 진행 중인 달만 API로 받아 기존 데이터에 덧붙입니다.")
+        if sync_mode:
+            sync_years = st.select_slider("동기화 연도 범위", options=sorted(year_options), value=(year, year))
+            deal_ymd_list = [f"{y}{m:02d}" for y in range(sync_years[0], sync_years[1] + 1) for m in range(1, 13)
+                             if f"{y}{m:02d}" <= current_ymd()]
+        elif fetch_mode == "월별":
             month = st.selectbox("월 선택", range(1, 13))
             deal_ymd_list = [f"{year}{month:02d}"]
         else:
@@ -169,51 +269,70 @@ def main():
     if fetch_btn:
         if not selected_gus:
             st.warning("최소 하나 이상의 자치구를 선택해주세요.")
+        elif not os.getenv("MOLIT_API_KEY"):
+            st.error(".env 파일에 MOLIT_API_KEY가 설정되어 있지 않습니다.")
         else:
-            all_dfs = []
             target_gus = SEOUL_SIGUNGU_CODES if "서울특별시 전체" in selected_gus else {gu: SEOUL_SIGUNGU_CODES[gu] for gu in selected_gus if gu in SEOUL_SIGUNGU_CODES}
             
-            total_iterations = len(target_gus) * len(deal_ymd_list)
             progress_bar = st.progress(0)
             status_text = st.empty()
-            
-            current_iter = 0
-            for gu_name, gu_code in target_gus.items():
-                for ymd in deal_ymd_list:
-                    current_iter += 1
-                    status_text.text(f"데이터 수집 중... ({gu_name} - {ymd})")
-                    df_temp = fetch_molit_data(gu_code, ymd)
-                    if df_temp is not None:
-                        # 데이터 전처리
-                        if 'dealAmount' in df_temp.columns:
-                            df_temp['dealAmount'] = df_temp['dealAmount'].str.replace(',', '').astype(float)
-                        if 'buildingAr' in df_temp.columns:
-                            df_temp['buildingAr'] = pd.to_numeric(df_temp['buildingAr'], errors='coerce')
-                        if 'floor' in df_temp.columns:
-                            df_temp['floor'] = pd.to_numeric(df_temp['floor'], errors='coerce')
-                        all_dfs.append(df_temp)
-                    progress_bar.progress(current_iter / total_iterations)
-            
-            if all_dfs:
-                combined_df = pd.concat(all_dfs, ignore_index=True)
-                
-                # 다중 선택 레이블 생성
-                if "서울특별시 전체" in selected_gus:
-                    label = "서울특별시 전체"
+
+            def on_progress(done, total, gu_name, ymd):
+                status_text.text(f"데이터 수집 중... ({done}/{total}, {gu_name} - {ymd})")
+                progress_bar.progress(done / total)
+
+            store = get_molit_store()
+            base_df = st.session_state.get('molit_df') if sync_mode else None
+            if base_df is not None:
+                loaded = st.session_state.get('molit_partitions', set())
+                result = sync_molit_partitions(store, target_gus, deal_ymd_list, loaded=loaded, on_progress=on_progress)
+                combined_df = merge_molit_partitions(base_df, result)
+                partitions = loaded | set(result.partitions)
+            else:
+                result = fetch_molit_bulk(target_gus, deal_ymd_list, on_progress=on_progress, store=store)
+                combined_df = result.frame
+                partitions = set(result.partitions)
+            progress_bar.progress(1.0)
+            cache_stats = store.stats()
+            st.caption(f"API 요청 {result.requests}건 · 로컬 저장소 적중 {result.cache_hits}건 · {result.elapsed:.2f}초 "
+                       f"(누적 적중 {cache_stats['hits']} / 미적중 {cache_stats['misses']})")
+            show_fetch_failures(result.failures)
+            st.session_state['molit_failures'] = result.failures
+
+            # 다중 선택 레이블 생성
+            if "서울특별시 전체" in selected_gus:
+                label = "서울특별시 전체"
+            else:
+                label = ", ".join(selected_gus) if len(selected_gus) <= 2 else f"{selected_gus[0]} 외 {len(selected_gus)-1}개 지역"
+            st.session_state['selected_gu_label'] = label
+
+            if combined_df is not None:
+                set_molit_df(combined_df, partitions)
+                if base_df is not None:
+                    st.success(f"{label} 동기화 완료: {len(result.partitions)}개 월 갱신 · 총 {len(combined_df)}건")
                 else:
-                    label = ", ".join(selected_gus) if len(selected_gus) <= 2 else f"{selected_gus[0]} 외 {len(selected_gus)-1}개 지역"
-                
-                st.session_state['molit_df'] = combined_df
-                st.session_state['selected_gu_label'] = label
-                st.success(f"{label} 데이터 총 {len(combined_df)}건을 수집했습니다.")
+                    st.success(f"{label} 데이터 총 {len(combined_df)}건을 수집했습니다.")
             else:
-                st.session_state['molit_df'] = None
+                set_molit_df(None, set())
                 st.info("조회된 실거래 데이터가 없습니다.")
 
+    # 직전 수집에서 실패한 (자치구, 계약년월)만 다시 수집해 기존 데이터에 합침
+    failures = st.session_state.get('molit_failures')
+    if failures and st.button(f"🔁 실패 항목 다시 수집 ({len(failures)}개 월)"):
+        with st.spinner("실패한 항목을 다시 수집하는 중..."):
+            result = retry_failures(failures, store=get_molit_store())
+        loaded = st.session_state.get('molit_partitions', set())
+        combined_df = merge_molit_partitions(st.session_state.get('molit_df'), result)
+        show_fetch_failures(result.failures)
+        st.session_state['molit_failures'] = result.failures
+        set_molit_df(combined_df, loaded | set(result.partitions))
+        st.success(f"{len(result.partitions)}개 월을 다시 수집했습니다. (남은 실패 {len(result.failures)}개)")
+
     if 'molit_df' in st.session_state and st.session_state['molit_df'] is not None:
-        # 원본 데이터 복사 및 한글 컬럼명 적용
-        df_display = st.session_state['molit_df'].copy()
+        df_display = st.session_state['molit_df']
         current_gu_label = st.session_state.get('selected_gu_label', '선택된 지역')
+        # 막대 / 추이 / 분포 차트는 데이터셋당 한 번 만든 집계 큐브에서 조회
+        cube, sketch = build_molit_cube(df_display, st.session_state.get('molit_version'))
         
         st.divider()
         st.subheader("📍 상세 필터링")
@@ -221,10 +340,19 @@ def main():
         # 필터링용 동 필드 (한글 적용 전 original 필드 사용)
         dong_field = 'umdNm' if 'umdNm' in df_display.columns else ('법정동' if '법정동' in df_display.columns else None)
         
+        dong_key = None
         if dong_field:
-            all_dongs = sorted(df_display[dong_field].unique())
+            all_dongs = sorted(cube['umdNm'].dropna().unique()) if 'umdNm' in cube.columns else sorted(df_display[dong_field].unique())
             selected_dongs = st.multiselect("분석할 상세 지역(동) 선택", all_dongs, default=all_dongs)
-            df_display = df_display[df_display[dong_field].isin(selected_dongs)]
+            if len(selected_dongs) < len(all_dongs):
+                dong_key = tuple(selected_dongs)
+                df_display = df_display[df_display[dong_field].isin(selected_dongs)]
+                # 범주형 컬럼에서 필터로 빠진 값 제거 (차트에 0건 항목이 나오지 않도록) — 잘라낸 조각에 대입하지 않고 새 프레임으로
+                df_display = df_display.assign(**{c: df_display[c].cat.remove_unused_categories()
+                                                  for c in df_display.select_dtypes('category').columns})
+                if 'umdNm' in cube.columns:
+                    cube_mask = cube['umdNm'].isin(selected_dongs).to_numpy()
+                    cube, sketch = cube[cube_mask], sketch[cube_mask]
             
             # 한글 컬럼명으로 전체 변경
             df_display = df_display.rename(columns=COLUMN_MAP)
@@ -233,102 +361,205 @@ def main():
             st.warning("동 정보를 찾을 수 없습니다.")
         
         st.info(f"선택된 조건에 해당하는 실거래 데이터 **{len(df_display)}** 건이 분석되었습니다.")
+        # 차트 캐시 필터 키 (figure_cache) — 데이터셋 버전 · 동 선택 · 지역 라벨
+        chart_key = (st.session_state.get('molit_version'), dong_key, current_gu_label)
 
         st.divider()
-        # 자치구별 비교 (한글 컬럼명 기준)
-        if current_gu_label == "서울특별시 전체":
+        # 자치구별 비교 (집계 큐브 기준)
+        if current_gu_label == "서울특별시 전체" and 'sggNm' in cube.columns:
             st.subheader("🏢 자치구별 거래 현황 비교")
             gu_comp_col1, gu_comp_col2 = st.columns(2)
+            gu_agg = cube.groupby('sggNm', observed=True)[['count', 'price_n', 'price_sum']].sum()
             
             with gu_comp_col1:
-                gu_counts = df_display['자치구'].value_counts().reset_index()
-                gu_counts.columns = ['자치구', '거래건수']
-                fig = px.bar(gu_counts, x='거래건수', y='자치구', orientation='h', 
-                             title="자치구별 총 거래건수", color='거래건수', color_continuous_scale='Viridis')
-                st.plotly_chart(fig, use_container_width=True)
+                def build_gu_counts():
+                    gu_counts = gu_agg['count'].sort_values(ascending=False).reset_index()
+                    gu_counts.columns = ['자치구', '거래건수']
+                    fig = px.bar(gu_counts, x='거래건수', y='자치구', orientation='h', 
+                                 title="자치구별 총 거래건수", color='거래건수', color_continuous_scale='Viridis')
+                    return fig
+                figure_cache.plotly_chart("molit.gu_counts", "default", chart_key, build_gu_counts, use_container_width=True)
                 
             with gu_comp_col2:
-                gu_avg_price = df_display.groupby('자치구')['거래금액(만원)'].mean().sort_values(ascending=False).reset_index()
-                gu_avg_price.columns = ['자치구', '평균 거래금액']
-                fig = px.bar(gu_avg_price, x='평균 거래금액', y='자치구', orientation='h',
-                             title="자치구별 평균 거래금액 (만원)", color='평균 거래금액', color_continuous_scale='YlOrRd')
-                st.plotly_chart(fig, use_container_width=True)
+                def build_gu_price():
+                    gu_avg_price = (gu_agg['price_sum'] / gu_agg['price_n']).sort_values(ascending=False).reset_index()
+                    gu_avg_price.columns = ['자치구', '평균 거래금액']
+                    # 자치구별 가격 스케치를 합쳐 중위 거래금액 추정
+                    gu_codes = cube['sggNm'].cat.codes.to_numpy()
+                    gu_sketch = np.zeros((len(cube['sggNm'].cat.categories), sketch.shape[1]), dtype=np.int64)
+                    np.add.at(gu_sketch, gu_codes, sketch)
+                    gu_median = {gu: sketch_quantile(gu_sketch[i], 0.5) for i, gu in enumerate(cube['sggNm'].cat.categories)}
+                    gu_avg_price['중위 거래금액(추정)'] = gu_avg_price['자치구'].map(gu_median).round(-2)
+                    fig = px.bar(gu_avg_price, x='평균 거래금액', y='자치구', orientation='h',
+                                 hover_data=['중위 거래금액(추정)'],
+                                 title="자치구별 평균 거래금액 (만원)", color='평균 거래금액', color_continuous_scale='YlOrRd')
+                    return fig
+                figure_cache.plotly_chart("molit.gu_price", "default", chart_key, build_gu_price, use_container_width=True)
             st.divider()
 
         v_col1, v_col2 = st.columns(2)
         with v_col1:
             st.subheader("📅 거래량 추이")
-            if '거래연도' in df_display.columns and '거래월' in df_display.columns:
-                df_display['년월'] = df_display['거래연도'].astype(str) + "-" + df_display['거래월'].astype(str).str.zfill(2)
-                trend = df_display.groupby('년월').size().reset_index(name='거래건수').sort_values('년월')
-                fig = px.line(trend, x='년월', y='거래건수', markers=True, 
-                             title=f"{current_gu_label} 연월별 거래량 추이", line_shape='spline')
-                fig.update_traces(line_color='#4F46E5')
-                st.plotly_chart(fig, use_container_width=True)
+            if 'ym' in cube.columns:
+                def build_trend():
+                    trend = cube.groupby('ym')['count'].sum().reset_index(name='거래건수').rename(columns={'ym': '년월'})
+                    fig = px.line(trend, x='년월', y='거래건수', markers=True, 
+                                 title=f"{current_gu_label} 연월별 거래량 추이", line_shape='spline')
+                    fig.update_traces(line_color='#4F46E5')
+                    return fig
+                figure_cache.plotly_chart("molit.trend", "default", chart_key, build_trend, use_container_width=True)
             else:
                 st.info("시계열 분석 데이터 부족")
 
         with v_col2:
             st.subheader("🏘️ 지역별 거래 분포 (상위 15개)")
-            # 서울 전체 분석 시 (구+동) 조합 필드 생성
-            if current_gu_label == "서울특별시 전체":
-                df_display['지역명'] = df_display['자치구'] + " " + df_display['법정동']
-                dist_col = '지역명'
-            else:
-                dist_col = '법정동'
-                
-            if dist_col in df_display.columns:
-                dist_data = df_display[dist_col].value_counts().head(15).reset_index()
-                dist_data.columns = ['지역', '거래수']
-                fig = px.bar(dist_data, x='거래수', y='지역', orientation='h',
-                             title=f"{current_gu_label} 주요 지역별 거래 분포", color='거래수', color_continuous_scale='Spectral')
-                st.plotly_chart(fig, use_container_width=True)
+            if 'umdNm' in cube.columns:
+                def build_top_regions():
+                    # 서울 전체 분석 시 (구+동) 조합으로 집계
+                    if current_gu_label == "서울특별시 전체" and 'sggNm' in cube.columns:
+                        dist = cube.groupby(['sggNm', 'umdNm'], observed=True)['count'].sum().nlargest(15)
+                        regions = [f"{gu} {dong}" for gu, dong in dist.index]
+                    else:
+                        dist = cube.groupby('umdNm', observed=True)['count'].sum().nlargest(15)
+                        regions = dist.index.astype(str)
+                    dist_data = pd.DataFrame({'지역': regions, '거래수': dist.to_numpy()})
+                    fig = px.bar(dist_data, x='거래수', y='지역', orientation='h',
+                                 title=f"{current_gu_label} 주요 지역별 거래 분포", color='거래수', color_continuous_scale='Spectral')
+                    return fig
+                figure_cache.plotly_chart("molit.top_regions", "default", chart_key, build_top_regions, use_container_width=True)
 
         st.divider()
         st.subheader("📈 거래가격 정밀 분석 (Price Analysis)")
         
+        sample_col1, sample_col2 = st.columns([1, 2])
+        with sample_col1:
+            exact_render = st.toggle("모든 거래 그대로 그리기 (정확한 렌더링)", value=False,
+                                     help="끄면 점 수가 기준을 넘는 차트는 표본 + 이상치만 그리고, 분포 통계는 전체 데이터로 계산합니다.")
+        with sample_col2:
+            default_budget = CHART_POINT_BUDGET if CHART_POINT_BUDGET in CHART_POINT_BUDGETS else 5000
+            point_budget = st.select_slider("차트당 최대 점 수", options=CHART_POINT_BUDGETS, value=default_budget,
+                                            disabled=exact_render)
+        sampled = not exact_render and len(df_display) > point_budget
+        prices = pd.to_numeric(df_display['거래금액(만원)'], errors='coerce').to_numpy(dtype=float)
+        eda_key = chart_key + (point_budget if sampled else None,)
+        if sampled:
+            st.caption(f"데이터 {len(df_display):,}건 중 차트당 최대 {point_budget:,}개 점만 표시합니다 "
+                       f"(이상치·최소·최대값 포함, 히스토그램·상자·밀도·누적분포 통계는 전체 데이터 기준).")
+        
         eda_col1, eda_col2 = st.columns(2)
         with eda_col1:
             st.markdown("#### 1. 가격 분포 및 밀도 (Histogram)")
-            fig = px.histogram(df_display, x='거래금액(만원)', marginal="rug", 
-                               title="거래 가격 분포 상세", nbins=50, color_discrete_sequence=['#4F46E5'])
-            fig.update_layout(xaxis_title="거래 금액 (만원)", yaxis_title="건수")
-            st.plotly_chart(fig, use_container_width=True)
+            def build_histogram():
+                if sampled:
+                    # 전체 데이터로 구간 건수를 계산하고, rug는 표본 점으로만 표시
+                    counts, edges = np.histogram(prices[~np.isnan(prices)], bins=50)
+                    rug = downsample_points(df_display, point_budget, ['거래금액(만원)'])
+                    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.02)
+                    fig.add_trace(go.Scatter(x=rug['거래금액(만원)'], y=['거래금액(만원)'] * len(rug), mode='markers',
+                                             marker=dict(symbol='line-ns-open', color='#4F46E5'), showlegend=False), row=1, col=1)
+                    fig.add_trace(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                                         marker_color='#4F46E5', showlegend=False), row=2, col=1)
+                    fig.update_yaxes(showticklabels=False, row=1, col=1)
+                    fig.update_layout(title="거래 가격 분포 상세", bargap=0)
+                    fig.update_xaxes(title_text="거래 금액 (만원)", row=2, col=1)
+                    fig.update_yaxes(title_text="건수", row=2, col=1)
+                else:
+                    fig = px.histogram(df_display, x='거래금액(만원)', marginal="rug", 
+                                       title="거래 가격 분포 상세", nbins=50, color_discrete_sequence=['#4F46E5'])
+                    fig.update_layout(xaxis_title="거래 금액 (만원)", yaxis_title="건수")
+                return fig
+            figure_cache.plotly_chart("molit.histogram", "default", eda_key, build_histogram, use_container_width=True)
 
         with eda_col2:
             st.markdown("#### 2. 지역별 가격 비교 및 이상치 (Box Plot)")
-            fig = px.box(df_display, x='자치구', y='거래금액(만원)', points="all",
-                         title="자치구별 거래 가격 분포 및 이상치 확인", color='자치구')
-            st.plotly_chart(fig, use_container_width=True)
+            def build_box():
+                if sampled:
+                    # 상자는 전체 데이터 통계, 점은 층화 표본 + 이상치
+                    points = downsample_points(df_display, point_budget, ['거래금액(만원)'], group_col='자치구')
+                    palette = px.colors.qualitative.Plotly
+                    fig = go.Figure()
+                    for i, stats in enumerate(box_stats(df_display, '거래금액(만원)', '자치구')):
+                        color = palette[i % len(palette)]
+                        gu_points = points.loc[points['자치구'] == stats['name'], '거래금액(만원)']
+                        fig.add_trace(go.Box(name=str(stats['name']), x=[stats['name']], q1=[stats['q1']], median=[stats['median']],
+                                             q3=[stats['q3']], mean=[stats['mean']], lowerfence=[stats['lowerfence']],
+                                             upperfence=[stats['upperfence']], boxpoints=False, marker_color=color,
+                                             legendgroup=str(stats['name'])))
+                        fig.add_trace(go.Box(name=str(stats['name']), x=[stats['name']] * len(gu_points), y=gu_points,
+                                             boxpoints='all', jitter=0.3, pointpos=-1.8, marker_color=color,
+                                             fillcolor='rgba(0,0,0,0)', line_width=0, hoveron='points',
+                                             legendgroup=str(stats['name']), showlegend=False))
+                    fig.update_layout(title="자치구별 거래 가격 분포 및 이상치 확인", boxmode='overlay',
+                                      xaxis_title='자치구', yaxis_title='거래금액(만원)')
+                else:
+                    fig = px.box(df_display, x='자치구', y='거래금액(만원)', points="all",
+                                 title="자치구별 거래 가격 분포 및 이상치 확인", color='자치구')
+                return fig
+            figure_cache.plotly_chart("molit.box", "default", eda_key, build_box, use_container_width=True)
 
         eda_col3, eda_col4 = st.columns(2)
         with eda_col3:
             st.markdown("#### 3. 가격 밀집도 상세 분석 (Violin Plot)")
-            fig = px.violin(df_display, y='거래금액(만원)', x='자치구', color='자치구', box=True,
-                            title="자치구별 가격 밀집 데이터 분산")
-            st.plotly_chart(fig, use_container_width=True)
+            def build_violin():
+                if sampled:
+                    # 원시 점 대신 NumPy로 계산한 밀도 곡선 + 전체 데이터 상자 통계
+                    palette = px.colors.qualitative.Plotly
+                    fig = go.Figure()
+                    stats_list = box_stats(df_display, '거래금액(만원)', '자치구')
+                    for i, stats in enumerate(stats_list):
+                        color = palette[i % len(palette)]
+                        grid, density = kde_curve(stats['values'])
+                        half_width = 0.4 * density / density.max()
+                        fig.add_trace(go.Scatter(x=np.concatenate([i - half_width, (i + half_width)[::-1]]),
+                                                 y=np.concatenate([grid, grid[::-1]]), fill='toself', mode='lines',
+                                                 line_color=color, name=str(stats['name']), hoverinfo='name'))
+                        fig.add_trace(go.Box(x=[i], q1=[stats['q1']], median=[stats['median']], q3=[stats['q3']],
+                                             lowerfence=[stats['lowerfence']], upperfence=[stats['upperfence']],
+                                             boxpoints=False, width=0.08, marker_color=color, showlegend=False,
+                                             name=str(stats['name'])))
+                    fig.update_layout(title="자치구별 가격 밀집 데이터 분산", xaxis_title='자치구', yaxis_title='거래금액(만원)',
+                                      xaxis=dict(tickvals=list(range(len(stats_list))),
+                                                 ticktext=[str(s['name']) for s in stats_list]))
+                else:
+                    fig = px.violin(df_display, y='거래금액(만원)', x='자치구', color='자치구', box=True,
+                                    title="자치구별 가격 밀집 데이터 분산")
+                return fig
+            figure_cache.plotly_chart("molit.violin", "default", eda_key, build_violin, use_container_width=True)
 
         with eda_col4:
             st.markdown("#### 4. 면적 대비 가격 분석 (Scatter Plot)")
             if '건물면적(㎡)' in df_display.columns:
                 # 층 정보가 있으면 색상으로 구분
-                hue_col = '층' if '층' in df_display.columns else None
-                fig = px.scatter(df_display, x='건물면적(㎡)', y='거래금액(만원)', color=hue_col,
-                                 hover_data=['법정동', '건축년도', '건물용도'], 
-                                 title="건물 면적 vs 거래 가격 상관관계",
-                                 color_continuous_scale='Bluered')
-                fig.update_layout(xaxis_title="건물 면적 (㎡)", yaxis_title="거래 금액 (만원)")
-                st.plotly_chart(fig, use_container_width=True)
+                def build_scatter():
+                    hue_col = '층' if '층' in df_display.columns else None
+                    scatter_df = (downsample_points(df_display, point_budget, ['건물면적(㎡)', '거래금액(만원)'], group_col='자치구')
+                                  if sampled else df_display)
+                    fig = px.scatter(scatter_df, x='건물면적(㎡)', y='거래금액(만원)', color=hue_col,
+                                     hover_data=['법정동', '건축년도', '건물용도'], 
+                                     title="건물 면적 vs 거래 가격 상관관계",
+                                     color_continuous_scale='Bluered')
+                    fig.update_layout(xaxis_title="건물 면적 (㎡)", yaxis_title="거래 금액 (만원)")
+                    return fig
+                figure_cache.plotly_chart("molit.scatter", "default", eda_key, build_scatter, use_container_width=True)
             else:
                 st.info("면적 데이터 부족")
 
         eda_col5, eda_col6 = st.columns(2)
         with eda_col5:
             st.markdown("#### 5. 누적분포함수 그래프 (ECDF Plot)")
-            fig = px.ecdf(df_display, x='거래금액(만원)', title="가격 누적 분포 현황 (ECDF)")
-            fig.update_traces(line_color='#EF4444')
-            fig.update_layout(xaxis_title="거래 금액 (만원)", yaxis_title="누적 비율")
-            st.plotly_chart(fig, use_container_width=True)
+            def build_ecdf():
+                if sampled:
+                    # 전체 데이터의 분위수 point_budget개로 계단 곡선을 근사 (양 끝값 포함)
+                    valid_prices = np.sort(prices[~np.isnan(prices)])
+                    idx = np.unique(np.linspace(0, len(valid_prices) - 1, point_budget).round().astype(np.int64))
+                    ecdf = pd.DataFrame({'거래금액(만원)': valid_prices[idx], 'probability': (idx + 1) / len(valid_prices)})
+                    fig = px.line(ecdf, x='거래금액(만원)', y='probability', line_shape='hv', title="가격 누적 분포 현황 (ECDF)")
+                else:
+                    fig = px.ecdf(df_display, x='거래금액(만원)', title="가격 누적 분포 현황 (ECDF)")
+                fig.update_traces(line_color='#EF4444')
+                fig.update_layout(xaxis_title="거래 금액 (만원)", yaxis_title="누적 비율")
+                return fig
+            figure_cache.plotly_chart("molit.ecdf", "default", eda_key, build_ecdf, use_container_width=True)
 
         st.divider()
         st.subheader("💎 거래 금액 하이라이트 (TOP 10)")
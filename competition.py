@@ -0,0 +1,88 @@
+"""
+매장 단위 경쟁 지표
+map_points 좌표로 매장(또는 출점 후보 위치)마다 반경별 같은 브랜드 / 다른 브랜드 매장 수와
+가장 가까운 경쟁(다른 브랜드) 매장까지의 거리를 계산한다.
+격자 인덱스(spatial_index.GridIndex)로 반경 안의 쌍을 한 번에 만들어 집계한다.
+"""
+
+import numpy as np
+import pandas as pd
+
+# 기본 경쟁 반경 (m)
+COMPETITION_RADII_M = (300, 500, 1000)
+
+
+def _nearest_competitor_fallback(index, codes, lat, lng, brand_code, start_m, self_pos=-1):
+    """반경 안에 경쟁 매장이 없는 조회점: 반경을 두 배씩 넓혀 다른 브랜드 매장까지 거리 (없으면 NaN)"""
+    meters = start_m
+    while meters <= 200_000:
+        pos, dist = index.radius(lat, lng, meters)
+        mask = (codes[pos] != brand_code) & (pos != self_pos)
+        if mask.any():
+            return dist[mask][0]
+        meters *= 2
+    return np.nan
+
+
+def competition_metrics(index, brands, lat, lng, query_brands=None, radii=COMPETITION_RADII_M, self_pos=None):
+    """조회점별 반경 내 같은/다른 브랜드 매장 수와 최근접 경쟁 매장 거리 → DataFrame
+
+    index 는 brands 와 같은 순서의 좌표로 만든 GridIndex.
+    query_brands 는 조회점의 브랜드 (후보 위치에 낼 브랜드). None 이면 모든 매장을 경쟁 매장으로 본다.
+    self_pos 는 조회점이 매장 자신일 때 그 매장 위치 (자기 자신은 세지 않음).
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    n = len(lat)
+    radii = sorted(radii)
+    codes, uniques = pd.factorize(np.asarray(brands))
+    if query_brands is None:
+        query_codes = np.full(n, -2)
+    else:
+        # 점 데이터에 없는 브랜드는 어떤 매장과도 같지 않음
+        query_codes = pd.Index(uniques).get_indexer(np.asarray(query_brands))
+        query_codes[query_codes < 0] = -2
+
+    q, pos, dist = index.query_pairs(lat, lng, radii[-1])
+    if self_pos is not None:
+        not_self = pos != np.asarray(self_pos)[q]
+        q, pos, dist = q[not_self], pos[not_self], dist[not_self]
+    same = codes[pos] == query_codes[q]
+
+    out = {}
+    for r in radii:
+        within = dist <= r
+        out[f"same_{r}m"] = np.bincount(q[within & same], minlength=n).astype(np.int32)
+        out[f"other_{r}m"] = np.bincount(q[within & ~same], minlength=n).astype(np.int32)
+
+    # 최근접 경쟁 매장: 쌍은 조회점 순으로 모여 있으므로 구간별 최솟값
+    nearest = np.full(n, np.nan)
+    q_other, d_other = q[~same], dist[~same]
+    if len(q_other):
+        starts = np.flatnonzero(np.r_[True, q_other[1:] != q_other[:-1]])
+        nearest[q_other[starts]] = np.minimum.reduceat(d_other, starts)
+    for i in np.flatnonzero(np.isnan(nearest)):
+        nearest[i] = _nearest_competitor_fallback(
+            index, codes, lat[i], lng[i], query_codes[i], radii[-1] * 2,
+            -1 if self_pos is None else self_pos[i],
+        )
+    out["nearest_competitor_m"] = nearest
+    return pd.DataFrame(out)
+
+
+def store_competition(index, df_points, radii=COMPETITION_RADII_M):
+    """매장마다 (자기 브랜드 기준) 경쟁 지표 — df_points 는 index 를 만든 것과 같은 순서"""
+    metrics = competition_metrics(
+        index, df_points["brand"].to_numpy(), df_points["lat"].to_numpy(), df_points["lng"].to_numpy(),
+        query_brands=df_points["brand"].to_numpy(), radii=radii, self_pos=np.arange(len(df_points)),
+    )
+    return pd.concat([df_points.reset_index(drop=True), metrics], axis=1)
+
+
+def location_competition(index, df_points, locations, brand=None, radii=COMPETITION_RADII_M):
+    """후보 위치(lat, lng 컬럼)에 brand 를 낸다고 할 때의 경쟁 지표"""
+    metrics = competition_metrics(
+        index, df_points["brand"].to_numpy(), locations["lat"].to_numpy(), locations["lng"].to_numpy(),
+        query_brands=None if brand is None else np.full(len(locations), brand, dtype=object), radii=radii,
+    )
+    return pd.concat([locations.reset_index(drop=True), metrics], axis=1)
@@ -0,0 +1,176 @@
+"""
+카페 입지 대시보드 스냅샷
+dashboard_data.json / detailed_analysis.json 을 미리 가공한 Arrow(Feather) 파일로 저장하고,
+대시보드 시작 시 JSON 파싱 대신 메모리 매핑으로 읽는다. 원본 JSON이 바뀌면 자동으로 다시 만든다.
+
+예) python dashboard_snapshot.py    # 스냅샷 강제 재생성
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+
+import pandas as pd
+import pyarrow.feather as feather
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 스냅샷 저장 위치 (data/ 아래라 git에는 포함되지 않음)
+SNAPSHOT_DIR = os.getenv("DASHBOARD_SNAPSHOT_DIR", os.path.join(BASE_DIR, "data", "snapshot"))
+
+# 가공 방식이 바뀌면 올려서 기존 스냅샷을 무효화
+SNAPSHOT_VERSION = 2
+
+SOURCE_FILES = ("dashboard_data.json", "detailed_analysis.json")
+FRAMES = ("dong", "map")
+
+# detailed_analysis.json 에서 df_dong 으로 가져오는 상세 지표
+DETAIL_METRICS = [
+    'opportunity_score', 'penetration_rate', 'peak_sales_ratio',
+    'weekday_sales_ratio', 'avg_op_days', 'closure_rate', 'competition_intensity',
+    'penetration_score', 'commercial_index'
+]
+
+
+def source_fingerprint(base_dir=BASE_DIR):
+    """원본 JSON 파일별 sha256 (없는 파일은 None)"""
+    hashes = {}
+    for name in SOURCE_FILES:
+        path = os.path.join(base_dir, name)
+        if not os.path.exists(path):
+            hashes[name] = None
+            continue
+        with open(path, "rb") as f:
+            hashes[name] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+
+def build_frames(data, detailed_data):
+    """원본 JSON → (df_dong, df_map, 미매칭 행정동 목록)"""
+    # 행정동 DataFrame
+    df_dong = pd.DataFrame(data["dong_data"])
+
+    # 상세 지표 병합 (정규화한 행정동명으로 한 번에 조인)
+    unmatched_dongs = []
+    if detailed_data:
+        dong_key = df_dong['dong_name'].str.replace(r'[·.•]', '', regex=True).str.strip()
+        # 상세 데이터에 없는 행정동·지표는 0
+        df_detail = (pd.DataFrame.from_dict(detailed_data, orient='index')
+                     .reindex(columns=DETAIL_METRICS, fill_value=0).fillna(0))
+        matched = dong_key.isin(df_detail.index)
+        unmatched_dongs = sorted(df_dong.loc[~matched, 'dong_name'])
+        detail_cols = df_detail.reindex(dong_key, fill_value=0).set_axis(df_dong.index)
+        df_dong = pd.concat([df_dong, detail_cols], axis=1)
+
+    # 브랜드 컬럼 분리
+    brands_df = pd.json_normalize(df_dong["brands"])
+    brands_df.columns = [f"cnt_{c}" for c in brands_df.columns]
+    df_dong = pd.concat([df_dong.drop(columns=["brands"]), brands_df], axis=1)
+
+    # 지도 포인트 DataFrame
+    df_map = pd.DataFrame(data["map_points"])
+
+    # 지도 포인트에 행정동 이름 머지 (필터링용)
+    if not df_map.empty and 'dong_name' not in df_map.columns:
+        df_map = pd.merge(
+            df_map,
+            df_dong[['dong_code', 'dong_name']],
+            on='dong_code',
+            how='left'
+        )
+
+    return df_dong, df_map, unmatched_dongs
+
+
+def _read_sources(base_dir):
+    with open(os.path.join(base_dir, "dashboard_data.json"), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    detailed_data = {}
+    detailed_json_path = os.path.join(base_dir, "detailed_analysis.json")
+    if os.path.exists(detailed_json_path):
+        with open(detailed_json_path, "r", encoding="utf-8") as f:
+            detailed_data = json.load(f)
+    return data, detailed_data
+
+
+def _frame_path(out_dir, name):
+    return os.path.join(out_dir, f"{name}.arrow")
+
+
+def _write_snapshot(out_dir, meta, frames):
+    os.makedirs(out_dir, exist_ok=True)
+    suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+    # 메모리 매핑이 가능하도록 압축 없이 저장, meta.json 은 마지막에 교체
+    for name, df in zip(FRAMES, frames):
+        tmp_path = f"{_frame_path(out_dir, name)}.{suffix}"
+        feather.write_feather(df, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, _frame_path(out_dir, name))
+    tmp_path = os.path.join(out_dir, f"meta.json.{suffix}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(out_dir, "meta.json"))
+    # 이전 버전이 남긴 프레임 파일 (예: 추천 rec.arrow) 정리
+    for entry in os.listdir(out_dir):
+        if entry.endswith(".arrow") and entry[:-len(".arrow")] not in FRAMES:
+            os.remove(os.path.join(out_dir, entry))
+
+
+def build_snapshot(base_dir=BASE_DIR, out_dir=SNAPSHOT_DIR, write=True):
+    """원본 JSON을 가공해 스냅샷을 만든다 → (meta, df_dong, df_map)
+
+    저장 위치에 쓸 수 없으면 저장은 건너뛰고 가공 결과만 반환한다.
+    """
+    sources = source_fingerprint(base_dir)
+    data, detailed_data = _read_sources(base_dir)
+    df_dong, df_map, unmatched_dongs = build_frames(data, detailed_data)
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "sources": sources,
+        "built": datetime.now().isoformat(timespec="seconds"),
+        "brands": data["brands"],
+        "brand_colors": data["brand_colors"],
+        "brand_stats": data["brand_stats"],
+        "unmatched_dongs": unmatched_dongs,
+    }
+    if write:
+        try:
+            _write_snapshot(out_dir, meta, (df_dong, df_map))
+        except OSError as e:
+            print(f"스냅샷을 저장하지 못했습니다 ({out_dir}): {e}", file=sys.stderr)
+    return meta, df_dong, df_map
+
+
+def read_meta(out_dir=SNAPSHOT_DIR):
+    try:
+        with open(os.path.join(out_dir, "meta.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(meta, base_dir=BASE_DIR, out_dir=SNAPSHOT_DIR):
+    """스냅샷이 현재 원본 JSON·가공 버전과 일치하는지 여부"""
+    return (
+        meta is not None
+        and meta.get("version") == SNAPSHOT_VERSION
+        and meta.get("sources") == source_fingerprint(base_dir)
+        and all(os.path.exists(_frame_path(out_dir, name)) for name in FRAMES)
+    )
+
+
+def load_snapshot(base_dir=BASE_DIR, out_dir=SNAPSHOT_DIR):
+    """(meta, df_dong, df_map) — 스냅샷이 없거나 원본 JSON과 다르면 다시 만든다"""
+    meta = read_meta(out_dir)
+    if not is_current(meta, base_dir, out_dir):
+        return build_snapshot(base_dir, out_dir)
+    frames = [feather.read_table(_frame_path(out_dir, name), memory_map=True).to_pandas() for name in FRAMES]
+    return (meta, *frames)
+
+
+if __name__ == "__main__":
+    meta, df_dong, df_map = build_snapshot()
+    print(f"스냅샷 생성: {SNAPSHOT_DIR} (행정동 {len(df_dong)}개 · 매장 {len(df_map):,}개 · "
+          f"상세 지표 미매칭 {len(meta['unmatched_dongs'])}개)")
@@ -0,0 +1,88 @@
+"""
+Plotly figure 캐시
+차트 id · 테마 · 필터 값으로 키를 만들어 직렬화한 figure JSON 을 LRU 로 보관한다.
+main_app / business_dashboard / commercial_realestate_api 가 같은 모듈을 쓰므로 한 프로세스 안에서 캐시를 공유한다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+# 최대 보관 figure 수 / 전체 JSON 크기 (MB)
+FIGURE_CACHE_SIZE = int(os.getenv("FIGURE_CACHE_SIZE", "256"))
+FIGURE_CACHE_MB = float(os.getenv("FIGURE_CACHE_MB", "64"))
+
+
+def filter_hash(filters):
+    """필터 값(튜플 · 문자열 · 숫자 등) → 짧은 해시 (repr 기준이므로 값이 같으면 키도 같다)"""
+    return hashlib.sha1(repr(filters).encode("utf-8")).hexdigest()[:16]
+
+
+class FigureCache:
+    """figure JSON LRU 캐시
+
+    키는 (chart_id, theme, filter_hash(filters)). filters 에는 차트가 의존하는 값을 모두 넣는다
+    (데이터 버전, 필터, 가중치 등). 개수나 전체 크기 한도를 넘으면 오래 안 쓴 것부터 버린다.
+    """
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE, max_bytes=int(FIGURE_CACHE_MB * 2 ** 20)):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get_json(self, chart_id, theme, filters, build):
+        """캐시된 figure JSON (없으면 build() 로 만든 go.Figure 를 직렬화해 저장)"""
+        key = (chart_id, theme, filter_hash(filters))
+        with self._lock:
+            spec = self._items.get(key)
+            if spec is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return spec
+            self.misses += 1
+        # 빌드는 잠금 밖에서 (같은 키를 동시에 만들면 나중 것이 덮어씀)
+        spec = build().to_json()
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._items[key] = spec
+            self.nbytes += len(spec)
+            while len(self._items) > 1 and (len(self._items) > self.maxsize or self.nbytes > self.max_bytes):
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= len(evicted)
+                self.evictions += 1
+        return spec
+
+    def stats(self):
+        """적중 / 실패 / 제거 횟수와 현재 크기"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._items),
+                "nbytes": self.nbytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+FIGURE_CACHE = FigureCache()
+
+
+def plotly_chart(chart_id, theme, filters, build, **kwargs):
+    """캐시된 figure 로 st.plotly_chart (build 는 캐시에 없을 때만 호출)"""
+    return st.plotly_chart(json.loads(FIGURE_CACHE.get_json(chart_id, theme, filters, build)), **kwargs)
@@ -3,13 +3,19 @@
 Streamlit 버전 - dashboard_data.json 기반
 """
 
-import json
-import os
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
+import figure_cache
+from competition import COMPETITION_RADII_M, location_competition, store_competition
+from dashboard_snapshot import load_snapshot
+from recommender import Recommender
+from scoring import DEFAULT_WEIGHTS, ScoreWeights, ScoringEngine
+from spatial_index import GridIndex, hex_cells, hex_centers, hex_size_for_zoom, zoom_for_span
+
 # ──────────────────────────────────────────────
 # 페이지 설정
 # ──────────────────────────────────────────────
@@ -25,58 +31,158 @@ st.set_page_config(
 # ──────────────────────────────────────────────
 @st.cache_data
 def load_data():
-    """dashboard_data.json 및 p_v2/detailed_analysis.json 로드 (캐시)"""
-    json_path = os.path.join(os.path.dirname(__file__), "dashboard_data.json")
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # 신규 상세 지표 로드
-    detailed_json_path = os.path.join(os.path.dirname(__file__), "detailed_analysis.json")
-    detailed_data = {}
-    if os.path.exists(detailed_json_path):
-        with open(detailed_json_path, "r", encoding="utf-8") as f:
-            detailed_data = json.load(f)
-
-    # 행정동 DataFrame
-    df_dong = pd.DataFrame(data["dong_data"])
-    
-    # 상세 지표 병합
-    def get_detailed_metric(row, metric):
-        name = row['dong_name'].replace('·', '').replace('.', '').replace('•', '').strip()
-        return detailed_data.get(name, {}).get(metric, 0)
-
-    if detailed_data:
-        metrics_to_add = [
-            'opportunity_score', 'penetration_rate', 'peak_sales_ratio', 
-            'weekday_sales_ratio', 'avg_op_days', 'closure_rate', 'competition_intensity',
-            'penetration_score', 'commercial_index'
-        ]
-        for m in metrics_to_add:
-            df_dong[m] = df_dong.apply(lambda r: get_detailed_metric(r, m), axis=1)
-
-    # 브랜드 컬럼 분리
-    brands_df = pd.json_normalize(df_dong["brands"])
-    brands_df.columns = [f"cnt_{c}" for c in brands_df.columns]
-    df_dong = pd.concat([df_dong.drop(columns=["brands"]), brands_df], axis=1)
-
-    # 지도 포인트 DataFrame
-    df_map = pd.DataFrame(data["map_points"])
-    
-    # 지도 포인트에 행정동 이름 머지 (필터링용)
-    if not df_map.empty and 'dong_name' not in df_map.columns:
-        df_map = pd.merge(
-            df_map, 
-            df_dong[['dong_code', 'dong_name']], 
-            on='dong_code', 
-            how='left'
-        )
-
-    # 추천 DataFrame
-    df_rec = pd.DataFrame(data["recommend_top"])
-
-    return data, df_dong, df_map, df_rec
-
-data, df_dong, df_map, df_rec = load_data()
+    """dashboard_data.json 및 detailed_analysis.json 스냅샷 로드 (캐시)
+
+    가공된 Arrow 스냅샷을 메모리 매핑으로 읽고, JSON이 바뀌었으면 다시 만든다 (dashboard_snapshot.py).
+    """
+    meta, df_dong, df_map = load_snapshot()
+    data = {key: meta[key] for key in ("brands", "brand_colors", "brand_stats")}
+    # 원본 JSON 해시 — 파생 리소스(지도 인덱스 등) 캐시 키로 사용
+    data["source_hash"] = "-".join(str(h) for h in meta["sources"].values())
+    return data, df_dong, df_map, meta["unmatched_dongs"]
+
+data, df_dong, df_map, UNMATCHED_DONGS = load_data()
+
+@st.cache_resource
+def get_map_index(source_hash):
+    """매장 좌표 격자 인덱스 (반경 / 영역 / 최근접 조회용, 조회 결과는 df_map 행 위치)"""
+    return GridIndex(df_map["lat"].to_numpy(), df_map["lng"].to_numpy())
+
+MAP_INDEX = get_map_index(data["source_hash"])
+
+def brand_rgb_array(brands, colors, default="#888888"):
+    """브랜드 배열 → (n, 3) uint8 RGB (브랜드별 hex 를 한 번만 변환해 조회표로 매핑)"""
+    codes, uniques = pd.factorize(brands)
+    lut = np.array(
+        [[int(colors.get(b, default).lstrip("#")[i:i + 2], 16) for i in (0, 2, 4)] for b in uniques],
+        dtype=np.uint8,
+    ).reshape(-1, 3)
+    return lut[codes]
+
+@st.cache_resource(max_entries=4)
+def get_map_payloads(source_hash, theme_mode, color_items):
+    """테마별 지도 레이어 데이터 → (전체 DataFrame, 브랜드별 레코드 목록)
+
+    색상은 r/g/b uint8 컬럼으로 미리 넣어 두고, 브랜드 선택이 바뀌면 캐시된 레코드 목록만 이어 붙인다.
+    캐시된 목록은 공유되므로 수정하지 않는다.
+    """
+    payload = df_map[["lng", "lat", "brand", "name"]].copy()
+    rgb = brand_rgb_array(payload["brand"], dict(color_items))
+    payload["r"], payload["g"], payload["b"] = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    blocks = {brand: block.to_dict(orient="records") for brand, block in payload.groupby("brand", sort=False)}
+    return payload, blocks
+
+@st.cache_resource
+def get_scoring_engine(source_hash):
+    """행정동 점수 재계산 엔진 (정규화는 한 번, 가중치 조합별 점수는 엔진 내부 LRU 캐시)"""
+    return ScoringEngine(df_dong)
+
+@st.cache_resource
+def get_recommender(source_hash):
+    """행정동 × 브랜드 추천 행렬 (질의 결과는 내부 LRU 캐시)"""
+    return Recommender(df_dong, BRANDS, get_scoring_engine(source_hash))
+
+# 추천 탭에서 한 번에 순위를 매기는 최대 결과 수 (화면에는 페이지 단위로 표시)
+REC_MAX_RESULTS = 600
+
+@st.cache_data(max_entries=4096, show_spinner=False)
+def render_rec_card(rank, row, theme_items, color, brand_color):
+    """추천 카드 한 장의 HTML (순위·행 값·테마별 캐시)"""
+    theme = dict(theme_items)
+    r = dict(row)
+    score = r.get("attractiveness_score")
+    score_color = "#4ECDC4" if score and score > 60 else "#FFE66D" if score and score > 40 else "#FF6B6B"
+    html = f"""
+    <div style="background:{theme['surface']};border:1px solid {theme['border']};border-radius:12px;
+         padding:18px;border-top:4px solid {color};margin-bottom:14px;box-shadow: 0 4px 10px {theme['shadow']}">
+      <div style="font-size:.75rem;color:{theme['text_sub']};font-weight:700">#{rank} 추천</div>
+      <div style="font-size:1.1rem;font-weight:800;margin:6px 0;color:{theme['text']}">{r['dong_name']}</div>
+      <span style="background:{color}15;color:{brand_color};padding:3px 10px;
+            border-radius:12px;font-size:.78rem;font-weight:800;border:1px solid {color}30">{r['brand']}</span>
+      <span style="font-size:.75rem;color:{theme['text_sub']};margin-left:8px;font-weight:600">미진출 지역</span>
+      <div style="display:grid;grid-template-columns:1fr 1fr;gap:8px;margin-top:16px">
+        <div style="background:{theme['surface2']};border-radius:8px;padding:10px;border:1px solid {theme['border']}">
+          <div style="font-size:.68rem;color:{theme['text_sub']};font-weight:700">매력도</div>
+          <div style="font-size:1.2rem;font-weight:900;color:{score_color}">
+            {f"{score:.1f}" if score else "-"}
+          </div>
+        </div>
+        <div style="background:{theme['surface2']};border-radius:8px;padding:10px;border:1px solid {theme['border']}">
+          <div style="font-size:.68rem;color:{theme['text_sub']};font-weight:700">수요</div>
+          <div style="font-size:1.2rem;font-weight:900;color:#00897b">
+            {f"{r['demand_score']:.1f}" if r.get('demand_score') else "-"}
+          </div>
+        </div>
+        <div style="background:{theme['surface2']};border-radius:8px;padding:10px;border:1px solid {theme['border']}">
+          <div style="font-size:.68rem;color:{theme['text_sub']};font-weight:700">경쟁</div>
+          <div style="font-size:1.2rem;font-weight:900;color:#f57f17">
+            {f"{r['competition_score']:.1f}" if r.get('competition_score') else "-"}
+          </div>
+        </div>
+        <div style="background:{theme['surface2']};border-radius:8px;padding:10px;border:1px solid {theme['border']}">
+          <div style="font-size:.68rem;color:{theme['text_sub']};font-weight:700">비용</div>
+          <div style="font-size:1.2rem;font-weight:900;color:#2e7d32">
+            {f"{r['cost_score']:.1f}" if r.get('cost_score') else "-"}
+          </div>
+        </div>
+      </div>
+      <div style="font-size:.8rem;color:{theme['text']};margin-top:12px;font-weight:700;border-top:1px solid {theme['border']};padding-top:8px">
+        근로자 {int(r.get('total_workers',0)):,}명 · 
+        카페 {int(r.get('cafe_count',0))}개 <br>
+        월평균 매출 <span style="color:#005cc5">{r.get('monthly_sales',0)/1e8:.1f}억 원</span>
+      </div>
+    </div>
+    """
+    # 들여쓰기가 마크다운 코드 블록으로 해석되지 않도록 줄 앞 공백 제거
+    return "".join(line.strip() + " " for line in html.splitlines())
+
+@st.cache_data(max_entries=8)
+def get_store_competition(source_hash, radii):
+    """매장별 반경 내 같은/다른 브랜드 매장 수와 최근접 경쟁 매장 거리"""
+    return store_competition(MAP_INDEX, df_map[["brand", "name", "dong_name", "lat", "lng"]], radii)
+
+@st.cache_data(max_entries=32)
+def get_dong_competition(source_hash, radii, brand):
+    """행정동 후보 위치(동 안 매장들의 평균 좌표)에 brand 를 낼 때의 경쟁 지표 (brand=None 이면 전체 매장 기준)"""
+    locations = df_map.groupby("dong_name", sort=True)[["lat", "lng"]].mean().reset_index()
+    return location_competition(MAP_INDEX, df_map, locations, brand=brand, radii=radii)
+
+# 자동 표시 모드에서 이 줌 레벨 미만이면 육각형 집계, 이상이면 개별 매장
+MAP_AGG_ZOOM = 14
+
+def hex_brand_table(lat, lng, brands, size_m):
+    """점 → (q, r, brand, count) 육각형 × 브랜드 매장 수"""
+    q, r = hex_cells(lat, lng, size_m)
+    table = pd.DataFrame({"q": q, "r": r, "brand": np.asarray(brands)})
+    return table.groupby(["q", "r", "brand"], sort=False).size().reset_index(name="count")
+
+@st.cache_data(max_entries=16)
+def get_hex_brand_table(source_hash, size_m):
+    """전체 매장의 육각형 × 브랜드 매장 수 (크기 단계별 캐시)"""
+    return hex_brand_table(df_map["lat"].to_numpy(), df_map["lng"].to_numpy(), df_map["brand"].to_numpy(), size_m)
+
+def hex_layer_records(table, size_m, colors):
+    """육각형별 중심·매장 수·브랜드 구성 → 레이어 레코드 (색은 최다 브랜드, 진하기는 매장 수)"""
+    if table.empty:
+        return []
+    table = table.sort_values(["q", "r", "count"], ascending=[True, True, False])
+    cells = table.groupby(["q", "r"], sort=False)
+    agg = cells.agg(count=("count", "sum"), top_brand=("brand", "first")).reset_index()
+    # 상위 3개 브랜드 구성 문자열
+    top3 = table.assign(label=table["brand"] + " " + table["count"].astype(str)).groupby(["q", "r"], sort=False).head(3)
+    agg["mix"] = top3.groupby(["q", "r"], sort=False)["label"].agg(" · ".join).to_numpy()
+    agg["lat"], agg["lng"] = hex_centers(agg["q"].to_numpy(), agg["r"].to_numpy(), size_m)
+    agg = agg.drop(columns=["q", "r"])
+    rgb = brand_rgb_array(agg["top_brand"], colors)
+    agg["r"], agg["g"], agg["b"] = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    agg["a"] = (80 + 175 * np.log1p(agg["count"]) / np.log1p(agg["count"].max())).astype(np.uint8)
+    return agg[["lng", "lat", "count", "mix", "r", "g", "b", "a"]].to_dict(orient="records")
+
+@st.cache_data(max_entries=64)
+def get_hex_layer_records(source_hash, size_m, brands, color_items):
+    """브랜드 선택·크기 단계·테마 색상별 육각형 레이어 레코드 (전체 매장 기준)"""
+    table = get_hex_brand_table(source_hash, size_m)
+    return hex_layer_records(table[table["brand"].isin(brands)], size_m, dict(color_items))
 
 BRANDS      = data["brands"]
 BRAND_COLORS = data["brand_colors"]
@@ -92,116 +198,119 @@ with st.sidebar:
 
 is_light = (theme_mode == "Light")
 
-# 테마별 색상 정의
-THEME = {
-    "bg": "#f8f9fa" if is_light else "#0d1117",
-    "surface": "#ffffff" if is_light else "#161b22",
-    "surface2": "#f1f3f5" if is_light else "#21262d",
-    "border": "#dee2e6" if is_light else "#30363d",
-    "text": "#212529" if is_light else "#e6edf3",
-    "text_sub": "#495057" if is_light else "#8b949e",
-    "accent": "#005cc5" if is_light else "#58a6ff",
-    "shadow": "rgba(0, 0, 0, 0.08)" if is_light else "rgba(0, 0, 0, 0.4)",
-}
-
-# 라이트 모드 시인성 확보를 위한 브랜드 색상
-ADJUSTED_BRAND_COLORS = {}
-for b, c in data["brand_colors"].items():
-    if is_light:
-        # 주요 브랜드 시인성 보정
-        manual_colors = {
-            "더벤티": "#d12d2d", "매머드커피": "#09a39a", "메가커피": "#b18e00",
-            "빽다방": "#2e8b57", "컴포즈커피": "#8a63d2", "이디야": "#1e40af", "바나프레소": "#ef4444"
-        }
-        ADJUSTED_BRAND_COLORS[b] = manual_colors.get(b, c)
-    else:
-        ADJUSTED_BRAND_COLORS[b] = c
+@st.cache_data(max_entries=4)
+def get_theme(theme_mode, brand_color_items):
+    """테마별 색상 · 브랜드 보정 색상 · 커스텀 CSS (테마가 바뀔 때만 다시 만든다)"""
+    is_light = (theme_mode == "Light")
+
+    # 테마별 색상 정의
+    theme = {
+        "bg": "#f8f9fa" if is_light else "#0d1117",
+        "surface": "#ffffff" if is_light else "#161b22",
+        "surface2": "#f1f3f5" if is_light else "#21262d",
+        "border": "#dee2e6" if is_light else "#30363d",
+        "text": "#212529" if is_light else "#e6edf3",
+        "text_sub": "#495057" if is_light else "#8b949e",
+        "accent": "#005cc5" if is_light else "#58a6ff",
+        "shadow": "rgba(0, 0, 0, 0.08)" if is_light else "rgba(0, 0, 0, 0.4)",
+    }
+
+    # 라이트 모드 시인성 확보를 위한 브랜드 색상
+    adjusted = {}
+    for b, c in brand_color_items:
+        if is_light:
+            # 주요 브랜드 시인성 보정
+            manual_colors = {
+                "더벤티": "#d12d2d", "매머드커피": "#09a39a", "메가커피": "#b18e00",
+                "빽다방": "#2e8b57", "컴포즈커피": "#8a63d2", "이디야": "#1e40af", "바나프레소": "#ef4444"
+            }
+            adjusted[b] = manual_colors.get(b, c)
+        else:
+            adjusted[b] = c
 
-# ──────────────────────────────────────────────
-# 커스텀 CSS
-# ──────────────────────────────────────────────
-st.markdown(f"""
+    # 커스텀 CSS
+    css = f"""
 <style>
 /* 전체 배경 */
-[data-testid="stAppViewContainer"] {{ background: {THEME["bg"]}; color: {THEME["text"]}; }}
-[data-testid="stSidebar"] {{ background: {THEME["surface"]}; border-right: 1px solid {THEME["border"]}; }}
+[data-testid="stAppViewContainer"] {{ background: {theme["bg"]}; color: {theme["text"]}; }}
+[data-testid="stSidebar"] {{ background: {theme["surface"]}; border-right: 1px solid {theme["border"]}; }}
 [data-testid="stHeader"] {{ background: rgba(0,0,0,0); }}
 
 /* 텍스트 색상 강제 적용 */
-h1, h2, h3, h4, h5, h6, p, span, label, div {{ color: {THEME["text"]}; }}
-.stMarkdown p {{ color: {THEME["text"]}; }}
+h1, h2, h3, h4, h5, h6, p, span, label, div {{ color: {theme["text"]}; }}
+.stMarkdown p {{ color: {theme["text"]}; }}
 
 /* 헤더 */
 .main-header {{
-    background: {THEME["surface"]};
-    background-image: linear-gradient(135deg, {THEME["surface"]}, {THEME["bg"]});
-    border: 1px solid {THEME["border"]};
+    background: {theme["surface"]};
+    background-image: linear-gradient(135deg, {theme["surface"]}, {theme["bg"]});
+    border: 1px solid {theme["border"]};
     border-radius: 12px;
     padding: 24px 32px;
     margin-bottom: 24px;
-    box-shadow: 0 4px 15px {THEME["shadow"]};
+    box-shadow: 0 4px 15px {theme["shadow"]};
     text-align: center;
 }}
 .main-header h1 {{
     font-size: 1.8rem; font-weight: 900;
-    background: linear-gradient(90deg, {THEME["accent"]}, #8a63d2);
+    background: linear-gradient(90deg, {theme["accent"]}, #8a63d2);
     -webkit-background-clip: text; -webkit-text-fill-color: transparent;
     margin: 0;
 }}
-.main-header p {{ color: {THEME["text_sub"]}; margin: 8px 0 0; font-size: .9rem; font-weight: 500; }}
+.main-header p {{ color: {theme["text_sub"]}; margin: 8px 0 0; font-size: .9rem; font-weight: 500; }}
 
 /* 브랜드 카드 */
 .brand-card {{
-    background: {THEME["surface"]};
-    border: 1px solid {THEME["border"]};
+    background: {theme["surface"]};
+    border: 1px solid {theme["border"]};
     border-radius: 10px;
     padding: 16px;
     text-align: center;
-    box-shadow: 0 2px 8px {THEME["shadow"]};
+    box-shadow: 0 2px 8px {theme["shadow"]};
 }}
 .brand-name {{ font-size: 1.1rem; font-weight: 700; margin-bottom: 8px; }}
 .brand-val  {{ font-size: 1.8rem; font-weight: 900; }}
-.brand-sub  {{ font-size: .72rem; color: {THEME["text_sub"]}; }}
+.brand-sub  {{ font-size: .72rem; color: {theme["text_sub"]}; }}
 
 /* 메트릭 카드 */
 [data-testid="metric-container"] {{
-    background: {THEME["surface"]} !important;
-    border: 1px solid {THEME["border"]} !important;
+    background: {theme["surface"]} !important;
+    border: 1px solid {theme["border"]} !important;
     border-radius: 10px !important;
     padding: 14px !important;
-    box-shadow: 0 2px 6px {THEME["shadow"]} !important;
+    box-shadow: 0 2px 6px {theme["shadow"]} !important;
 }}
 
 /* 점수 설명 카드 */
 .stp-card {{
-    background: {THEME["surface"]};
+    background: {theme["surface"]};
     border-radius: 10px;
     padding: 16px;
-    border: 1px solid {THEME["border"]};
-    border-left: 4px solid var(--stp-color, {THEME["accent"]});
-    box-shadow: 0 2px 8px {THEME["shadow"]};
+    border: 1px solid {theme["border"]};
+    border-left: 4px solid var(--stp-color, {theme["accent"]});
+    box-shadow: 0 2px 8px {theme["shadow"]};
 }}
 .stp-name  {{ font-size: .9rem; font-weight: 800; margin-bottom: 10px; }}
 .stp-formula {{
     font-family: 'Roboto Mono', monospace;
     font-size: .75rem;
     font-weight: 700;
-    background: {THEME["surface2"]};
+    background: {theme["surface2"]};
     border-radius: 6px;
     padding: 8px 12px;
     margin-bottom: 10px;
     line-height: 1.6;
     white-space: pre-line;
-    color: {THEME["text"]};
-    border: 1px dashed {THEME["border"]};
+    color: {theme["text"]};
+    border: 1px dashed {theme["border"]};
 }}
-.stp-note {{ font-size: .72rem; color: {THEME["text_sub"]}; line-height: 1.6; font-weight: 500; }}
+.stp-note {{ font-size: .72rem; color: {theme["text_sub"]}; line-height: 1.6; font-weight: 500; }}
 
 /* 지도 툴팁 스타일 수정 */
 .deckgl-tooltip {{
-    background: {THEME["surface"]} !important;
-    color: {THEME["text"]} !important;
-    border: 1px solid {THEME["border"]} !important;
+    background: {theme["surface"]} !important;
+    color: {theme["text"]} !important;
+    border: 1px solid {theme["border"]} !important;
     font-weight: 500;
 }}
 
@@ -210,7 +319,15 @@ h1, h2, h3, h4, h5, h6, p, span, label, div {{ color: {THEME["text"]}; }}
     font-weight: 500;
 }}
 </style>
-""", unsafe_allow_html=True)
+"""
+    return theme, adjusted, css
+
+THEME, ADJUSTED_BRAND_COLORS, THEME_CSS = get_theme(theme_mode, tuple(data["brand_colors"].items()))
+
+# ──────────────────────────────────────────────
+# 커스텀 CSS
+# ──────────────────────────────────────────────
+st.markdown(THEME_CSS, unsafe_allow_html=True)
 
 # ──────────────────────────────────────────────
 # Plotly 공통 레이아웃
@@ -239,80 +356,59 @@ st.markdown("""
 with st.sidebar:
     st.divider()
 
-    st.markdown("### 🔍 필터")
+    st.markdown("### 🔍 분석 메뉴")
     selected_tab = st.radio(
         "분석 메뉴",
         ["📊 브랜드 개요", "🗺️ 지도", "🏙️ 행정동 분석", "📊 분석 시각화", "⭐ 입지 추천"],
         label_visibility="collapsed",
     )
     st.divider()
-
-    if selected_tab == "🏙️ 행정동 분석":
-        all_dongs = sorted(df_dong["dong_name"].unique())
-        dong_search = st.selectbox("🏙️ 행정동 선택", ["전체"] + all_dongs)
-        brand_filter = st.selectbox("브랜드 필터", ["전체"] + BRANDS)
-        sort_by = st.selectbox(
-            "정렬 기준",
-            ["total_brand_count", "attractiveness_score", "monthly_sales", "opportunity_score", "penetration_rate", "peak_sales_ratio", "closure_rate"],
-            format_func=lambda x: {
-                "total_brand_count": "총 브랜드 수",
-                "attractiveness_score": "매력도 점수",
-                "monthly_sales": "월 매출",
-                "opportunity_score": "기회 지수 (종사자/저가카페)",
-                "penetration_rate": "저가 브랜드 침투율",
-                "peak_sales_ratio": "피크 시간 매출 비중",
-                "closure_rate": "폐업률",
-            }[x],
-        )
-
-    elif selected_tab == "⭐ 입지 추천":
-        rec_brand = st.selectbox("브랜드 선택", ["전체"] + BRANDS)
-        rec_sort = st.selectbox(
-            "정렬 기준",
-            ["attractiveness_score", "demand_score", "cost_score"],
-            format_func=lambda x: {
-                "attractiveness_score": "매력도 점수",
-                "demand_score": "수요 점수",
-                "cost_score": "비용 점수",
-            }[x],
-        )
-        all_dongs = sorted(df_dong["dong_name"].unique())
-        rec_search = st.selectbox("🏙️ 행정동 선택", ["전체"] + all_dongs)
-
-    elif selected_tab == "🗺️ 지도":
-        map_brands = st.multiselect(
-            "표시할 브랜드",
-            BRANDS,
-            default=BRANDS,
-        )
-        all_dongs = sorted(df_dong["dong_name"].unique())
-        map_dongs = st.multiselect(
-            "📍 행정동 선택",
-            all_dongs,
-            placeholder="동 이름을 선택하세요 (미선택 시 전체)",
-            help="선택한 행정동의 매장만 지도에 표시합니다."
-        )
-
-    st.divider()
     st.caption(f"행정동 {len(df_dong)}개 · 매장 {len(df_map):,}개")
+    if UNMATCHED_DONGS:
+        with st.expander(f"⚠️ 상세 지표 미매칭 행정동 {len(UNMATCHED_DONGS)}개"):
+            st.caption("detailed_analysis.json에서 찾지 못해 상세 지표가 0으로 표시됩니다.")
+            st.write(", ".join(UNMATCHED_DONGS))
+
+    # 점수 가중치 (바꾸면 모든 탭의 점수·순위를 다시 계산)
+    with st.expander("⚖️ 점수 가중치 조정"):
+        w_demand = st.slider("수요 가중치", 0.0, 1.0, DEFAULT_WEIGHTS.demand, 0.05)
+        w_competition = st.slider("경쟁 가중치", 0.0, 1.0, DEFAULT_WEIGHTS.competition, 0.05)
+        w_cost = st.slider("비용 가중치", 0.0, 1.0, DEFAULT_WEIGHTS.cost, 0.05)
+        w_sales = st.slider("수요 중 매출 비중", 0.0, 1.0, DEFAULT_WEIGHTS.sales, 0.05,
+                            help="나머지는 종사자 수 비중입니다.")
+        SCORE_WEIGHTS = ScoreWeights(w_demand, w_competition, w_cost, w_sales, 1 - w_sales).normalized()
+        st.caption("세 가중치는 합이 1이 되도록 자동으로 맞춥니다.")
 
     # 점수 계산 방법 설명 (항상 접근 가능)
     with st.expander("❓ 점수 계산 방법"):
-        st.markdown("""
+        st.markdown(f"""
 **Min-Max 정규화(0~1)** 후 3가지 점수를 가중 합산합니다.
 
 | 점수 | 공식 | 의미 |
 |---|---|---|
-| 📈 **수요** | (정규화_매출×0.5 + 정규화_종사자×0.5)×100 | 높을수록 ↑ |
+| 📈 **수요** | (정규화_매출×{SCORE_WEIGHTS.sales:g} + 정규화_종사자×{SCORE_WEIGHTS.workers:g})×100 | 높을수록 ↑ |
 | ⚔️ **경쟁** | (1 − 정규화_카페수)×100 | 카페 적을수록 ↑ |
 | 💰 **비용** | (1 − 정규화_부동산가)×100 | 임대료 낮을수록 ↑ |
-| ⭐ **매력도** | 수요×0.4 + 경쟁×0.3 + 비용×0.3 | 종합 입지 지수 |
+| ⭐ **매력도** | 수요×{SCORE_WEIGHTS.demand:g} + 경쟁×{SCORE_WEIGHTS.competition:g} + 비용×{SCORE_WEIGHTS.cost:g} | 종합 입지 지수 |
         """)
 
+# 현재 가중치로 점수 재계산 (가중치 조합별 캐시, 기본 가중치면 원본 점수)
+df_dong = df_dong.assign(**get_scoring_engine(data["source_hash"]).scores(SCORE_WEIGHTS))
+
+ALL_DONGS = sorted(df_dong["dong_name"].unique())
+
+# 차트 캐시 필터 키 (figure_cache) — 데이터만 쓰는 차트 / 현재 가중치 점수도 쓰는 차트
+DATA_KEY = (data["source_hash"],)
+SCORE_KEY = (data["source_hash"], SCORE_WEIGHTS)
+
+# 각 탭은 st.fragment — 탭 안의 필터·표 선택을 바꾸면 그 탭만 다시 실행된다.
+# 사이드바(테마 · 메뉴 · 점수 가중치)를 바꿀 때만 전체 스크립트가 다시 실행된다.
+
 # ══════════════════════════════════════════════
 # 탭 1: 브랜드 개요
 # ══════════════════════════════════════════════
-if selected_tab == "📊 브랜드 개요":
+@st.fragment
+def render_brand_overview():
 
     # 브랜드 카드 (5개)
     cols = st.columns(5)
@@ -345,132 +441,232 @@ if selected_tab == "📊 브랜드 개요":
 
     with c1:
         st.markdown("##### 브랜드별 총 매장 수")
-        fig = go.Figure(go.Bar(
-            x=BRANDS,
-            y=[BRAND_STATS[b]["total_stores"] for b in BRANDS],
-            marker_color=[ADJUSTED_BRAND_COLORS[b] for b in BRANDS],
-            text=[BRAND_STATS[b]["total_stores"] for b in BRANDS],
-            textposition="outside",
-        ))
-        fig.update_layout(**PLOT_LAYOUT, height=300)
-        fig.update_xaxes(**GRID_STYLE)
-        fig.update_yaxes(**GRID_STYLE)
-        st.plotly_chart(fig, use_container_width=True)
+        def build_total_stores():
+            fig = go.Figure(go.Bar(
+                x=BRANDS,
+                y=[BRAND_STATS[b]["total_stores"] for b in BRANDS],
+                marker_color=[ADJUSTED_BRAND_COLORS[b] for b in BRANDS],
+                text=[BRAND_STATS[b]["total_stores"] for b in BRANDS],
+                textposition="outside",
+            ))
+            fig.update_layout(**PLOT_LAYOUT, height=300)
+            fig.update_xaxes(**GRID_STYLE)
+            fig.update_yaxes(**GRID_STYLE)
+            return fig
+        figure_cache.plotly_chart("overview.total_stores", theme_mode, DATA_KEY, build_total_stores, use_container_width=True)
 
     with c2:
         st.markdown("##### 브랜드별 진출 행정동 수")
-        fig = go.Figure(go.Pie(
-            labels=BRANDS,
-            values=[BRAND_STATS[b]["dong_count"] for b in BRANDS],
-            marker_colors=[ADJUSTED_BRAND_COLORS[b] for b in BRANDS],
-            hole=0.45,
-            textinfo="label+percent",
-        ))
-        fig.update_layout(**PLOT_LAYOUT, height=300,
-            legend=dict(orientation="h", y=-0.1),
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def build_dong_share():
+            fig = go.Figure(go.Pie(
+                labels=BRANDS,
+                values=[BRAND_STATS[b]["dong_count"] for b in BRANDS],
+                marker_colors=[ADJUSTED_BRAND_COLORS[b] for b in BRANDS],
+                hole=0.45,
+                textinfo="label+percent",
+            ))
+            fig.update_layout(**PLOT_LAYOUT, height=300,
+                legend=dict(orientation="h", y=-0.1),
+            )
+            return fig
+        figure_cache.plotly_chart("overview.dong_share", theme_mode, DATA_KEY, build_dong_share, use_container_width=True)
 
     # 차트 행 2: 상위 30개 동 누적 막대
     st.markdown("##### 행정동별 브랜드 분포 (총 브랜드 수 상위 30개 동)")
-    top30 = df_dong[df_dong["total_brand_count"] > 0].nlargest(30, "total_brand_count")
-    fig = go.Figure()
-    for brand in BRANDS:
-        col = f"cnt_{brand}"
-        if col in top30.columns:
-            fig.add_trace(go.Bar(
-                name=brand,
-                x=top30["dong_name"],
-                y=top30[col],
-                marker_color=ADJUSTED_BRAND_COLORS[brand],
-            ))
-    fig.update_layout(
-        **PLOT_LAYOUT, barmode="stack", height=350,
-        legend=dict(orientation="h", y=1.05),
-    )
-    fig.update_xaxes(tickangle=-40, **GRID_STYLE)
-    fig.update_yaxes(**GRID_STYLE)
-    st.plotly_chart(fig, use_container_width=True)
+    def build_top30():
+        top30 = df_dong[df_dong["total_brand_count"] > 0].nlargest(30, "total_brand_count")
+        fig = go.Figure()
+        for brand in BRANDS:
+            col = f"cnt_{brand}"
+            if col in top30.columns:
+                fig.add_trace(go.Bar(
+                    name=brand,
+                    x=top30["dong_name"],
+                    y=top30[col],
+                    marker_color=ADJUSTED_BRAND_COLORS[brand],
+                ))
+        fig.update_layout(
+            **PLOT_LAYOUT, barmode="stack", height=350,
+            legend=dict(orientation="h", y=1.05),
+        )
+        fig.update_xaxes(tickangle=-40, **GRID_STYLE)
+        fig.update_yaxes(**GRID_STYLE)
+        return fig
+    figure_cache.plotly_chart("overview.top30_stack", theme_mode, DATA_KEY, build_top30, use_container_width=True)
 
     # 차트 행 3: 연령대별 매출
     st.markdown("##### 연령대별 총 매출 합계")
-    age_cols  = ["age_10","age_20","age_30","age_40","age_50","age_60"]
-    age_labels = ["10대","20대","30대","40대","50대","60대+"]
-    age_colors = ["#FF6B6B","#FFE66D","#4ECDC4","#58a6ff","#bc8cff","#A8E6CF"]
-    age_totals = [df_dong[c].sum() / 1e8 for c in age_cols]
-
-    fig = go.Figure(go.Bar(
-        x=age_labels, y=age_totals,
-        marker_color=age_colors,
-        text=[f"{v:.0f}억" for v in age_totals],
-        textposition="outside",
-    ))
-    fig.update_layout(**PLOT_LAYOUT, height=300)
-    fig.update_xaxes(**GRID_STYLE)
-    fig.update_yaxes(title="매출(억원)", **GRID_STYLE)
-    st.plotly_chart(fig, use_container_width=True)
+    def build_age_sales():
+        age_cols  = ["age_10","age_20","age_30","age_40","age_50","age_60"]
+        age_labels = ["10대","20대","30대","40대","50대","60대+"]
+        age_colors = ["#FF6B6B","#FFE66D","#4ECDC4","#58a6ff","#bc8cff","#A8E6CF"]
+        age_totals = [df_dong[c].sum() / 1e8 for c in age_cols]
+
+        fig = go.Figure(go.Bar(
+            x=age_labels, y=age_totals,
+            marker_color=age_colors,
+            text=[f"{v:.0f}억" for v in age_totals],
+            textposition="outside",
+        ))
+        fig.update_layout(**PLOT_LAYOUT, height=300)
+        fig.update_xaxes(**GRID_STYLE)
+        fig.update_yaxes(title="매출(억원)", **GRID_STYLE)
+        return fig
+    figure_cache.plotly_chart("overview.age_sales", theme_mode, DATA_KEY, build_age_sales, use_container_width=True)
 
 
 # ══════════════════════════════════════════════
 # 탭 2: 지도
 # ══════════════════════════════════════════════
-elif selected_tab == "🗺️ 지도":
+@st.fragment
+def render_map():
     st.markdown("##### 📍 저가 커피 브랜드 매장 위치")
 
-    # 필터링 (브랜드 + 행정동)
-    filtered_map = df_map[df_map["brand"].isin(map_brands)] if map_brands else df_map.iloc[0:0]
-    
-    if map_dongs:
-        filtered_map = filtered_map[filtered_map["dong_name"].isin(map_dongs)]
+    # 필터 (바꾸면 지도 탭만 다시 실행)
+    f1, f2 = st.columns(2)
+    with f1:
+        map_brands = st.multiselect(
+            "표시할 브랜드",
+            BRANDS,
+            default=BRANDS,
+        )
+    with f2:
+        map_dongs = st.multiselect(
+            "📍 행정동 선택",
+            ALL_DONGS,
+            placeholder="동 이름을 선택하세요 (미선택 시 전체)",
+            help="선택한 행정동의 매장만 지도에 표시합니다."
+        )
+    f3, f4, f5, f6 = st.columns([2, 1, 2, 2])
+    with f3:
+        map_mode = st.radio("표시 방식", ["자동", "육각형 집계", "개별 매장"], horizontal=True,
+                            help="자동: 넓게 볼 때는 육각형 단위 매장 수, 가까이 볼 때는 개별 매장을 표시합니다.")
+    with f4:
+        map_radius_on = st.toggle("📏 반경 검색", help="기준 위치에서 일정 거리 안의 매장만 표시합니다.")
+    if map_radius_on:
+        with f5:
+            map_center_dong = st.selectbox("기준 행정동 (매장 분포 중심)", sorted(df_map["dong_name"].dropna().unique()))
+        with f6:
+            map_radius_m = st.slider("반경 (m)", 100, 3000, 500, step=100)
+
+    # 필터링 (반경 + 브랜드 + 행정동)
+    radius_center = None
+    filtered_map = df_map
+    if map_radius_on:
+        center_pos = np.flatnonzero((df_map["dong_name"] == map_center_dong).to_numpy())
+        if len(center_pos):
+            lat_c, lng_c, _ = MAP_INDEX.centroid(center_pos)
+            radius_pos, radius_dist = MAP_INDEX.radius(lat_c, lng_c, map_radius_m)
+            radius_center = (lat_c, lng_c)
+            filtered_map = df_map.iloc[radius_pos].assign(distance_m=radius_dist.round())
+        else:
+            st.info(f"{map_center_dong}에는 매장 좌표가 없어 반경 검색을 적용하지 않았습니다.")
 
-    if filtered_map.empty:
-        st.warning("표시할 브랜드를 사이드바에서 선택하세요.")
+    brand_only = radius_center is None and not map_dongs
+    if brand_only:
+        filtered_map = None
+        map_total = int(df_map["brand"].isin(map_brands).sum())
     else:
-        # 색상 컬럼 추가 (hex → RGB)
-        def hex_to_rgb(h):
-            h = h.lstrip("#")
-            return [int(h[i:i+2], 16) for i in (0, 2, 4)] + [200]
-
-        filtered_map = filtered_map.copy()
-        filtered_map["color"] = filtered_map["brand"].map(
-            lambda b: hex_to_rgb(ADJUSTED_BRAND_COLORS.get(b, "#888888"))
-        )
+        filtered_map = filtered_map[filtered_map["brand"].isin(map_brands)] if map_brands else df_map.iloc[0:0]
+        if map_dongs:
+            filtered_map = filtered_map[filtered_map["dong_name"].isin(map_dongs)]
+        map_total = len(filtered_map)
 
+    if not map_total:
+        st.warning("표시할 매장이 없습니다. 위 필터에서 브랜드·행정동·반경을 확인하세요.")
+    else:
         import pydeck as pdk
         
-        # 지도 중심 결정 (선택한 동이 하나라면 해당 동의 평균 위치로)
-        if map_dongs and not filtered_map.empty:
-            lat_center = filtered_map["lat"].mean()
-            lng_center = filtered_map["lng"].mean()
-            zoom_level = 13
+        # 지도 시점: 반경 검색이면 원 전체, 행정동 선택이면 매장 영역에 맞춤
+        extra_layers = []
+        if radius_center is not None:
+            lat_center, lng_center = radius_center
+            zoom_level = zoom_for_span(lat_center, 2 * map_radius_m)
+            extra_layers.append(pdk.Layer(
+                "ScatterplotLayer",
+                data=[{"lng": lng_center, "lat": lat_center}],
+                get_position=["lng", "lat"],
+                get_radius=map_radius_m,
+                stroked=True,
+                filled=True,
+                get_fill_color=[0, 92, 197, 25],
+                get_line_color=[0, 92, 197, 160],
+                line_width_min_pixels=2,
+            ))
+        elif map_dongs:
+            lat_center, lng_center, span_m = MAP_INDEX.centroid(df_map.index.get_indexer(filtered_map.index))
+            zoom_level = zoom_for_span(lat_center, span_m)
         else:
             lat_center = 37.5665
             lng_center = 126.9780
             zoom_level = 10.5
 
-        layer = pdk.Layer(
-            "ScatterplotLayer",
-            data=filtered_map,
-            get_position=["lng", "lat"],
-            get_fill_color="color",
-            get_radius=80,
-            pickable=True,
-            auto_highlight=True,
-        )
+        use_hex = map_mode == "육각형 집계" or (map_mode == "자동" and zoom_level < MAP_AGG_ZOOM)
+        tooltip_style = {"background": THEME["surface"], "color": THEME["text"]}
+        if use_hex:
+            # 육각형 중심 + 매장 수 + 브랜드 구성만 전송 (매장 수와 무관하게 화면 영역의 셀 수로 제한)
+            hex_size = hex_size_for_zoom(lat_center, zoom_level)
+            if brand_only:
+                hex_records = get_hex_layer_records(data["source_hash"], hex_size, tuple(map_brands),
+                                                    tuple(sorted(ADJUSTED_BRAND_COLORS.items())))
+            else:
+                hex_table = hex_brand_table(filtered_map["lat"].to_numpy(), filtered_map["lng"].to_numpy(),
+                                            filtered_map["brand"].to_numpy(), hex_size)
+                hex_records = hex_layer_records(hex_table, hex_size, ADJUSTED_BRAND_COLORS)
+            layer = pdk.Layer(
+                "ColumnLayer",
+                data=hex_records,
+                get_position=["lng", "lat"],
+                disk_resolution=6,
+                radius=hex_size,
+                coverage=0.92,
+                extruded=False,
+                get_fill_color="[r, g, b, a]",
+                pickable=True,
+                auto_highlight=True,
+            )
+            tooltip = {"html": "<b>매장 {count}개</b><br>{mix}", "style": tooltip_style}
+            st.caption(f"육각형 집계 (반지름 {hex_size:,}m) · 셀 {len(hex_records):,}개 · 매장 {map_total:,}개 "
+                       f"— 색은 셀 안 최다 브랜드, 진하기는 매장 수")
+        else:
+            map_payload, brand_blocks = get_map_payloads(data["source_hash"], theme_mode, tuple(sorted(ADJUSTED_BRAND_COLORS.items())))
+            if brand_only:
+                # 브랜드만 고른 경우: 브랜드별로 캐시된 레코드를 이어 붙임
+                map_records = [rec for brand in map_brands for rec in brand_blocks.get(brand, [])]
+            else:
+                map_records = map_payload.loc[filtered_map.index].to_dict(orient="records")
+            layer = pdk.Layer(
+                "ScatterplotLayer",
+                data=map_records,
+                get_position=["lng", "lat"],
+                get_fill_color="[r, g, b, 200]",
+                get_radius=80,
+                pickable=True,
+                auto_highlight=True,
+            )
+            tooltip = {"html": "<b>{brand}</b><br>{name}", "style": tooltip_style}
         view = pdk.ViewState(latitude=lat_center, longitude=lng_center, zoom=zoom_level, pitch=0)
-        tooltip = {"html": "<b>{brand}</b><br>{name}", "style": {"background": THEME["surface"], "color": THEME["text"]}}
 
         st.pydeck_chart(pdk.Deck(
-            layers=[layer],
+            layers=extra_layers + [layer],
             initial_view_state=view,
             tooltip=tooltip,
             map_style="light" if is_light else "dark",
         ))
 
+        # 반경 검색 결과: 기준 위치에서 가까운 매장
+        if radius_center is not None:
+            st.caption(f"{map_center_dong} 매장 분포 중심에서 반경 {map_radius_m:,}m 안의 매장 {len(filtered_map):,}개")
+            nearest = filtered_map.nsmallest(10, "distance_m")[["brand", "name", "dong_name", "distance_m"]]
+            st.dataframe(
+                nearest.rename(columns={"brand": "브랜드", "name": "매장명", "dong_name": "행정동", "distance_m": "거리(m)"}),
+                hide_index=True, use_container_width=True,
+            )
+
         # 브랜드별 매장 수 요약
         st.markdown("---")
         summary_cols = st.columns(len(map_brands))
-        brand_counts = filtered_map["brand"].value_counts()
+        brand_counts = (df_map["brand"] if brand_only else filtered_map["brand"]).value_counts()
         for i, brand in enumerate(map_brands):
             cnt = brand_counts.get(brand, 0)
             color = ADJUSTED_BRAND_COLORS[brand]
@@ -488,7 +684,29 @@ elif selected_tab == "🗺️ 지도":
 # ══════════════════════════════════════════════
 # 탭 3: 행정동 분석
 # ══════════════════════════════════════════════
-elif selected_tab == "🏙️ 행정동 분석":
+@st.fragment
+def render_dong_analysis():
+
+    # 필터 (바꾸면 행정동 분석 탭만 다시 실행)
+    f1, f2, f3 = st.columns(3)
+    with f1:
+        dong_search = st.selectbox("🏙️ 행정동 선택", ["전체"] + ALL_DONGS)
+    with f2:
+        brand_filter = st.selectbox("브랜드 필터", ["전체"] + BRANDS)
+    with f3:
+        sort_by = st.selectbox(
+            "정렬 기준",
+            ["total_brand_count", "attractiveness_score", "monthly_sales", "opportunity_score", "penetration_rate", "peak_sales_ratio", "closure_rate"],
+            format_func=lambda x: {
+                "total_brand_count": "총 브랜드 수",
+                "attractiveness_score": "매력도 점수",
+                "monthly_sales": "월 매출",
+                "opportunity_score": "기회 지수 (종사자/저가카페)",
+                "penetration_rate": "저가 브랜드 침투율",
+                "peak_sales_ratio": "피크 시간 매출 비중",
+                "closure_rate": "폐업률",
+            }[x],
+        )
 
     # 필터 적용
     df_view = df_dong.copy()
@@ -630,8 +848,8 @@ elif selected_tab == "🏙️ 행정동 분석":
             st.markdown(f"""
             <div class="stp-card" style="--stp-color:#4ECDC4">
               <div class="stp-name" style="color:#4ECDC4">📈 수요 점수</div>
-              <div class="stp-formula">(정규화_매출 × 0.5\\n+ 정규화_종사자 × 0.5)\\n× 100</div>
-              <div class="stp-note">월매출 + 종사자수를 동등 반영. 높을수록 ↑</div>
+              <div class="stp-formula">(정규화_매출 × {SCORE_WEIGHTS.sales:g}\\n+ 정규화_종사자 × {SCORE_WEIGHTS.workers:g})\\n× 100</div>
+              <div class="stp-note">월매출 + 종사자수를 가중 반영. 높을수록 ↑</div>
             </div>
             """, unsafe_allow_html=True)
         with sc2:
@@ -654,7 +872,7 @@ elif selected_tab == "🏙️ 행정동 분석":
             st.markdown(f"""
             <div class="stp-card" style="--stp-color:{THEME['accent']}">
               <div class="stp-name" style="color:{THEME['accent']}">⭐ 종합 매력도</div>
-              <div class="stp-formula">수요 × 0.4\\n+ 경쟁 × 0.3\\n+ 비용 × 0.3</div>
+              <div class="stp-formula">수요 × {SCORE_WEIGHTS.demand:g}\\n+ 경쟁 × {SCORE_WEIGHTS.competition:g}\\n+ 비용 × {SCORE_WEIGHTS.cost:g}</div>
               <div class="stp-note">유동인구 많고 · 경쟁 적고 · 임대료 저렴할수록 ↑</div>
             </div>
             """, unsafe_allow_html=True)
@@ -695,11 +913,53 @@ elif selected_tab == "🏙️ 행정동 분석":
     else:
         st.info("👆 테이블에서 행을 클릭하면 상세 정보가 표시됩니다.")
 
+    # ── 매장 단위 경쟁 지표 ──
+    st.markdown("---")
+    st.markdown("#### ⚔️ 매장 단위 경쟁 지표")
+    comp_radii = tuple(sorted(st.multiselect(
+        "경쟁 반경 (m)", [100, 200, 300, 500, 1000, 2000], default=list(COMPETITION_RADII_M),
+        help="매장 좌표 기준 반경 안의 같은 브랜드 / 다른 브랜드 매장 수를 셉니다.",
+    ))) or COMPETITION_RADII_M
+    comp_brand = None if brand_filter == "전체" else brand_filter
+    st.caption(
+        ("행정동 안 매장들의 평균 좌표를 후보 위치로 보고, "
+         + (f"**{comp_brand}** 출점 시 같은 브랜드(자기 잠식)와 다른 브랜드(경쟁) 매장 수를 계산합니다."
+            if comp_brand else "반경 안의 전체 저가 브랜드 매장 수를 계산합니다 (브랜드 필터를 고르면 같은/다른 브랜드로 나눔)."))
+    )
+    dong_comp = get_dong_competition(data["source_hash"], comp_radii, comp_brand)
+    dong_comp = dong_comp[dong_comp["dong_name"].isin(df_view["dong_name"])]
+    comp_cols = {"dong_name": "행정동"}
+    for r in comp_radii:
+        if comp_brand:
+            comp_cols[f"same_{r}m"] = f"같은 브랜드 {r}m"
+        comp_cols[f"other_{r}m"] = f"{'경쟁' if comp_brand else '전체'} 매장 {r}m"
+    comp_cols["nearest_competitor_m"] = "최근접 경쟁(m)" if comp_brand else "최근접 매장(m)"
+    dong_comp_view = (dong_comp[list(comp_cols)].rename(columns=comp_cols)
+                      .sort_values(list(comp_cols.values())[-2], ascending=False))
+    st.dataframe(dong_comp_view.round({list(comp_cols.values())[-1]: 0}), hide_index=True,
+                 use_container_width=True, height=300)
+
+    if sel_idx:
+        store_comp = get_store_competition(data["source_hash"], comp_radii)
+        store_comp = store_comp[store_comp["dong_name"] == d["dong_name"]]
+        if store_comp.empty:
+            st.caption(f"{d['dong_name']}에는 매장 좌표가 없습니다.")
+        else:
+            st.markdown(f"**{d['dong_name']} 매장별 경쟁 현황** (자기 브랜드 기준)")
+            store_cols = {"brand": "브랜드", "name": "매장명"}
+            for r in comp_radii:
+                store_cols[f"same_{r}m"] = f"같은 브랜드 {r}m"
+                store_cols[f"other_{r}m"] = f"경쟁 매장 {r}m"
+            store_cols["nearest_competitor_m"] = "최근접 경쟁(m)"
+            st.dataframe(store_comp[list(store_cols)].rename(columns=store_cols).round({"최근접 경쟁(m)": 0}),
+                         hide_index=True, use_container_width=True)
+
 
 # ══════════════════════════════════════════════
 # 탭 3.5: 행정동분석_차트
 # ══════════════════════════════════════════════
-elif selected_tab == "📊 분석 시각화":
+@st.fragment
+def render_insight_charts():
     st.markdown("##### 📊 데이터 기반 심층 분석 시각화")
     st.caption("서울시 행정동별 핵심 지표를 6가지 관점에서 분석하며, 각 브랜드별 현황을 비교합니다.")
 
@@ -758,112 +1018,124 @@ elif selected_tab == "📊 분석 시각화":
     c1, c2 = st.columns(2)
     with c1:
         st.markdown("###### 1) Opportunity Score 및 지역별 브랜드 현황")
-        top_opp = df_dong.nlargest(10, 'opportunity_score')
-        
-        # 브랜드별 데이터로 변환 (Stacked Bar용)
-        # 상위 10개 지역에 존재하는 브랜드만 추출하여 레전드가 지저분해지는 것을 방지
-        relevant_brands = [b for b in BRANDS if top_opp[f'cnt_{b}'].sum() > 0]
-        brand_counts = []
-        for brand in relevant_brands:
-            brand_counts.append(go.Bar(
-                name=brand, 
-                x=top_opp['dong_name'], 
-                y=top_opp[f'cnt_{brand}'],
-                marker_color=ADJUSTED_BRAND_COLORS[brand]
+        def build_opportunity():
+            top_opp = df_dong.nlargest(10, 'opportunity_score')
+
+            # 브랜드별 데이터로 변환 (Stacked Bar용)
+            # 상위 10개 지역에 존재하는 브랜드만 추출하여 레전드가 지저분해지는 것을 방지
+            relevant_brands = [b for b in BRANDS if top_opp[f'cnt_{b}'].sum() > 0]
+            brand_counts = []
+            for brand in relevant_brands:
+                brand_counts.append(go.Bar(
+                    name=brand, 
+                    x=top_opp['dong_name'], 
+                    y=top_opp[f'cnt_{brand}'],
+                    marker_color=ADJUSTED_BRAND_COLORS[brand]
+                ))
+
+            # 기회 점수 라인 차트 (Secondary Y axis)
+            brand_counts.append(go.Scatter(
+                name="Opportunity Score",
+                x=top_opp['dong_name'],
+                y=top_opp['opportunity_score'],
+                yaxis="y2",
+                line=dict(color="#FF6B6B", width=3, dash='dot'),
+                mode="lines+markers+text",
+                text=top_opp['opportunity_score'].round(0),
+                textposition="top center"
             ))
-        
-        # 기회 점수 라인 차트 (Secondary Y axis)
-        brand_counts.append(go.Scatter(
-            name="Opportunity Score",
-            x=top_opp['dong_name'],
-            y=top_opp['opportunity_score'],
-            yaxis="y2",
-            line=dict(color="#FF6B6B", width=3, dash='dot'),
-            mode="lines+markers+text",
-            text=top_opp['opportunity_score'].round(0),
-            textposition="top center"
-        ))
 
-        fig = go.Figure(data=brand_counts)
-        fig.update_layout(
-            **PLOT_LAYOUT, 
-            height=350,
-            barmode='stack',
-            yaxis=dict(title="브랜드별 매장 수"),
-            yaxis2=dict(title="기회 점수", overlaying="y", side="right", showgrid=False),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            fig = go.Figure(data=brand_counts)
+            fig.update_layout(
+                **PLOT_LAYOUT, 
+                height=350,
+                barmode='stack',
+                yaxis=dict(title="브랜드별 매장 수"),
+                yaxis2=dict(title="기회 점수", overlaying="y", side="right", showgrid=False),
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+            )
+            return fig
+        figure_cache.plotly_chart("insight.opportunity", theme_mode, DATA_KEY, build_opportunity, use_container_width=True)
 
     with c2:
         st.markdown("###### 2) 저가카페 점유율 점수 분포 (U-Score)")
-        score_counts = df_dong['penetration_score'].value_counts().sort_index()
-        score_map = {1: "1점 (검증부족)", 4: "4점 (최적구간)", 2: "2점 (과밀경쟁)"}
-        score_df = pd.DataFrame({
-            '점수': [score_map.get(i, f"{i}점") for i in score_counts.index],
-            '동 개수': score_counts.values
-        })
-        fig = px.bar(score_df, x='점수', y='동 개수', color='점수',
-                     color_discrete_map={
-                         "1점 (검증부족)": "#FF6B6B", 
-                         "4점 (최적구간)": "#4ECDC4", 
-                         "2점 (과밀경쟁)": "#FFE66D"
-                     }, text_auto=True)
-        fig.update_layout(**PLOT_LAYOUT, height=350, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        def build_u_score():
+            score_counts = df_dong['penetration_score'].value_counts().sort_index()
+            score_map = {1: "1점 (검증부족)", 4: "4점 (최적구간)", 2: "2점 (과밀경쟁)"}
+            score_df = pd.DataFrame({
+                '점수': [score_map.get(i, f"{i}점") for i in score_counts.index],
+                '동 개수': score_counts.values
+            })
+            fig = px.bar(score_df, x='점수', y='동 개수', color='점수',
+                         color_discrete_map={
+                             "1점 (검증부족)": "#FF6B6B", 
+                             "4점 (최적구간)": "#4ECDC4", 
+                             "2점 (과밀경쟁)": "#FFE66D"
+                         }, text_auto=True)
+            fig.update_layout(**PLOT_LAYOUT, height=350, showlegend=False)
+            return fig
+        figure_cache.plotly_chart("insight.u_score", theme_mode, DATA_KEY, build_u_score, use_container_width=True)
 
     # 3. 피크 시간 & 4. 주중 매출 (브랜드 비교 요소 추가)
     c3, c4 = st.columns(2)
     with c3:
         st.markdown("###### 3) 오피스 상권 집중도 (피크 시간 매출)")
-        top_peak = df_dong.nlargest(10, 'peak_sales_ratio')
-        fig = px.bar(top_peak, x='dong_name', y='peak_sales_ratio',
-                     color='peak_sales_ratio', color_continuous_scale='Oranges',
-                     text_auto='.1f')
-        fig.update_layout(**PLOT_LAYOUT, height=300, showlegend=False, coloraxis_showscale=False)
-        st.plotly_chart(fig, use_container_width=True)
+        def build_peak():
+            top_peak = df_dong.nlargest(10, 'peak_sales_ratio')
+            fig = px.bar(top_peak, x='dong_name', y='peak_sales_ratio',
+                         color='peak_sales_ratio', color_continuous_scale='Oranges',
+                         text_auto='.1f')
+            fig.update_layout(**PLOT_LAYOUT, height=300, showlegend=False, coloraxis_showscale=False)
+            return fig
+        figure_cache.plotly_chart("insight.peak_sales", theme_mode, DATA_KEY, build_peak, use_container_width=True)
 
     with c4:
         st.markdown("###### 4) 평일 상권 집중도 (주중 매출 비중)")
-        top_weekday = df_dong.nlargest(10, 'weekday_sales_ratio')
-        fig = px.bar(top_weekday, x='dong_name', y='weekday_sales_ratio',
-                     color='weekday_sales_ratio', color_continuous_scale='Blues',
-                     text_auto='.1f')
-        fig.update_layout(**PLOT_LAYOUT, height=300, showlegend=False, coloraxis_showscale=False)
-        st.plotly_chart(fig, use_container_width=True)
+        def build_weekday():
+            top_weekday = df_dong.nlargest(10, 'weekday_sales_ratio')
+            fig = px.bar(top_weekday, x='dong_name', y='weekday_sales_ratio',
+                         color='weekday_sales_ratio', color_continuous_scale='Blues',
+                         text_auto='.1f')
+            fig.update_layout(**PLOT_LAYOUT, height=300, showlegend=False, coloraxis_showscale=False)
+            return fig
+        figure_cache.plotly_chart("insight.weekday_sales", theme_mode, DATA_KEY, build_weekday, use_container_width=True)
 
     # 5. 경쟁 강도 & 6. 상권변화 (브랜드 비교 파이 차트)
     c5, c6 = st.columns(2)
     with c5:
         st.markdown("###### 5) 브랜드별 지역 점유율 비교 (전체)")
-        total_counts = {b: df_dong[f"cnt_{b}"].sum() for b in BRANDS}
-        share_df = pd.DataFrame({
-            '브랜드': list(total_counts.keys()),
-            '매장수': list(total_counts.values())
-        })
-        fig = px.pie(share_df, values='매장수', names='브랜드', 
-                     color='브랜드', color_discrete_map=ADJUSTED_BRAND_COLORS,
-                     hole=0.4)
-        fig.update_layout(**PLOT_LAYOUT, height=350)
-        st.plotly_chart(fig, use_container_width=True)
+        def build_brand_share():
+            total_counts = {b: df_dong[f"cnt_{b}"].sum() for b in BRANDS}
+            share_df = pd.DataFrame({
+                '브랜드': list(total_counts.keys()),
+                '매장수': list(total_counts.values())
+            })
+            fig = px.pie(share_df, values='매장수', names='브랜드', 
+                         color='브랜드', color_discrete_map=ADJUSTED_BRAND_COLORS,
+                         hole=0.4)
+            fig.update_layout(**PLOT_LAYOUT, height=350)
+            return fig
+        figure_cache.plotly_chart("insight.brand_share", theme_mode, DATA_KEY, build_brand_share, use_container_width=True)
 
     with c6:
         st.markdown("###### 6) 상권변화 및 활력도 분포")
-        change_map = {4: "다이나믹(4)", 3: "상권확장(3)", 2: "정체(2)", 1: "상권축소(1)"}
-        change_counts = df_dong['commercial_index'].value_counts().sort_index(ascending=False)
-        change_df = pd.DataFrame({
-            '지표': [change_map.get(i, f"{i}") for i in change_counts.index],
-            '동 개수': change_counts.values
-        })
-        fig = px.pie(change_df, values='동 개수', names='지표', hole=0.4,
-                     color='지표', color_discrete_map={
-                         "다이나믹(4)": "#4ECDC4", 
-                         "상권확장(3)": "#58a6ff", 
-                         "정체(2)": "#FFE66D", 
-                         "상권축소(1)": "#FF6B6B"
-                     })
-        fig.update_layout(**PLOT_LAYOUT, height=350)
-        st.plotly_chart(fig, use_container_width=True)
+        def build_commercial_change():
+            change_map = {4: "다이나믹(4)", 3: "상권확장(3)", 2: "정체(2)", 1: "상권축소(1)"}
+            change_counts = df_dong['commercial_index'].value_counts().sort_index(ascending=False)
+            change_df = pd.DataFrame({
+                '지표': [change_map.get(i, f"{i}") for i in change_counts.index],
+                '동 개수': change_counts.values
+            })
+            fig = px.pie(change_df, values='동 개수', names='지표', hole=0.4,
+                         color='지표', color_discrete_map={
+                             "다이나믹(4)": "#4ECDC4", 
+                             "상권확장(3)": "#58a6ff", 
+                             "정체(2)": "#FFE66D", 
+                             "상권축소(1)": "#FF6B6B"
+                         })
+            fig.update_layout(**PLOT_LAYOUT, height=350)
+            return fig
+        figure_cache.plotly_chart("insight.commercial_change", theme_mode, DATA_KEY, build_commercial_change, use_container_width=True)
 
     # ──────────────────────────────────────────────
     # 📊 심층 통계 분석 (기존 차트 보강)
@@ -874,49 +1146,73 @@ elif selected_tab == "📊 분석 시각화":
     c7, c8 = st.columns(2)
     with c7:
         st.markdown("###### 주요 지표 분포 (Box Plot)")
-        box_df = df_dong.copy()
-        box_df['월 매출(억)'] = box_df['monthly_sales'] / 1e8
-        melt_df = box_df.melt(value_vars=['attractiveness_score', 'opportunity_score', '월 매출(억)'], 
-                              var_name='지표', value_name='값')
-        fig = px.box(melt_df, x='지표', y='값', color='지표', points="all")
-        fig.update_layout(**PLOT_LAYOUT, height=380, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        def build_box():
+            box_df = df_dong.copy()
+            box_df['월 매출(억)'] = box_df['monthly_sales'] / 1e8
+            melt_df = box_df.melt(value_vars=['attractiveness_score', 'opportunity_score', '월 매출(억)'], 
+                                  var_name='지표', value_name='값')
+            fig = px.box(melt_df, x='지표', y='값', color='지표', points="all")
+            fig.update_layout(**PLOT_LAYOUT, height=380, showlegend=False)
+            return fig
+        figure_cache.plotly_chart("insight.box", theme_mode, SCORE_KEY, build_box, use_container_width=True)
 
     with c8:
         st.markdown("###### 종사자-매출 밀도 Heatmap")
-        dens_df = df_dong.copy()
-        dens_df['sales_cr'] = dens_df['monthly_sales'] / 1e8
-        fig = px.density_heatmap(dens_df, x='total_workers', y='sales_cr', 
-                                 nbinsx=30, nbinsy=30, color_continuous_scale='Viridis',
-                                 labels={'total_workers': '총 종사자 수', 'sales_cr': '월 매출(억)'},
-                                 text_auto=True)
-        fig.update_layout(**PLOT_LAYOUT, height=380, coloraxis_showscale=True)
-        st.plotly_chart(fig, use_container_width=True)
+        def build_density():
+            dens_df = df_dong.copy()
+            dens_df['sales_cr'] = dens_df['monthly_sales'] / 1e8
+            fig = px.density_heatmap(dens_df, x='total_workers', y='sales_cr', 
+                                     nbinsx=30, nbinsy=30, color_continuous_scale='Viridis',
+                                     labels={'total_workers': '총 종사자 수', 'sales_cr': '월 매출(억)'},
+                                     text_auto=True)
+            fig.update_layout(**PLOT_LAYOUT, height=380, coloraxis_showscale=True)
+            return fig
+        figure_cache.plotly_chart("insight.density", theme_mode, DATA_KEY, build_density, use_container_width=True)
 
     st.markdown("###### 카페 수와 매출의 상관관계 (Marginal Scatter)")
-    scat_df = df_dong.copy()
-    scat_df['sales_cr'] = scat_df['monthly_sales'] / 1e8
-    fig = px.scatter(scat_df, x='cafe_count', y='sales_cr', 
-                     marginal_x="box", marginal_y="violin",
-                     hover_name='dong_name', color='attractiveness_score',
-                     labels={'cafe_count': '행정동별 전체 카페 수', 'sales_cr': '월 매출(억)'},
-                     opacity=0.7)
-    fig.update_layout(**PLOT_LAYOUT, height=450)
-    st.plotly_chart(fig, use_container_width=True)
+    def build_scatter():
+        scat_df = df_dong.copy()
+        scat_df['sales_cr'] = scat_df['monthly_sales'] / 1e8
+        fig = px.scatter(scat_df, x='cafe_count', y='sales_cr', 
+                         marginal_x="box", marginal_y="violin",
+                         hover_name='dong_name', color='attractiveness_score',
+                         labels={'cafe_count': '행정동별 전체 카페 수', 'sales_cr': '월 매출(억)'},
+                         opacity=0.7)
+        fig.update_layout(**PLOT_LAYOUT, height=450)
+        return fig
+    figure_cache.plotly_chart("insight.scatter", theme_mode, SCORE_KEY, build_scatter, use_container_width=True)
 
 
 # ══════════════════════════════════════════════
 # 탭 4: 입지 추천
 # ══════════════════════════════════════════════
-elif selected_tab == "⭐ 입지 추천":
+@st.fragment
+def render_recommendation():
 
-    # 필터
-    df_r = df_rec.copy()
-    if rec_brand != "전체":
-        df_r = df_r[df_r["brand"] == rec_brand]
-    if rec_search != "전체":
-        df_r = df_r[df_r["dong_name"].str.contains(rec_search)]
-    df_r = df_r.sort_values(rec_sort, ascending=False).head(60)
+    # 필터 (바꾸면 입지 추천 탭만 다시 실행)
+    f1, f2, f3 = st.columns(3)
+    with f1:
+        rec_brand = st.selectbox("브랜드 선택", ["전체"] + BRANDS)
+    with f2:
+        rec_sort = st.selectbox(
+            "정렬 기준",
+            ["attractiveness_score", "demand_score", "cost_score"],
+            format_func=lambda x: {
+                "attractiveness_score": "매력도 점수",
+                "demand_score": "수요 점수",
+                "cost_score": "비용 점수",
+            }[x],
+        )
+    with f3:
+        rec_search = st.selectbox("🏙️ 행정동 선택", ["전체"] + ALL_DONGS)
+
+    # 전체 행정동 × 브랜드 조합에서 상위 REC_MAX_RESULTS개 (가중치·브랜드·행정동·정렬 기준별 캐시)
+    df_r = get_recommender(data["source_hash"]).top(
+        SCORE_WEIGHTS, rec_sort,
+        None if rec_brand == "전체" else rec_brand,
+        None if rec_search == "전체" else rec_search,
+        REC_MAX_RESULTS,
+    )
 
     st.markdown(f"##### ⭐ 입지 추천 — {len(df_r)}개 결과")
     st.caption("매력도 점수 기준 해당 브랜드가 **아직 진출하지 않은** 행정동을 추천합니다.")
@@ -924,54 +1220,48 @@ elif selected_tab == "⭐ 입지 추천":
     if df_r.empty:
         st.warning("조건에 맞는 추천 결과가 없습니다.")
     else:
-        # 3열 카드 그리드
-        for row_start in range(0, len(df_r), 3):
-            cols = st.columns(3)
-            for ci, idx in enumerate(range(row_start, min(row_start + 3, len(df_r)))):
-                r = df_r.iloc[idx]
-                color = BRAND_COLORS.get(r["brand"], "#888")
-                score = r.get("attractiveness_score")
-                score_color = "#4ECDC4" if score and score > 60 else "#FFE66D" if score and score > 40 else "#FF6B6B"
-
-                with cols[ci]:
-                    st.markdown(f"""
-                    <div style="background:{THEME['surface']};border:1px solid {THEME['border']};border-radius:12px;
-                         padding:18px;border-top:4px solid {color};margin-bottom:14px;box-shadow: 0 4px 10px {THEME['shadow']}">
-                      <div style="font-size:.75rem;color:{THEME['text_sub']};font-weight:700">#{row_start+ci+1} 추천</div>
-                      <div style="font-size:1.1rem;font-weight:800;margin:6px 0;color:{THEME['text']}">{r['dong_name']}</div>
-                      <span style="background:{color}15;color:{ADJUSTED_BRAND_COLORS.get(r['brand'], color)};padding:3px 10px;
-                            border-radius:12px;font-size:.78rem;font-weight:800;border:1px solid {color}30">{r['brand']}</span>
-                      <span style="font-size:.75rem;color:{THEME['text_sub']};margin-left:8px;font-weight:600">미진출 지역</span>
-                      <div style="display:grid;grid-template-columns:1fr 1fr;gap:8px;margin-top:16px">
-                        <div style="background:{THEME['surface2']};border-radius:8px;padding:10px;border:1px solid {THEME['border']}">
-                          <div style="font-size:.68rem;color:{THEME['text_sub']};font-weight:700">매력도</div>
-                          <div style="font-size:1.2rem;font-weight:900;color:{score_color}">
-                            {f"{score:.1f}" if score else "-"}
-                          </div>
-                        </div>
-                        <div style="background:{THEME['surface2']};border-radius:8px;padding:10px;border:1px solid {THEME['border']}">
-                          <div style="font-size:.68rem;color:{THEME['text_sub']};font-weight:700">수요</div>
-                          <div style="font-size:1.2rem;font-weight:900;color:#00897b">
-                            {f"{r['demand_score']:.1f}" if r.get('demand_score') else "-"}
-                          </div>
-                        </div>
-                        <div style="background:{THEME['surface2']};border-radius:8px;padding:10px;border:1px solid {THEME['border']}">
-                          <div style="font-size:.68rem;color:{THEME['text_sub']};font-weight:700">경쟁</div>
-                          <div style="font-size:1.2rem;font-weight:900;color:#f57f17">
-                            {f"{r['competition_score']:.1f}" if r.get('competition_score') else "-"}
-                          </div>
-                        </div>
-                        <div style="background:{THEME['surface2']};border-radius:8px;padding:10px;border:1px solid {THEME['border']}">
-                          <div style="font-size:.68rem;color:{THEME['text_sub']};font-weight:700">비용</div>
-                          <div style="font-size:1.2rem;font-weight:900;color:#2e7d32">
-                            {f"{r['cost_score']:.1f}" if r.get('cost_score') else "-"}
-                          </div>
-                        </div>
-                      </div>
-                      <div style="font-size:.8rem;color:{THEME['text']};margin-top:12px;font-weight:700;border-top:1px solid {THEME['border']};padding-top:8px">
-                        근로자 {int(r.get('total_workers',0)):,}명 · 
-                        카페 {int(r.get('cafe_count',0))}개 <br>
-                        월평균 매출 <span style="color:#005cc5">{r.get('monthly_sales',0)/1e8:.1f}억 원</span>
-                      </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+        # 페이지 단위로 카드 그리드를 한 번에 렌더링 (카드 HTML은 행별 캐시)
+        pg_col1, pg_col2, pg_col3 = st.columns([1, 1, 2])
+        with pg_col1:
+            page_size = st.selectbox("페이지당 카드 수", [12, 24, 48, 96], index=1)
+        n_pages = (len(df_r) - 1) // page_size + 1
+        with pg_col2:
+            # 조건이 바뀌면 key 가 달라져 1페이지로 돌아감
+            page = st.number_input(f"페이지 (총 {n_pages})", min_value=1, max_value=n_pages, value=1, step=1,
+                                   key=f"rec_page_{rec_brand}_{rec_sort}_{rec_search}_{page_size}")
+        first = (page - 1) * page_size
+        page_rows = df_r.iloc[first:first + page_size]
+        with pg_col3:
+            st.caption(f"{first + 1}–{first + len(page_rows)}위 표시 중")
+
+        theme_items = tuple(THEME.items())
+        cards = [
+            render_rec_card(
+                first + i + 1, tuple(r.items()), theme_items,
+                BRAND_COLORS.get(r["brand"], "#888"), ADJUSTED_BRAND_COLORS.get(r["brand"], BRAND_COLORS.get(r["brand"], "#888")),
+            )
+            for i, r in enumerate(page_rows.to_dict(orient="records"))
+        ]
+        st.markdown(
+            f'<div style="display:grid;grid-template-columns:repeat(3,minmax(0,1fr));gap:0 14px">{"".join(cards)}</div>',
+            unsafe_allow_html=True,
+        )
+
+
+# ══════════════════════════════════════════════
+# 선택한 탭 실행
+# ══════════════════════════════════════════════
+TAB_RENDERERS = {
+    "📊 브랜드 개요": render_brand_overview,
+    "🗺️ 지도": render_map,
+    "🏙️ 행정동 분석": render_dong_analysis,
+    "📊 분석 시각화": render_insight_charts,
+    "⭐ 입지 추천": render_recommendation,
+}
+TAB_RENDERERS[selected_tab]()
+
+# 차트 캐시 상태 (탭을 그린 뒤라 이번 실행까지 반영, 프래그먼트만 다시 실행될 때는 갱신 안 됨)
+chart_stats = figure_cache.FIGURE_CACHE.stats()
+with st.sidebar:
+    st.caption(f"차트 캐시 {chart_stats['size']}개 · {chart_stats['nbytes'] / 2 ** 20:.2f} MB "
+               f"(적중 {chart_stats['hits']} / 미적중 {chart_stats['misses']} · 제거 {chart_stats['evictions']})")
@@ -0,0 +1,593 @@
+"""
+국토교통부 상업업무용 부동산 실거래가 API 클라이언트
+Streamlit 의존성 없이 수집 로직만 담당 (대시보드 / 배치 수집 공용)
+"""
+
+import math
+import os
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+MOLIT_API_URL = os.getenv("MOLIT_API_URL", "http://apis.data.go.kr/1613000/RTMSDataSvcNrgTrade/getRTMSDataSvcNrgTrade")
+
+# 동시 요청 수 및 서비스 키당 초당 요청 한도 (환경 변수로 조정 가능)
+MAX_WORKERS = int(os.getenv("MOLIT_MAX_WORKERS", "8"))
+RATE_LIMIT_PER_SEC = float(os.getenv("MOLIT_RATE_LIMIT", "10"))
+# 한 계약년월이 여러 페이지일 때 나머지 페이지를 동시에 받는 스레드 수
+PAGE_WORKERS = int(os.getenv("MOLIT_PAGE_WORKERS", "4"))
+
+NUM_OF_ROWS = 1000
+
+# 연결/응답 타임아웃(초)과 일시 장애 재시도 (지터가 들어간 지수 백오프)
+CONNECT_TIMEOUT = float(os.getenv("MOLIT_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("MOLIT_READ_TIMEOUT", "30"))
+MAX_RETRIES = int(os.getenv("MOLIT_MAX_RETRIES", "3"))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# 연속 실패가 이 횟수에 이르면 회로를 열고 BREAKER_RESET초 동안 요청 없이 즉시 실패
+BREAKER_THRESHOLD = int(os.getenv("MOLIT_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.getenv("MOLIT_BREAKER_RESET", "30"))
+
+NORMAL_RESULT_MSGS = ('NORMAL SERVICE.', 'OK')
+
+# 서울 주요 자치구 법정동 코드
+SEOUL_SIGUNGU_CODES = {
+    '종로구': '11110', '중구': '11140', '용산구': '11170', '성동구': '11200',
+    '광진구': '11215', '동대문구': '11230', '중랑구': '11260', '성북구': '11290',
+    '강북구': '11305', '도봉구': '11320', '노원구': '11350', '은평구': '11380',
+    '서대문구': '11410', '마포구': '11440', '양천구': '11470', '강서구': '11500',
+    '구로구': '11530', '금천구': '11545', '영등포구': '11560', '동작구': '11590',
+    '관악구': '11620', '서초구': '11650', '강남구': '11680', '송파구': '11710',
+    '강동구': '11740'
+}
+
+
+class MolitAPIError(Exception):
+    """API가 정상 결과가 아닌 응답을 돌려준 경우"""
+
+
+class CircuitOpenError(Exception):
+    """엔드포인트 장애로 회로가 열려 있어 요청을 보내지 않은 경우 (__cause__ 는 회로를 연 마지막 오류)"""
+
+
+# ──────────────────────────────────────────────
+# 요청 속도 제한 (서비스 키 단위 토큰 버킷)
+# ──────────────────────────────────────────────
+class RateLimiter:
+    """초당 rate_per_sec 건으로 호출을 제한하는 스레드 안전 토큰 버킷"""
+
+    def __init__(self, rate_per_sec, burst=None):
+        self.rate = float(rate_per_sec)
+        self.capacity = float(burst if burst is not None else max(1.0, rate_per_sec))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(service_key, rate_per_sec=RATE_LIMIT_PER_SEC):
+    """서비스 키별로 하나의 RateLimiter를 공유 (동일 키의 모든 스레드가 한도를 나눠 씀)"""
+    with _limiters_lock:
+        limiter = _limiters.get(service_key)
+        if limiter is None or limiter.rate != float(rate_per_sec):
+            limiter = RateLimiter(rate_per_sec)
+            _limiters[service_key] = limiter
+        return limiter
+
+
+# ──────────────────────────────────────────────
+# 회로 차단기 (엔드포인트 단위)
+# ──────────────────────────────────────────────
+class CircuitBreaker:
+    """연속 실패가 failure_threshold회에 이르면 열림 → reset_timeout초 뒤 시험 요청 1건만 보냄
+
+    시험 요청이 진행 중인 동안 다른 요청은 결과를 기다렸다가, 성공하면 그대로 진행하고
+    실패하면 다시 reset_timeout초 동안 즉시 실패(CircuitOpenError)한다.
+    마지막 실패 원인은 last_error에 남겨 CircuitOpenError의 __cause__ 로 연결한다.
+    시험 요청이 성공 / 실패를 기록하지 못하고 끝나면 release_probe로 다시 열어 기다리던 요청을 깨운다.
+    """
+
+    def __init__(self, failure_threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.last_error = None
+        self._opened_at = 0.0
+        self._probe = 0
+        self._cond = threading.Condition()
+
+    def before_request(self):
+        """요청 직전 호출 → 이 요청이 시험 요청이면 그 번호, 아니면 None"""
+        with self._cond:
+            while True:
+                if self.state == "closed":
+                    return None
+                if self.state == "open":
+                    if time.monotonic() - self._opened_at < self.reset_timeout:
+                        raise CircuitOpenError("API 서버 장애로 요청을 잠시 중단했습니다. 잠시 후 다시 시도해주세요.") \
+                            from self.last_error
+                    self.state = "half_open"   # 이 요청이 시험 요청
+                    self._probe += 1
+                    return self._probe
+                self._cond.wait(timeout=self.reset_timeout)
+
+    def release_probe(self, probe):
+        """시험 요청이 끝날 때 항상 호출 — 결과를 기록하지 못했으면(예외 등) 다시 열림으로"""
+        if probe is None:
+            return
+        with self._cond:
+            if self.state == "half_open" and self._probe == probe:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._cond.notify_all()
+
+    def record_success(self):
+        with self._cond:
+            self.state = "closed"
+            self.failures = 0
+            self.last_error = None
+            self._cond.notify_all()
+
+    def record_failure(self, error=None):
+        with self._cond:
+            self.failures += 1
+            self.last_error = error
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+            self._cond.notify_all()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(url):
+    """엔드포인트 URL별로 하나의 CircuitBreaker를 공유"""
+    with _breakers_lock:
+        if url not in _breakers:
+            _breakers[url] = CircuitBreaker()
+        return _breakers[url]
+
+
+# ──────────────────────────────────────────────
+# 커넥션 풀 세션
+# ──────────────────────────────────────────────
+_session = None
+_session_lock = threading.Lock()
+
+
+def make_session(pool_size=MAX_WORKERS * PAGE_WORKERS):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """프로세스 전역에서 재사용하는 커넥션 풀 세션"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+        return _session
+
+
+# ──────────────────────────────────────────────
+# 스트리밍 XML 디코더 (파싱 시점에 컬럼 타입 확정)
+# ──────────────────────────────────────────────
+FLOAT_COLS = ('dealAmount', 'buildingAr')
+INT16_COLS = ('floor', 'buildYear', 'dealYear', 'dealMonth', 'dealDay')
+CATEGORY_COLS = ('sggNm', 'umdNm', 'buildingUse')
+
+# 한 번에 C 파서로 트리를 만드는 item 수 — 메모리에는 이만큼의 item 트리만 올라감
+PARSE_BATCH_ITEMS = 200
+
+_INT16_MIN, _INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+
+
+def _float_column(texts):
+    """문자열 → float64 (쉼표 제거, 결측 · 변환 불가는 NaN)"""
+    try:
+        return np.array([t.replace(',', '') for t in texts], dtype=np.float64)
+    except (AttributeError, ValueError):
+        cleaned = [t.replace(',', '') if t is not None else None for t in texts]
+        return pd.to_numeric(pd.Series(cleaned, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _int16_column(texts):
+    """문자열 → Int16 (결측 · 정수가 아닌 값 · 범위 밖은 NA)"""
+    try:
+        values = np.array(texts, dtype=np.int64)
+        mask = (values < _INT16_MIN) | (values > _INT16_MAX)
+    except (TypeError, ValueError, OverflowError):
+        numbers = pd.to_numeric(pd.Series(texts, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+        mask = ~np.isfinite(numbers) | (numbers != np.round(numbers)) | (numbers < _INT16_MIN) | (numbers > _INT16_MAX)
+        values = np.where(mask, 0, numbers)
+    return pd.arrays.IntegerArray(np.where(mask, 0, values).astype(np.int16), mask)
+
+
+def _category_column(texts):
+    """문자열 → 범주형 (앞뒤 공백 제거, 빈 값은 결측, 범주는 등장 순서)"""
+    codes, categories = pd.factorize(np.array([(t.strip() or None) if t else None for t in texts], dtype=object))
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _typed_column(tag, texts):
+    if tag in FLOAT_COLS:
+        return _float_column(texts)
+    if tag in INT16_COLS:
+        return _int16_column(texts)
+    if tag in CATEGORY_COLS:
+        return _category_column(texts)
+    return np.array(texts, dtype=object)
+
+
+def _items_frame(layouts):
+    """태그 구성별로 모은 item 값 → 타입이 확정된 DataFrame (원래 item 순서)"""
+    frames = [
+        pd.DataFrame({tag: _typed_column(tag, texts) for tag, texts in zip(tags, zip(*rows))}, index=positions)
+        for tags, (positions, rows) in layouts.items()
+    ]
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    # item 마다 태그 구성이 다른 드문 응답: 합친 뒤 원래 순서로
+    return concat_molit_frames([f.reset_index() for f in frames]).sort_values('index').drop(columns='index').reset_index(drop=True)
+
+
+def parse_molit_xml(content, batch_items=PARSE_BATCH_ITEMS):
+    """MOLIT XML 응답 → (타입이 확정된 DataFrame 또는 None, totalCount)
+
+    <items> 구간을 </item> 경계에서 batch_items 개씩 잘라 C 파서(ET.fromstring)로 만들고,
+    item 마다 자식 값 목록만 모아 두었다가 컬럼별로 한 번에 변환한다 (요소마다 파이썬 이벤트 처리 없음).
+    """
+    start = content.find(b'<items>')
+    end = content.rfind(b'</items>')
+    layouts = {}   # 자식 태그 구성 → (item 순번 목록, 값 목록들)
+    n_items = 0
+    if 0 <= start < end:
+        # 인코딩 선언을 조각마다 붙여 원본과 같은 인코딩으로 해석
+        declaration = content[:content.find(b'?>') + 2] if content.startswith(b'<?xml') else b''
+        pos = start + len(b'<items>')
+        while True:
+            cut = pos
+            for _ in range(batch_items):
+                found = content.find(b'</item>', cut, end)
+                if found < 0:
+                    break
+                cut = found + len(b'</item>')
+            if cut == pos:
+                break
+            for item in ET.fromstring(declaration + b'<items>' + content[pos:cut] + b'</items>'):
+                children = list(item)
+                key = tuple([child.tag for child in children])
+                group = layouts.get(key)
+                if group is None:
+                    group = layouts[key] = ([], [])
+                group[0].append(n_items)
+                group[1].append([child.text for child in children])
+                n_items += 1
+            pos = cut
+        content = content[:start] + content[end + len(b'</items>'):]
+    # items 를 뺀 나머지 (header / totalCount) — 잘린 응답이면 여기서 ParseError
+    root = ET.fromstring(content)
+    result_msg = root.findtext('.//resultMsg') or root.findtext('.//returnAuthMsg')
+    total_count = root.findtext('.//totalCount')
+
+    if result_msg not in NORMAL_RESULT_MSGS:
+        raise MolitAPIError(f"API 호출 결과: {result_msg}")
+    df = _items_frame(layouts) if n_items else None
+    return df, (int(total_count) if total_count is not None else n_items)
+
+
+# ──────────────────────────────────────────────
+# 단건 조회 및 전처리
+# ──────────────────────────────────────────────
+def _backoff(attempt):
+    """full jitter 지수 백오프 대기 시간(초)"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+class RequestCounter:
+    """실제로 보낸 HTTP 요청 수 (재시도 · 페이지 요청 포함, 스레드 안전)"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self):
+        with self._lock:
+            self.count += 1
+
+
+def _request_page(session, url, params, page_no, limiter, breaker, max_retries=MAX_RETRIES, counter=None):
+    """단일 페이지 요청 → (DataFrame 또는 None, totalCount)
+
+    연결 오류 · 타임아웃 · 5xx/429 · 잘린 응답은 지수 백오프로 재시도하고 회로 차단기에 실패로 기록한다.
+    4xx와 API 오류 코드는 서버가 응답한 것이므로 재시도하지 않는다.
+    counter(RequestCounter)가 주어지면 session.get 호출마다 1씩 센다.
+    """
+    for attempt in range(max_retries + 1):
+        probe = breaker.before_request()
+        try:
+            limiter.acquire()
+            if counter is not None:
+                counter.add()
+            try:
+                response = session.get(url, params={**params, 'pageNo': page_no},
+                                       timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+                response.raise_for_status()
+                result = parse_molit_xml(response.content)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                    requests.HTTPError, ET.ParseError) as e:
+                if isinstance(e, requests.HTTPError) and e.response.status_code not in RETRY_STATUS:
+                    breaker.record_success()
+                    raise
+                breaker.record_failure(e)
+                if attempt == max_retries:
+                    raise
+                time.sleep(_backoff(attempt))
+            except MolitAPIError:
+                breaker.record_success()
+                raise
+            except Exception as e:
+                breaker.record_failure(e)
+                raise
+            else:
+                breaker.record_success()
+                return result
+        finally:
+            # 시험 요청이 KeyboardInterrupt 등으로 끝나도 반열림에 멈춰 다른 요청이 계속 기다리지 않도록
+            breaker.release_probe(probe)
+
+
+def fetch_molit_data(lawd_cd, deal_ymd, session=None, service_key=None, url=MOLIT_API_URL,
+                     rate_per_sec=RATE_LIMIT_PER_SEC, page_workers=PAGE_WORKERS, counter=None):
+    """국토교통부 실거래가 API 연동 함수 (지역코드 1개 × 계약년월 1개)
+
+    첫 페이지의 totalCount로 전체 페이지 수를 구하고 나머지 페이지는 동시에 받는다.
+    결과가 없으면 None, API 오류 응답이면 MolitAPIError를 발생시킨다.
+    counter(RequestCounter)에는 실제로 보낸 요청 수가 더해진다.
+    """
+    service_key = service_key or os.getenv("MOLIT_API_KEY")
+    if not service_key:
+        raise MolitAPIError(".env 파일에 MOLIT_API_KEY가 설정되어 있지 않습니다.")
+
+    params = {
+        'serviceKey': service_key,
+        'LAWD_CD': lawd_cd,
+        'DEAL_YMD': deal_ymd,
+        'numOfRows': NUM_OF_ROWS,
+    }
+    session = session or get_session()
+    limiter = get_rate_limiter(service_key, rate_per_sec)
+    breaker = get_circuit_breaker(url)
+
+    first_page, total_count = _request_page(session, url, params, 1, limiter, breaker, counter=counter)
+    pages = [first_page]
+    n_pages = math.ceil(total_count / NUM_OF_ROWS)
+    if n_pages > 1:
+        with ThreadPoolExecutor(max_workers=max(1, min(page_workers, n_pages - 1))) as pool:
+            pages += pool.map(lambda p: _request_page(session, url, params, p, limiter, breaker, counter=counter)[0],
+                              range(2, n_pages + 1))
+
+    pages = [page for page in pages if page is not None]
+    if not pages:
+        return None
+    df = pages[0] if len(pages) == 1 else concat_molit_frames(pages)
+    # 페이지 사이에 신규 신고가 끼어들면 경계 행이 다음 페이지에 한 번 더 실린다
+    if len(df) > total_count:
+        df = df.drop_duplicates(ignore_index=True)
+    return df
+
+
+def preprocess_molit_frame(df):
+    """거래금액 / 면적 / 층 등 컬럼 타입을 스트리밍 디코더와 같은 스키마로 맞춤 (이미 맞으면 그대로)"""
+    for col in FLOAT_COLS:
+        if col in df.columns and not pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col].astype(str).str.replace(',', ''), errors='coerce')
+    for col in INT16_COLS:
+        if col in df.columns and df[col].dtype != 'Int16':
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int16')
+    for col in CATEGORY_COLS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def concat_molit_frames(frames):
+    """카테고리 구성이 서로 다른 조각을 합쳐도 스키마(범주형 등)가 유지되도록 결합"""
+    return preprocess_molit_frame(pd.concat(frames, ignore_index=True))
+
+
+# ──────────────────────────────────────────────
+# 자치구 × 계약년월 동시 수집 엔진
+# ──────────────────────────────────────────────
+@dataclass
+class FetchFailure:
+    """수집에 실패한 (자치구, 계약년월) — task로 그대로 재시도할 수 있다"""
+    gu_name: str
+    lawd_cd: str
+    deal_ymd: str
+    error: Exception
+
+    @property
+    def task(self):
+        return (self.gu_name, self.lawd_cd, self.deal_ymd)
+
+    @property
+    def kind(self):
+        if isinstance(self.error, MolitAPIError):
+            return "api"
+        if isinstance(self.error, CircuitOpenError):
+            return "circuit_open"
+        if isinstance(self.error, requests.Timeout):
+            return "timeout"
+        if isinstance(self.error, requests.RequestException):
+            return "network"
+        return "other"
+
+    @property
+    def cause(self):
+        """실제 원인 예외 — 회로 차단으로 건너뛴 경우 회로를 연 마지막 오류 (없으면 None)"""
+        if isinstance(self.error, CircuitOpenError):
+            return self.error.__cause__
+        return self.error
+
+
+@dataclass
+class FetchResult:
+    frame: object = None          # 결합된 DataFrame (수집 결과가 없으면 None)
+    failures: list = field(default_factory=list)  # FetchFailure 목록 (작업 순서)
+    requests: int = 0             # 실제로 보낸 HTTP 요청 수 (페이지 · 재시도 포함)
+    cache_hits: int = 0           # 로컬 저장소에서 읽은 (자치구, 계약년월) 수
+    elapsed: float = 0.0
+    partitions: list = field(default_factory=list)  # 수집에 성공한 (지역코드, 계약년월)
+    rows: int = 0                 # 수집된 거래 행 수
+
+
+def _fetch_partition(gu_code, ymd, store, session, service_key, url, rate_per_sec, keep_frames=True, counter=None):
+    """저장소 우선 조회 → 미적중 시 API 조회 후 저장. (DataFrame 또는 None, 적중 여부)
+
+    keep_frames=False면 저장소에 유효한 파티션은 읽지도 않는다 (배치 적재용).
+    """
+    if store is not None:
+        if not keep_frames and store.is_fresh(gu_code, ymd):
+            return None, True
+        hit, df = store.get(gu_code, ymd)
+        if hit:
+            return (preprocess_molit_frame(df) if df is not None else None), True
+    df = fetch_molit_data(gu_code, ymd, session, service_key, url, rate_per_sec, counter=counter)
+    if store is not None:
+        store.put(gu_code, ymd, df)
+    return df, False
+
+
+def fetch_molit_tasks(tasks, max_workers=MAX_WORKERS, rate_per_sec=RATE_LIMIT_PER_SEC,
+                      on_progress=None, session=None, service_key=None, url=MOLIT_API_URL, store=None,
+                      keep_frames=True):
+    """(자치구명, 지역코드, 계약년월) 작업 목록을 스레드 풀로 동시에 수집
+
+    store(MolitStore)가 주어지면 유효한 파티션은 API 대신 로컬에서 읽는다.
+    keep_frames=False면 결과를 저장소에만 쓰고 frame은 None으로 돌려준다 (메모리 절약).
+    on_progress(done, total, gu_name, deal_ymd)는 호출한 스레드에서 실행되므로
+    Streamlit 요소(st.progress 등)를 그대로 갱신해도 된다.
+    결과 DataFrame의 행 순서는 작업 목록 순서와 동일하다.
+    """
+    session = session or get_session()
+    results = [None] * len(tasks)
+    succeeded = [False] * len(tasks)
+    failures = []
+    counter = RequestCounter()
+    cache_hits = 0
+    rows = 0
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {
+            pool.submit(_fetch_partition, gu_code, ymd, store, session, service_key, url, rate_per_sec,
+                        keep_frames, counter): i
+            for i, (_, gu_code, ymd) in enumerate(tasks)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            gu_name, _, ymd = tasks[i]
+            try:
+                df, hit = future.result()
+                cache_hits += hit
+                succeeded[i] = True
+                if df is not None:
+                    rows += len(df)
+                    if keep_frames:
+                        results[i] = df
+            except Exception as e:
+                failures.append((i, FetchFailure(gu_name, tasks[i][1], ymd, e)))
+            if on_progress:
+                on_progress(done, len(tasks), gu_name, ymd)
+
+    frames = [r for r in results if r is not None]
+    return FetchResult(
+        frame=concat_molit_frames(frames) if frames else None,
+        failures=[failure for _, failure in sorted(failures, key=lambda f: f[0])],
+        requests=counter.count,
+        cache_hits=cache_hits,
+        elapsed=time.perf_counter() - started,
+        partitions=[(gu_code, ymd) for ok, (_, gu_code, ymd) in zip(succeeded, tasks) if ok],
+        rows=rows,
+    )
+
+
+def fetch_molit_bulk(targets, deal_ymd_list, **kwargs):
+    """{자치구명: 지역코드} × 계약년월 목록 전체 수집 (자치구 → 계약년월 순)"""
+    tasks = [(gu_name, gu_code, ymd) for gu_name, gu_code in targets.items() for ymd in deal_ymd_list]
+    return fetch_molit_tasks(tasks, **kwargs)
+
+
+def retry_failures(failures, **kwargs):
+    """이전 수집의 FetchFailure 목록만 다시 수집"""
+    return fetch_molit_tasks([failure.task for failure in failures], **kwargs)
+
+
+# ──────────────────────────────────────────────
+# 증분 동기화 (신규 / 미확정 월만 수집)
+# ──────────────────────────────────────────────
+def partition_keys(df):
+    """행마다 (지역코드 + 계약년월) 파티션 키 문자열"""
+    return df['sggCd'].astype(str) + df['dealYear'].astype(str) + df['dealMonth'].astype(str).str.zfill(2)
+
+
+def sync_molit_partitions(store, targets, deal_ymd_list, loaded=(), **kwargs):
+    """이미 불러온(loaded) 파티션 중 저장소에서 여전히 유효한 것은 건너뛰고 나머지만 수집
+
+    저장소에 없거나 TTL이 지난 이번 달 파티션은 API로, 저장소에는 있지만 아직
+    불러오지 않은 파티션은 로컬에서 읽는다.
+    """
+    loaded = set(loaded)
+    tasks = [
+        (gu_name, gu_code, ymd)
+        for gu_name, gu_code in targets.items() for ymd in deal_ymd_list
+        if (gu_code, ymd) not in loaded or not store.is_fresh(gu_code, ymd)
+    ]
+    return fetch_molit_tasks(tasks, store=store, **kwargs)
+
+
+def merge_molit_partitions(base, result):
+    """base에서 이번에 다시 받은 파티션의 행만 지우고 새 행을 덧붙임 (나머지 base 행은 그대로 유지)"""
+    refreshed = {f"{gu_code}{ymd}" for gu_code, ymd in result.partitions}
+    frames = []
+    if base is not None and len(base):
+        frames.append(base[~partition_keys(base).isin(refreshed)])
+    if result.frame is not None:
+        frames.append(result.frame)
+    frames = [f for f in frames if len(f)]
+    return concat_molit_frames(frames) if frames else None
@@ -0,0 +1,136 @@
+"""
+국토교통부 실거래가 배치 수집 CLI
+Streamlit 없이 자치구 × 계약년월 범위를 로컬 저장소(Parquet 파티션)에 적재한다.
+
+예) python molit_ingest.py --from 2021 --to 2026
+    python molit_ingest.py --gu 강남구 --gu 서초구 --from 202401 --to 202406 --workers 16
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from molit_client import MAX_WORKERS, RATE_LIMIT_PER_SEC, SEOUL_SIGUNGU_CODES, fetch_molit_tasks
+from molit_store import DATA_DIR, MolitStore, current_ymd
+
+# 체크포인트를 저장하는 단위 (작업 수)
+BATCH_SIZE = 100
+
+
+def month_range(start, end):
+    """'2021' / '202103' 형식의 시작·끝을 계약년월 목록으로 변환 (이번 달 이후는 제외)"""
+    start = start if len(start) == 6 else f"{start}01"
+    end = min(end if len(end) == 6 else f"{end}12", current_ymd())
+    y, m = int(start[:4]), int(start[4:])
+    months = []
+    while f"{y}{m:02d}" <= end:
+        months.append(f"{y}{m:02d}")
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return months
+
+
+def resolve_gus(names):
+    """자치구명 또는 지역코드 목록 → {자치구명: 지역코드} (비어 있으면 서울 전체)"""
+    if not names:
+        return dict(SEOUL_SIGUNGU_CODES)
+    code_to_name = {code: name for name, code in SEOUL_SIGUNGU_CODES.items()}
+    targets = {}
+    for name in names:
+        if name in SEOUL_SIGUNGU_CODES:
+            targets[name] = SEOUL_SIGUNGU_CODES[name]
+        elif name in code_to_name:
+            targets[code_to_name[name]] = name
+        else:
+            raise SystemExit(f"알 수 없는 자치구입니다: {name}")
+    return targets
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {tuple(key.split(":")) for key in json.load(f)["done"]}
+
+
+def save_checkpoint(path, done):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "done": sorted(f"{gu_code}:{ymd}" for gu_code, ymd in done),
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }, f)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="국토교통부 상업업무용 부동산 실거래가 배치 수집")
+    parser.add_argument("--gu", action="append", help="자치구명 또는 지역코드 (여러 번 지정 가능, 생략 시 서울 전체)")
+    parser.add_argument("--from", dest="start", default=str(datetime.now().year),
+                        help="시작 연도(YYYY) 또는 계약년월(YYYYMM), 기본값은 올해")
+    parser.add_argument("--to", dest="end", default=None, help="종료 연도(YYYY) 또는 계약년월(YYYYMM), 기본값은 시작과 같음")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="동시 요청 수")
+    parser.add_argument("--rate", type=float, default=RATE_LIMIT_PER_SEC, help="서비스 키당 초당 요청 수")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="로컬 저장소 위치")
+    parser.add_argument("--checkpoint", default=None, help="체크포인트 파일 (기본값: <data-dir>/molit/ingest_checkpoint.json)")
+    parser.add_argument("--fresh", action="store_true", help="기존 체크포인트를 무시하고 처음부터 수집")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    if not os.getenv("MOLIT_API_KEY"):
+        print(".env 파일에 MOLIT_API_KEY가 설정되어 있지 않습니다.", file=sys.stderr)
+        return 2
+
+    store = MolitStore(args.data_dir)
+    checkpoint = args.checkpoint or os.path.join(store.root, "ingest_checkpoint.json")
+    # 이번 달처럼 아직 신고가 추가되는 달은 체크포인트에 두지 않음 (다시 실행하면 저장소 TTL 기준으로 판단)
+    done = set() if args.fresh else {p for p in load_checkpoint(checkpoint) if not store.is_open(p[1])}
+
+    targets = resolve_gus(args.gu)
+    months = month_range(args.start, args.end or args.start)
+    all_tasks = [(gu_name, gu_code, ymd) for gu_name, gu_code in targets.items() for ymd in months]
+    tasks = [task for task in all_tasks if (task[1], task[2]) not in done]
+    print(f"대상 {len(targets)}개 자치구 × {len(months)}개월 = {len(all_tasks)}건 "
+          f"(체크포인트로 건너뜀 {len(all_tasks) - len(tasks)}건)", flush=True)
+
+    api_requests = cache_hits = rows = 0
+    failures = []
+    started = time.perf_counter()
+    for batch_start in range(0, len(tasks), BATCH_SIZE):
+        batch = tasks[batch_start:batch_start + BATCH_SIZE]
+        result = fetch_molit_tasks(batch, max_workers=args.workers, rate_per_sec=args.rate,
+                                   store=store, keep_frames=False)
+        done.update(p for p in result.partitions if not store.is_open(p[1]))
+        save_checkpoint(checkpoint, done)
+
+        api_requests += result.requests
+        cache_hits += result.cache_hits
+        rows += result.rows
+        failures += result.failures
+        print(f"[{batch_start + len(batch)}/{len(tasks)}] API {result.requests}건 · 저장소 적중 {result.cache_hits}건 · "
+              f"행 {result.rows:,}건 · 실패 {len(result.failures)}건 · {time.perf_counter() - started:.1f}초", flush=True)
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(f"\n완료: API 요청 {api_requests}건 ({api_requests / elapsed:.1f} req/s) · "
+          f"행 {rows:,}건 ({rows / elapsed:,.0f} rows/s) · 저장소 적중 {cache_hits}건 · "
+          f"실패 {len(failures)}건 · {elapsed:.1f}초")
+    for f in failures:
+        reason = f" (원인: {type(f.cause).__name__}: {f.cause})" if f.kind == "circuit_open" and f.cause is not None else ""
+        print(f"  실패 [{f.kind}] {f.gu_name} - {f.deal_ymd}: {f.error}{reason}", file=sys.stderr)
+
+    if failures:
+        print(f"체크포인트 {checkpoint} 에서 다시 실행하면 실패한 항목만 수집합니다.", file=sys.stderr)
+        return 1
+    # 범위 전체를 끝냈으면 체크포인트는 필요 없음 (다음 실행은 저장소 TTL 기준으로 판단)
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
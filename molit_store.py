@@ -0,0 +1,74 @@
+"""
+실거래가 로컬 저장소
+(자치구 지역코드 × 계약년월) 단위 Parquet 파티션으로 API 조회 결과를 보관한다.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+# 데이터 디렉토리 (실거래가 로컬 저장소 위치)
+DATA_DIR = os.getenv("MOLIT_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+# 이번 달 파티션은 신고가 계속 추가되므로 TTL(초) 동안만 재사용
+CURRENT_MONTH_TTL = int(os.getenv("MOLIT_CURRENT_MONTH_TTL", "3600"))
+
+
+def current_ymd(now=None):
+    return (now or datetime.now()).strftime("%Y%m")
+
+
+class MolitStore:
+    """root/molit/LAWD_CD=xxxxx/DEAL_YMD=yyyymm.parquet 파티션 저장소
+
+    지난 달까지의 파티션은 만료되지 않고, 이번 달(및 이후) 파티션은 ttl 초가 지나면 다시 조회한다.
+    조회 결과가 없던 달도 빈 파티션으로 저장해 API를 다시 호출하지 않는다.
+    """
+
+    def __init__(self, root, ttl=CURRENT_MONTH_TTL):
+        self.root = os.path.join(root, "molit")
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def path(self, lawd_cd, deal_ymd):
+        return os.path.join(self.root, f"LAWD_CD={lawd_cd}", f"DEAL_YMD={deal_ymd}.parquet")
+
+    def is_open(self, deal_ymd):
+        """아직 신고가 추가될 수 있는 달인지 여부"""
+        return str(deal_ymd) >= current_ymd()
+
+    def is_fresh(self, lawd_cd, deal_ymd):
+        path = self.path(lawd_cd, deal_ymd)
+        if not os.path.exists(path):
+            return False
+        if not self.is_open(deal_ymd):
+            return True
+        return time.time() - os.path.getmtime(path) < self.ttl
+
+    def get(self, lawd_cd, deal_ymd):
+        """(적중 여부, DataFrame 또는 None) — 빈 파티션은 (True, None)"""
+        if not self.is_fresh(lawd_cd, deal_ymd):
+            with self._lock:
+                self.misses += 1
+            return False, None
+        df = pd.read_parquet(self.path(lawd_cd, deal_ymd))
+        with self._lock:
+            self.hits += 1
+        return True, (df if len(df) else None)
+
+    def put(self, lawd_cd, deal_ymd, df):
+        path = self.path(lawd_cd, deal_ymd)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 동시에 읽는 쪽이 쓰다 만 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        (df if df is not None else pd.DataFrame()).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
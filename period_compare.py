@@ -0,0 +1,91 @@
+"""
+기간 비교 엔진
+업종별 창업 / 폐업 큐브를 (연월 × 업종) 합계 · 원본 행 수 행렬로 한 번 펼쳐 두고,
+여러 연도 기간의 평균 · 변화량 · 변화율 · 부트스트랩 신뢰구간을 배열 연산으로 계산한다.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from business_stats import COUNT_COLS, ROWS_COL
+
+# 부트스트랩 반복 수 / 신뢰수준
+N_BOOT = 1000
+CI_LEVEL = 0.95
+
+
+class PeriodComparison:
+    """연월 × 업종 행렬 위의 기간 비교기
+
+    기간은 연도 묶음이고, 기간 평균은 원본 행 기준 평균(합계 ÷ 원본 행 수)이다 — 원본에서 groupby('업종명').mean() 과 같다.
+    신뢰구간은 기간마다 그 기간의 연월을 복원 추출하는 부트스트랩(백분위수)으로 구한다 (같은 기간 조합이면 같은 결과).
+    질의 결과(DataFrame)는 LRU 캐시에 보관되어 공유되므로 호출하는 쪽에서 수정하지 않는다.
+    """
+
+    def __init__(self, cube, n_boot=N_BOOT, seed=0, cache_size=128):
+        year_month = cube['Year'].to_numpy(dtype=np.int64) * 12 + cube['Month'].to_numpy(dtype=np.int64) - 1
+        self.year_months, row = np.unique(year_month, return_inverse=True)
+        self.years = self.year_months // 12
+        col, industries = pd.factorize(cube['업종명'], sort=True)
+        self.industries = np.asarray(industries, dtype=object)
+        shape = (len(self.year_months), len(self.industries))
+        flat = row * shape[1] + col
+        # 값 열별 (연월, 업종) 합계 — 정수 합이라 float64 로도 정확
+        self.sums = {
+            name: np.bincount(flat, weights=cube[name].to_numpy(dtype=np.float64), minlength=shape[0] * shape[1]).reshape(shape)
+            for name in COUNT_COLS + [ROWS_COL]
+        }
+        self.n_boot = n_boot
+        self.seed = seed
+        self.compare = lru_cache(maxsize=cache_size)(self._compare)
+
+    def _rows(self, years):
+        """기간(연도 묶음)에 속한 연월 행 번호"""
+        return np.flatnonzero(np.isin(self.years, list(years)))
+
+    def _compare(self, periods, col='창업수', ci=CI_LEVEL):
+        """기간 여러 개 → 업종별 비교 DataFrame
+
+        periods 는 연도 튜플의 튜플, 첫 기간이 기준이다. 모든 기간에 데이터가 있는 업종만 남긴다.
+        열: 업종명, 평균_k (k = 0, 1, ...), 그리고 k >= 1 마다 변화량_k · 변화율_k(%) · 하한_k · 상한_k (변화량의 신뢰구간).
+        남는 업종이 없어도 열 구성은 같다 (빈 DataFrame).
+        """
+        values, counts = self.sums[col], self.sums[ROWS_COL]
+        rows = [self._rows(years) for years in periods]
+        totals = np.array([counts[r].sum(axis=0) for r in rows]).reshape(len(periods), -1)
+        keep = (totals > 0).all(axis=0)
+        means = np.array([values[r].sum(axis=0) for r in rows]).reshape(len(periods), -1)[:, keep] / totals[:, keep]
+
+        out = pd.DataFrame({'업종명': self.industries[keep]})
+        for k, mean in enumerate(means):
+            out[f'평균_{k}'] = mean
+        if not keep.any():
+            for k in range(1, len(periods)):
+                for name in ('변화량', '변화율', '하한', '상한'):
+                    out[f'{name}_{k}'] = np.empty(0)
+            return out
+
+        # 부트스트랩: 기간마다 연월 복원 추출 횟수 행렬 (n_boot, 연월 수) 과의 곱으로 합계를 한 번에
+        rng = np.random.default_rng(self.seed)
+        boot = []
+        for r in rows:
+            draws = rng.integers(0, len(r), (self.n_boot, len(r))) + np.arange(self.n_boot)[:, None] * len(r)
+            weights = np.bincount(draws.ravel(), minlength=self.n_boot * len(r)).reshape(self.n_boot, len(r))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                boot.append((weights @ values[r][:, keep]) / (weights @ counts[r][:, keep]))
+        tail = (1 - ci) / 2 * 100
+        for k in range(1, len(periods)):
+            change = means[k] - means[0]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[f'변화량_{k}'] = change
+                out[f'변화율_{k}'] = np.where(means[0] > 0, change / means[0] * 100, np.nan)
+            diff = boot[k] - boot[0]
+            # 재표본에서 업종이 빠지면(행 수 0) 그 반복은 제외
+            percentile = np.nanpercentile if np.isnan(diff).any() else np.percentile
+            out[f'하한_{k}'], out[f'상한_{k}'] = percentile(diff, [tail, 100 - tail], axis=0)
+        return out
+
+    def cache_info(self):
+        return self.compare.cache_info()
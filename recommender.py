@@ -0,0 +1,86 @@
+"""
+입지 추천 엔진
+행정동 × 브랜드 전체 조합에서 브랜드가 아직 진출하지 않은 행정동을 점수 순으로 추천한다.
+점수는 ScoringEngine 의 가중치별 결과를 쓰고, 상위 k개는 argpartition 으로 뽑는다.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from scoring import SCORE_COLS
+
+# 추천 결과에 함께 싣는 행정동 정보 컬럼
+INFO_COLS = ["total_workers", "monthly_sales", "cafe_count"]
+
+
+class Recommender:
+    """행정동 × 브랜드 추천 행렬
+
+    eligible[d, b] 는 브랜드 b 가 행정동 d 에 매장이 없고 행정동 점수 데이터가 있을 때 True.
+    질의 결과(DataFrame)는 LRU 캐시에 보관되어 공유되므로 호출하는 쪽에서 수정하지 않는다.
+    """
+
+    def __init__(self, df_dong, brands, engine, cache_size=512):
+        self.engine = engine
+        self.brands = list(brands)
+        self._brand_pos = {b: i for i, b in enumerate(self.brands)}
+        counts = np.column_stack([
+            pd.to_numeric(df_dong[f"cnt_{b}"], errors="coerce").fillna(0).to_numpy()
+            if f"cnt_{b}" in df_dong.columns else np.zeros(len(df_dong))
+            for b in self.brands
+        ]) if self.brands else np.zeros((len(df_dong), 0))
+        self.eligible = (counts == 0) & engine.mask[:, None]
+        self.dong_names = df_dong["dong_name"].to_numpy(dtype=object)
+        self.dong_codes = df_dong["dong_code"].to_numpy(dtype=object)
+        self.info = df_dong[[c for c in INFO_COLS if c in df_dong.columns]].reset_index(drop=True)
+        self._dong_mask = lru_cache(maxsize=cache_size)(self._compute_dong_mask)
+        self.top = lru_cache(maxsize=cache_size)(self._top)
+
+    def _compute_dong_mask(self, dong_query):
+        if not dong_query:
+            return None
+        return pd.Series(self.dong_names).str.contains(dong_query, regex=False).to_numpy()
+
+    def _top(self, weights, sort_by="attractiveness_score", brand=None, dong_query=None, k=60):
+        """상위 k개 추천 (행정동, 브랜드) → DataFrame (sort_by 내림차순)
+
+        weights 는 ScoreWeights, brand 가 None 이면 전체 브랜드, dong_query 는 행정동명 부분 문자열.
+        """
+        scores = self.engine.score_array(weights)
+        eligible = self.eligible
+        if brand is not None:
+            if brand not in self._brand_pos:
+                return self._frame(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), scores)
+            b = self._brand_pos[brand]
+            eligible = eligible[:, b:b + 1]
+        dong_mask = self._dong_mask(dong_query)
+        if dong_mask is not None:
+            eligible = eligible & dong_mask[:, None]
+
+        d, b = np.nonzero(eligible)
+        if brand is not None:
+            b = np.full(len(d), self._brand_pos[brand])
+        values = scores[d, SCORE_COLS.index(sort_by)]
+        if len(values) > k:
+            part = np.argpartition(-values, k - 1)[:k]
+            d, b, values = d[part], b[part], values[part]
+        # 점수 내림차순, 같으면 행정동·브랜드 순서
+        order = np.lexsort((b, d, -values))
+        return self._frame(d[order], b[order], scores)
+
+    def _frame(self, d, b, scores):
+        out = pd.DataFrame({
+            "dong_name": self.dong_names[d],
+            "dong_code": self.dong_codes[d],
+            "brand": np.asarray(self.brands, dtype=object)[b] if len(b) else np.empty(0, dtype=object),
+        })
+        for i, col in enumerate(SCORE_COLS):
+            out[col] = scores[d, i]
+        for col in self.info.columns:
+            out[col] = self.info[col].to_numpy()[d]
+        return out
+
+    def cache_info(self):
+        return self.top.cache_info()
@@ -0,0 +1,90 @@
+"""
+입지 매력도 점수 엔진
+행정동 원천 컬럼(월매출 · 종사자 · 카페 수 · ㎡당 부동산가)에서 Min-Max 정규화와 가중 합산을 다시 계산한다.
+가중치 조합별로 결과를 캐시해 두어 슬라이더를 움직여도 바로 다시 순위를 매길 수 있다.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# 점수 계산에 쓰는 원천 컬럼
+RAW_COLS = ["monthly_sales", "total_workers", "cafe_count", "avg_price_per_m2"]
+SCORE_COLS = ["demand_score", "competition_score", "cost_score", "attractiveness_score"]
+
+
+class ScoreWeights(NamedTuple):
+    """매력도 = 수요 × demand + 경쟁 × competition + 비용 × cost, 수요 = 매출 × sales + 종사자 × workers"""
+    demand: float = 0.4
+    competition: float = 0.3
+    cost: float = 0.3
+    sales: float = 0.5
+    workers: float = 0.5
+
+    def normalized(self):
+        """두 가중치 묶음을 각각 합이 1이 되도록 맞춤 (모두 0이면 균등)"""
+        top = np.array([self.demand, self.competition, self.cost], dtype=float)
+        mix = np.array([self.sales, self.workers], dtype=float)
+        top = top / top.sum() if top.sum() > 0 else np.full(3, 1 / 3)
+        mix = mix / mix.sum() if mix.sum() > 0 else np.full(2, 1 / 2)
+        return ScoreWeights(*np.round(np.r_[top, mix], 6))
+
+
+DEFAULT_WEIGHTS = ScoreWeights()
+
+
+def _minmax(values, mask):
+    """mask 행 기준 Min-Max 정규화 (값이 모두 같으면 0)"""
+    v = values[mask]
+    lo, hi = v.min(), v.max()
+    out = np.zeros_like(values)
+    if hi > lo:
+        out[mask] = (v - lo) / (hi - lo)
+    return out
+
+
+class ScoringEngine:
+    """행정동 점수 재계산기
+
+    정규화는 생성 시 한 번만 하고, 가중치 조합별 점수는 LRU 캐시에 보관한다.
+    원천 데이터가 없는 행정동(카페 수 / 부동산가가 0)은 기존 데이터와 같이 모든 점수가 0이다.
+    use_baseline 이면 기본 가중치에서는 df_dong 에 들어 있는 원본 점수를 그대로 돌려준다.
+    """
+
+    def __init__(self, df_dong, cache_size=256, use_baseline=True):
+        raw = df_dong[RAW_COLS].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=float)
+        self.index = df_dong.index
+        self.mask = (raw > 0).all(axis=1)
+        self.norm_sales, self.norm_workers, self.norm_cafe, self.norm_price = (
+            _minmax(raw[:, i], self.mask) for i in range(len(RAW_COLS))
+        )
+        self._baseline = None
+        if use_baseline and all(c in df_dong.columns for c in SCORE_COLS):
+            self._baseline = df_dong[SCORE_COLS].to_numpy(dtype=float)
+            self._baseline.setflags(write=False)
+        self._scores = lru_cache(maxsize=cache_size)(self._compute)
+
+    def _compute(self, weights):
+        if self._baseline is not None and weights == DEFAULT_WEIGHTS.normalized():
+            return self._baseline
+        demand = (self.norm_sales * weights.sales + self.norm_workers * weights.workers) * 100
+        competition = (1 - self.norm_cafe) * 100
+        cost = (1 - self.norm_price) * 100
+        attractiveness = demand * weights.demand + competition * weights.competition + cost * weights.cost
+        scores = np.vstack([demand, competition, cost, attractiveness]).T
+        scores[~self.mask] = 0
+        scores.setflags(write=False)
+        return scores
+
+    def score_array(self, weights=DEFAULT_WEIGHTS):
+        """가중치 → (행정동 수, 4) 읽기 전용 점수 배열 (열 순서는 SCORE_COLS)"""
+        return self._scores(ScoreWeights(*weights).normalized())
+
+    def scores(self, weights=DEFAULT_WEIGHTS):
+        """가중치 → 점수 DataFrame (SCORE_COLS, df_dong 과 같은 인덱스)"""
+        return pd.DataFrame(self.score_array(weights), index=self.index, columns=SCORE_COLS)
+
+    def cache_info(self):
+        return self._scores.cache_info()
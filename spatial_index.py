@@ -0,0 +1,213 @@
+"""
+매장 좌표 공간 인덱스
+위경도를 일정 크기(m)의 격자 셀로 나누고 셀 번호 순으로 정렬해 두어,
+영역(bbox) / 반경 / 최근접 k개 조회 시 주변 셀의 점만 검사한다.
+"""
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+# 위도 1도의 거리 (m)
+M_PER_DEG_LAT = math.pi * EARTH_RADIUS_M / 180
+
+# 기본 셀 크기 (m) — 서울 매장 밀도 기준 셀당 수 개~수십 개
+DEFAULT_CELL_M = 250
+
+# 육각형 집계 크기 단계 (중심~꼭짓점, m) — 줌 레벨별로 이 중 하나를 골라 캐시를 재사용
+HEX_SIZES_M = (125, 250, 500, 1000, 2000, 4000)
+# 육각형 투영 기준점 (서울시청) — 모든 집계가 같은 격자를 쓰도록 고정
+HEX_ORIGIN = (37.5665, 126.9780)
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """두 지점(배열 가능) 사이의 대원 거리 (m)"""
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GridIndex:
+    """위경도 격자 인덱스
+
+    조회 결과는 생성 시 넘긴 좌표 배열의 위치(정수 배열)로 돌려준다 (df.iloc 에 그대로 사용).
+    경도 방향 셀 폭은 전체 점의 최대 |위도| 기준으로 잡아, 어느 위치에서도 셀이 cell_m 보다 좁지 않다.
+    """
+
+    def __init__(self, lat, lng, cell_m=DEFAULT_CELL_M):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.cell_m = cell_m
+        valid = np.isfinite(self.lat) & np.isfinite(self.lng)
+        if valid.any():
+            self.lat0, self.lng0 = self.lat[valid].min(), self.lng[valid].min()
+            max_abs_lat = np.abs(self.lat[valid]).max()
+        else:
+            self.lat0 = self.lng0 = max_abs_lat = 0.0
+        self.dlat = cell_m / M_PER_DEG_LAT
+        self.dlng = cell_m / (M_PER_DEG_LAT * max(math.cos(math.radians(min(max_abs_lat, 89.0))), 1e-6))
+
+        rows, cols = self._cell(self.lat[valid], self.lng[valid])
+        self.n_rows = int(rows.max()) + 1 if len(rows) else 1
+        self.n_cols = int(cols.max()) + 1 if len(cols) else 1
+        cell_ids = rows.astype(np.int64) * self.n_cols + cols
+        # 셀 번호 순 정렬 + 셀별 시작 위치 (CSR)
+        order = np.argsort(cell_ids, kind="stable")
+        self._order = np.flatnonzero(valid)[order]
+        self._starts = np.searchsorted(cell_ids[order], np.arange(self.n_rows * self.n_cols + 1))
+
+    def __len__(self):
+        return len(self._order)
+
+    def _cell(self, lat, lng):
+        rows = np.floor((np.asarray(lat) - self.lat0) / self.dlat).astype(np.int64)
+        cols = np.floor((np.asarray(lng) - self.lng0) / self.dlng).astype(np.int64)
+        return rows, cols
+
+    def _candidates(self, min_lat, min_lng, max_lat, max_lng):
+        """영역과 겹치는 셀들의 점 위치 (경계 셀의 점 포함, 정밀 검사 전)"""
+        (r0, r1), (c0, c1) = self._cell([min_lat, max_lat], [min_lng, max_lng])
+        r0, r1 = max(r0, 0), min(r1, self.n_rows - 1)
+        c0, c1 = max(c0, 0), min(c1, self.n_cols - 1)
+        if r0 > r1 or c0 > c1:
+            return np.empty(0, dtype=np.int64)
+        # 한 격자 행 안에서는 셀 번호가 연속이므로 행마다 구간 하나씩
+        base = np.arange(r0, r1 + 1) * self.n_cols
+        lo, hi = self._starts[base + c0], self._starts[base + c1 + 1]
+        if len(lo) == 1:
+            return self._order[lo[0]:hi[0]]
+        return np.concatenate([self._order[a:b] for a, b in zip(lo, hi)])
+
+    def bbox(self, min_lat, min_lng, max_lat, max_lng):
+        """영역 안의 점 위치"""
+        pos = self._candidates(min_lat, min_lng, max_lat, max_lng)
+        lat, lng = self.lat[pos], self.lng[pos]
+        inside = (lat >= min_lat) & (lat <= max_lat) & (lng >= min_lng) & (lng <= max_lng)
+        return np.sort(pos[inside])
+
+    def radius(self, lat, lng, meters):
+        """(점 위치, 거리 m) — 중심에서 meters 이내, 가까운 순"""
+        dlat = meters / M_PER_DEG_LAT
+        dlng = meters / (M_PER_DEG_LAT * max(math.cos(math.radians(min(abs(lat) + dlat, 89.0))), 1e-6))
+        pos = self._candidates(lat - dlat, lng - dlng, lat + dlat, lng + dlng)
+        dist = haversine_m(lat, lng, self.lat[pos], self.lng[pos])
+        inside = dist <= meters
+        pos, dist = pos[inside], dist[inside]
+        order = np.argsort(dist, kind="stable")
+        return pos[order], dist[order]
+
+    def query_pairs(self, lat, lng, meters):
+        """(조회점 번호, 점 위치, 거리 m) — 여러 조회점 각각에서 meters 이내인 모든 점
+
+        조회점마다 주변 셀 범위를 한 번에 펼쳐 후보 쌍을 만들고 거리로 거른다 (파이썬 반복 없음).
+        결과는 조회점 번호 순으로 모여 있다.
+        """
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0))
+        if not len(lat) or not len(self):
+            return empty
+        rows, cols = self._cell(lat, lng)
+        kr = int(math.ceil(meters / self.cell_m))
+        # 경도 방향 셀 폭은 조회점의 최대 |위도| 에서 가장 좁음
+        col_width_m = self.dlng * M_PER_DEG_LAT * math.cos(math.radians(min(np.abs(lat).max(), 89.0)))
+        kc = int(math.ceil(meters / max(col_width_m, 1e-6)))
+        dr, dc = np.meshgrid(np.arange(-kr, kr + 1), np.arange(-kc, kc + 1), indexing="ij")
+        q = np.repeat(np.arange(len(lat)), dr.size)
+        nr = (rows[:, None] + dr.ravel()).ravel()
+        nc = (cols[:, None] + dc.ravel()).ravel()
+        inside = (nr >= 0) & (nr < self.n_rows) & (nc >= 0) & (nc < self.n_cols)
+        q, cell = q[inside], nr[inside] * self.n_cols + nc[inside]
+        lo, hi = self._starts[cell], self._starts[cell + 1]
+        counts = hi - lo
+        total = int(counts.sum())
+        if not total:
+            return empty
+        # (조회점, 셀) 마다 셀 안의 점을 펼침
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        q = np.repeat(q, counts)
+        pos = self._order[np.repeat(lo, counts) + offsets]
+        dist = haversine_m(lat[q], lng[q], self.lat[pos], self.lng[pos])
+        within = dist <= meters
+        return q[within], pos[within], dist[within]
+
+    def nearest(self, lat, lng, k=10):
+        """(점 위치, 거리 m) — 가장 가까운 k개, 가까운 순
+
+        반경을 두 배씩 넓혀 가며 k개 이상이 반경 안에 들어오면 멈춘다 (반경 안의 결과는 정확).
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        meters = self.cell_m
+        span_m = max(self.n_rows, self.n_cols) * self.cell_m * 2 + abs(lat - self.lat0) * M_PER_DEG_LAT
+        while True:
+            pos, dist = self.radius(lat, lng, meters)
+            if len(pos) >= k or meters > span_m:
+                break
+            meters *= 2
+        if len(pos) < k:
+            # 격자 밖 먼 지점에서의 조회: 전체 검사
+            pos = self._order
+            dist = haversine_m(lat, lng, self.lat[pos], self.lng[pos])
+            order = np.argsort(dist, kind="stable")
+            pos, dist = pos[order], dist[order]
+        return pos[:k], dist[:k]
+
+    def centroid(self, pos):
+        """점 위치들의 (위도, 경도) 영역 중심과 영역 크기(m) — 지도 시점 맞춤용"""
+        lat, lng = self.lat[pos], self.lng[pos]
+        lat_c, lng_c = (lat.min() + lat.max()) / 2, (lng.min() + lng.max()) / 2
+        height = (lat.max() - lat.min()) * M_PER_DEG_LAT
+        width = (lng.max() - lng.min()) * M_PER_DEG_LAT * math.cos(math.radians(lat_c))
+        return lat_c, lng_c, max(height, width)
+
+
+def zoom_for_span(lat, span_m, viewport_px=700):
+    """영역 크기(m)가 화면(viewport_px)에 들어오는 웹 메르카토르 줌 레벨"""
+    span_m = max(span_m, 200)
+    zoom = math.log2(2 * math.pi * EARTH_RADIUS_M * math.cos(math.radians(lat)) * viewport_px / (256 * span_m))
+    return float(min(max(zoom, 9.0), 17.0))
+
+
+def hex_size_for_zoom(lat, zoom, px=10):
+    """줌 레벨에서 육각형 반지름이 약 px 픽셀이 되는 크기 (HEX_SIZES_M 단계로 내림)"""
+    m_per_px = 2 * math.pi * EARTH_RADIUS_M * math.cos(math.radians(lat)) / (256 * 2 ** zoom)
+    target = px * m_per_px
+    return max((size for size in HEX_SIZES_M if size <= target), default=HEX_SIZES_M[0])
+
+
+def _project(lat, lng, origin=HEX_ORIGIN):
+    """기준점 중심 등장방형 투영 (동쪽 x, 북쪽 y, m)"""
+    lat0, lng0 = origin
+    x = (np.asarray(lng, dtype=np.float64) - lng0) * M_PER_DEG_LAT * math.cos(math.radians(lat0))
+    y = (np.asarray(lat, dtype=np.float64) - lat0) * M_PER_DEG_LAT
+    return x, y
+
+
+def hex_cells(lat, lng, size_m, origin=HEX_ORIGIN):
+    """점 → 평평한 윗변(flat-top) 육각 격자 축 좌표 (q, r)
+
+    size_m 은 중심에서 꼭짓점까지 거리. deck.gl ColumnLayer(disk_resolution=6, radius=size_m)와 모양이 같다.
+    """
+    x, y = _project(lat, lng, origin)
+    qf = (2 / 3 * x) / size_m
+    rf = (-1 / 3 * x + math.sqrt(3) / 3 * y) / size_m
+    # 큐브 좌표 반올림
+    sf = -qf - rf
+    q, r, s = np.round(qf), np.round(rf), np.round(sf)
+    dq, dr, ds = np.abs(q - qf), np.abs(r - rf), np.abs(s - sf)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    q = np.where(fix_q, -r - s, q)
+    r = np.where(fix_r, -q - s, r)
+    return q.astype(np.int32), r.astype(np.int32)
+
+
+def hex_centers(q, r, size_m, origin=HEX_ORIGIN):
+    """육각 격자 축 좌표 → 셀 중심 (위도, 경도)"""
+    lat0, lng0 = origin
+    x = size_m * 1.5 * np.asarray(q, dtype=np.float64)
+    y = size_m * math.sqrt(3) * (np.asarray(r, dtype=np.float64) + np.asarray(q, dtype=np.float64) / 2)
+    return lat0 + y / M_PER_DEG_LAT, lng0 + x / (M_PER_DEG_LAT * math.cos(math.radians(lat0)))
@@ -0,0 +1,110 @@
+"""
+테스트 공용 픽스처 — 국토교통부 실거래가 API 스텁 서버
+(지역코드, 계약년월) 마다 정해진 건수의 거래를 pageNo / numOfRows 로 나눠 XML 로 돌려주고,
+fault(호출 번호, 파라미터) 가 돌려주는 장애 종류('503' · 'hang' · 'malformed')를 주입한다.
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import molit_client  # noqa: E402
+
+SERVICE_KEY = "test-key"
+
+
+def item_xml(lawd_cd, deal_ymd, n):
+    """n번째 거래 item (값은 n 으로 결정되므로 다시 받아도 같다)"""
+    return (f"<item><buildYear>{1980 + n % 40}</buildYear><buildingAr>{100 + n}.5</buildingAr>"
+            f"<buildingUse>{'제2종근린생활' if n % 2 else '업무'}</buildingUse><dealAmount>{1000 + n:,}</dealAmount>"
+            f"<dealDay>{1 + n % 28}</dealDay><dealMonth>{int(deal_ymd[4:])}</dealMonth><dealYear>{deal_ymd[:4]}</dealYear>"
+            f"<floor>{n % 10}</floor><jibun>{n}</jibun><sggCd>{lawd_cd}</sggCd><sggNm>구{lawd_cd}</sggNm>"
+            f"<umdNm>동{n % 5}</umdNm></item>")
+
+
+def response_xml(lawd_cd, deal_ymd, page_no, num_rows, total):
+    start = (page_no - 1) * num_rows
+    items = "".join(item_xml(lawd_cd, deal_ymd, n) for n in range(start, min(start + num_rows, total)))
+    return (f"<?xml version='1.0' encoding='UTF-8'?><response><header><resultCode>000</resultCode>"
+            f"<resultMsg>OK</resultMsg></header><body><items>{items}</items><numOfRows>{num_rows}</numOfRows>"
+            f"<pageNo>{page_no}</pageNo><totalCount>{total}</totalCount></body></response>").encode("utf-8")
+
+
+class StubServer:
+    """스레드 HTTP 스텁 서버 — calls 에 받은 요청 파라미터를 순서대로 기록"""
+
+    def __init__(self):
+        self.totals = {}        # (지역코드, 계약년월) → 거래 수 (없으면 default_total)
+        self.default_total = 5
+        self.fault = None       # fault(호출 번호, 파라미터) → None 또는 장애 종류
+        self.hang_seconds = 2.0
+        self.calls = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                with stub._lock:
+                    stub.calls.append(params)
+                    call_no = len(stub.calls)
+                fault = stub.fault(call_no, params) if stub.fault else None
+                if fault == "hang":
+                    time.sleep(stub.hang_seconds)
+                if fault == "503":
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if fault == "malformed":
+                    body = b"<response><header><resultMsg>OK</resultMsg></header><body><items><item><dealAm"
+                else:
+                    key = (params["LAWD_CD"], params["DEAL_YMD"])
+                    body = response_xml(*key, int(params.get("pageNo", 1)), int(params["numOfRows"]),
+                                        stub.totals.get(key, stub.default_total))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        # 포트마다 URL 이 달라 회로 차단기(엔드포인트 단위)가 테스트끼리 섞이지 않음
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/getRTMSDataSvcNrgTrade"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def partition_calls(self, lawd_cd, deal_ymd):
+        return [c for c in self.calls if (c["LAWD_CD"], c["DEAL_YMD"]) == (lawd_cd, deal_ymd)]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def fetch_kwargs(stub):
+    """fetch_molit_* 공통 인자 (스텁 URL · 테스트 키 · 속도 제한 사실상 해제 · 전용 세션)"""
+    return {"url": stub.url, "service_key": SERVICE_KEY, "rate_per_sec": 1000,
+            "session": molit_client.make_session()}
@@ -0,0 +1,36 @@
+"""figure 캐시 — 적중 · 미적중 · 제거 횟수와 크기 집계"""
+
+import plotly.graph_objects as go
+
+from figure_cache import FigureCache
+
+
+def bar(n):
+    return lambda: go.Figure(go.Bar(y=list(range(n))))
+
+
+def test_stats_counts_hits_misses_and_evictions():
+    cache = FigureCache(maxsize=2)
+    a = cache.get_json("a", "light", (1,), bar(3))
+    assert cache.get_json("a", "light", (1,), bar(99)) == a   # 적중이면 build 를 부르지 않음
+    b = cache.get_json("a", "dark", (1,), bar(5))           # 테마가 다르면 다른 키
+    cache.get_json("b", "light", (1,), bar(7))               # 한도 초과 → 가장 오래 안 쓴 ("a", "light") 제거
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 3, 1)
+    assert stats["hit_rate"] == 0.25
+    assert stats["size"] == 2
+    assert stats["nbytes"] == len(b) + len(cache.get_json("b", "light", (1,), bar(7)))
+
+    cache.get_json("a", "light", (1,), bar(3))
+    assert cache.stats()["misses"] == 4
+
+
+def test_stats_respects_byte_limit():
+    spec = FigureCache().get_json("a", "light", (), bar(50))
+    cache = FigureCache(max_bytes=len(spec) + 1)
+    cache.get_json("a", "light", (), bar(50))
+    cache.get_json("b", "light", (), bar(50))
+    stats = cache.stats()
+    assert stats["size"] == 1 and stats["evictions"] == 1
+    assert stats["nbytes"] == len(spec)
@@ -0,0 +1,81 @@
+"""자치구 × 계약년월 동시 수집 엔진 — 직렬 수집과 같은 결과 · 진행률 콜백"""
+
+import threading
+
+import pandas as pd
+
+from molit_client import NUM_OF_ROWS, concat_molit_frames, fetch_molit_bulk, fetch_molit_data
+from molit_store import MolitStore
+
+TARGETS = {"종로구": "11110", "중구": "11140", "용산구": "11170"}
+DEAL_YMDS = ["202401", "202402", "202403", "202404"]
+
+
+def setup_totals(stub):
+    # 여러 페이지짜리 달과 거래가 없는 달을 섞음
+    stub.totals[("11110", "202402")] = NUM_OF_ROWS * 2 + 500
+    stub.totals[("11140", "202403")] = NUM_OF_ROWS + 1
+    stub.totals[("11170", "202401")] = 0
+
+
+def serial_frame(fetch_kwargs):
+    """기존 직렬 반복 (자치구 → 계약년월 순) 으로 받은 결과"""
+    frames = []
+    for gu_code in TARGETS.values():
+        for ymd in DEAL_YMDS:
+            df = fetch_molit_data(gu_code, ymd, session=fetch_kwargs["session"], service_key=fetch_kwargs["service_key"],
+                                  url=fetch_kwargs["url"], rate_per_sec=fetch_kwargs["rate_per_sec"])
+            if df is not None:
+                frames.append(df)
+    return concat_molit_frames(frames)
+
+
+def test_concurrent_matches_serial(stub, fetch_kwargs):
+    setup_totals(stub)
+    expected = serial_frame(fetch_kwargs)
+    assert len(expected) == 2500 + 1001 + 5 * 9
+
+    for workers in (1, 8):
+        result = fetch_molit_bulk(TARGETS, DEAL_YMDS, max_workers=workers, **fetch_kwargs)
+        assert not result.failures
+        pd.testing.assert_frame_equal(result.frame, expected)
+        assert result.rows == len(expected)
+        assert sorted(result.partitions) == sorted((c, y) for c in TARGETS.values() for y in DEAL_YMDS)
+
+
+def test_paginated_partition_requests_every_page(stub, fetch_kwargs):
+    setup_totals(stub)
+    fetch_molit_bulk({"종로구": "11110"}, ["202402"], **fetch_kwargs)
+    pages = sorted(int(c["pageNo"]) for c in stub.partition_calls("11110", "202402"))
+    assert pages == [1, 2, 3]
+
+
+def test_progress_callback(stub, fetch_kwargs):
+    setup_totals(stub)
+    calls = []
+    caller = threading.get_ident()
+
+    def on_progress(done, total, gu_name, ymd):
+        calls.append((done, total, gu_name, ymd, threading.get_ident()))
+
+    fetch_molit_bulk(TARGETS, DEAL_YMDS, max_workers=8, on_progress=on_progress, **fetch_kwargs)
+
+    n_tasks = len(TARGETS) * len(DEAL_YMDS)
+    assert [c[0] for c in calls] == list(range(1, n_tasks + 1))
+    assert {c[1] for c in calls} == {n_tasks}
+    assert sorted((c[2], c[3]) for c in calls) == sorted((g, y) for g in TARGETS for y in DEAL_YMDS)
+    # st.progress 를 그대로 갱신할 수 있도록 호출한 스레드에서 실행
+    assert {c[4] for c in calls} == {caller}
+
+
+def test_requests_counts_http_calls(stub, fetch_kwargs, tmp_path):
+    setup_totals(stub)
+    store = MolitStore(str(tmp_path))
+    first = fetch_molit_bulk(TARGETS, DEAL_YMDS, max_workers=8, store=store, **fetch_kwargs)
+    # 파티션 12개지만 여러 페이지짜리 달 때문에 요청은 12 + 2 + 1 건
+    assert first.requests == len(stub.calls) == len(TARGETS) * len(DEAL_YMDS) + 3
+
+    stub.calls.clear()
+    second = fetch_molit_bulk(TARGETS, DEAL_YMDS + ["202405"], store=store, **fetch_kwargs)
+    assert second.cache_hits == len(TARGETS) * len(DEAL_YMDS)
+    assert second.requests == len(stub.calls) == len(TARGETS)
@@ -0,0 +1,38 @@
+"""배치 수집 CLI — 체크포인트에는 마감된 달만 남긴다"""
+
+import functools
+import json
+
+import molit_client
+import molit_ingest
+from molit_store import current_ymd
+
+
+def previous_ymd(ymd, months=1):
+    y, m = int(ymd[:4]), int(ymd[4:]) - months
+    while m < 1:
+        y, m = y - 1, m + 12
+    return f"{y}{m:02d}"
+
+
+def test_checkpoint_skips_open_months(stub, fetch_kwargs, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("MOLIT_API_KEY", fetch_kwargs["service_key"])
+    monkeypatch.setattr(molit_ingest, "fetch_molit_tasks",
+                        functools.partial(molit_client.fetch_molit_tasks, url=stub.url, session=fetch_kwargs["session"],
+                                          service_key=fetch_kwargs["service_key"]))
+    monkeypatch.setattr(molit_client, "_backoff", lambda attempt: 0)
+    this_month = current_ymd()
+    closed, broken = previous_ymd(this_month, 1), previous_ymd(this_month, 2)
+    # 한 달은 계속 실패시켜 체크포인트가 남게 함
+    stub.fault = lambda call_no, params: "503" if params["DEAL_YMD"] == broken else None
+
+    checkpoint = tmp_path / "checkpoint.json"
+    code = molit_ingest.main(["--gu", "종로구", "--from", broken, "--to", this_month, "--rate", "1000",
+                              "--data-dir", str(tmp_path), "--checkpoint", str(checkpoint)])
+
+    assert code == 1
+    with open(checkpoint, encoding="utf-8") as f:
+        done = json.load(f)["done"]
+    # 이번 달은 수집에 성공했어도 체크포인트에 두지 않음
+    assert done == [f"11110:{closed}"]
+    assert {c["DEAL_YMD"] for c in stub.calls} == {broken, closed, this_month}
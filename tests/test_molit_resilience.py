@@ -0,0 +1,195 @@
+"""장애 주입 — 503 · 응답 없는 소켓 · 잘린 XML · 죽은 엔드포인트에서의 재시도 / 회로 차단기 / 실패 항목 재수집"""
+
+import socket
+import threading
+import time
+
+import pytest
+import requests
+
+import molit_client
+from molit_client import (MAX_RETRIES, CircuitBreaker, CircuitOpenError, fetch_molit_bulk, fetch_molit_data,
+                          retry_failures)
+
+TARGETS = {"종로구": "11110", "중구": "11140", "용산구": "11170"}
+DEAL_YMDS = ["202401", "202402"]
+
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    """백오프 대기 없이 재시도 — 호출된 attempt 번호를 기록"""
+    attempts = []
+
+    def no_wait(attempt):
+        attempts.append(attempt)
+        return 0
+
+    monkeypatch.setattr(molit_client, "_backoff", no_wait)
+    return attempts
+
+
+def use_breaker(monkeypatch, url, **kwargs):
+    breaker = CircuitBreaker(**kwargs)
+    monkeypatch.setitem(molit_client._breakers, url, breaker)
+    return breaker
+
+
+def fetch_one(fetch_kwargs, lawd_cd="11110", deal_ymd="202401"):
+    return fetch_molit_data(lawd_cd, deal_ymd, session=fetch_kwargs["session"], service_key=fetch_kwargs["service_key"],
+                            url=fetch_kwargs["url"], rate_per_sec=fetch_kwargs["rate_per_sec"])
+
+
+def test_503_is_retried_with_backoff(stub, fetch_kwargs, backoffs):
+    stub.fault = lambda call_no, params: "503" if call_no <= 2 else None
+    df = fetch_one(fetch_kwargs)
+    assert len(df) == stub.default_total
+    assert len(stub.calls) == 3
+    assert backoffs == [0, 1]
+
+
+def test_503_gives_up_after_max_retries(stub, fetch_kwargs, backoffs):
+    stub.fault = lambda call_no, params: "503"
+    result = fetch_molit_bulk({"종로구": "11110"}, ["202401"], **fetch_kwargs)
+    assert [f.kind for f in result.failures] == ["network"]
+    assert isinstance(result.failures[0].error, requests.HTTPError)
+    assert result.requests == len(stub.calls) == MAX_RETRIES + 1
+    assert backoffs == list(range(MAX_RETRIES))
+    assert result.partitions == []
+
+
+def test_hung_socket_times_out_and_retries(stub, fetch_kwargs, backoffs, monkeypatch):
+    monkeypatch.setattr(molit_client, "READ_TIMEOUT", 0.2)
+    stub.hang_seconds = 1.0
+    stub.fault = lambda call_no, params: "hang" if call_no == 1 else None
+    df = fetch_one(fetch_kwargs)
+    assert len(df) == stub.default_total
+    assert len(stub.calls) == 2
+    assert backoffs == [0]
+
+    stub.calls.clear()
+    stub.fault = lambda call_no, params: "hang"
+    result = fetch_molit_bulk({"종로구": "11110"}, ["202401"], **fetch_kwargs)
+    assert [f.kind for f in result.failures] == ["timeout"]
+    assert len(stub.calls) == MAX_RETRIES + 1
+
+
+def test_malformed_xml_is_retried(stub, fetch_kwargs, backoffs):
+    stub.fault = lambda call_no, params: "malformed" if call_no == 1 else None
+    df = fetch_one(fetch_kwargs)
+    assert len(df) == stub.default_total
+    assert len(stub.calls) == 2
+
+    stub.calls.clear()
+    stub.fault = lambda call_no, params: "malformed"
+    result = fetch_molit_bulk({"종로구": "11110"}, ["202401"], **fetch_kwargs)
+    assert [f.kind for f in result.failures] == ["other"]
+    assert len(stub.calls) == MAX_RETRIES + 1
+
+
+def test_dead_endpoint(fetch_kwargs, backoffs, monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    url = f"http://127.0.0.1:{port}/getRTMSDataSvcNrgTrade"
+    use_breaker(monkeypatch, url)
+    result = fetch_molit_bulk({"종로구": "11110"}, ["202401"], **{**fetch_kwargs, "url": url})
+    assert [f.kind for f in result.failures] == ["network"]
+    assert isinstance(result.failures[0].error, requests.ConnectionError)
+    assert result.requests == MAX_RETRIES + 1
+    assert backoffs == list(range(MAX_RETRIES))
+
+
+def test_breaker_opens_then_recovers_through_half_open(stub, fetch_kwargs, backoffs, monkeypatch):
+    breaker = use_breaker(monkeypatch, stub.url, failure_threshold=2, reset_timeout=0.3)
+    stub.fault = lambda call_no, params: "503"
+
+    # 연속 2회 실패로 열림 → 세 번째 시도는 요청 없이 CircuitOpenError (원인은 마지막 503)
+    with pytest.raises(CircuitOpenError) as excinfo:
+        fetch_one(fetch_kwargs)
+    assert breaker.state == "open"
+    assert len(stub.calls) == 2
+    assert isinstance(excinfo.value.__cause__, requests.HTTPError)
+
+    result = fetch_molit_bulk(TARGETS, DEAL_YMDS, **fetch_kwargs)
+    assert {f.kind for f in result.failures} == {"circuit_open"}
+    assert all(isinstance(f.cause, requests.HTTPError) for f in result.failures)
+    assert len(stub.calls) == 2 and result.requests == 0
+
+    # reset_timeout 뒤 시험 요청이 실패하면 다시 열림
+    time.sleep(0.35)
+    with pytest.raises(CircuitOpenError):
+        fetch_one(fetch_kwargs)
+    assert breaker.state == "open"
+    assert len(stub.calls) == 3
+
+    # 시험 요청이 성공하면 닫히고 정상 수집
+    time.sleep(0.35)
+    stub.fault = None
+    result = fetch_molit_bulk(TARGETS, DEAL_YMDS, **fetch_kwargs)
+    assert not result.failures
+    assert breaker.state == "closed" and breaker.failures == 0 and breaker.last_error is None
+
+
+def test_retry_failures_refetches_only_failed_partitions(stub, fetch_kwargs, backoffs, monkeypatch):
+    use_breaker(monkeypatch, stub.url, failure_threshold=100)
+    broken = {("11140", "202402"), ("11170", "202401")}
+    stub.fault = lambda call_no, params: "503" if (params["LAWD_CD"], params["DEAL_YMD"]) in broken else None
+    expected = fetch_molit_bulk(TARGETS, DEAL_YMDS, **fetch_kwargs)
+    assert sorted((f.lawd_cd, f.deal_ymd) for f in expected.failures) == sorted(broken)
+
+    stub.fault = None
+    stub.calls.clear()
+    result = retry_failures(expected.failures, **fetch_kwargs)
+    assert not result.failures
+    assert sorted((c["LAWD_CD"], c["DEAL_YMD"]) for c in stub.calls) == sorted(broken)
+    assert sorted(result.partitions) == sorted(broken)
+    assert len(expected.partitions) + len(result.partitions) == len(TARGETS) * len(DEAL_YMDS)
+
+
+def test_aborted_probe_does_not_leave_breaker_half_open(stub, fetch_kwargs, backoffs, monkeypatch):
+    breaker = use_breaker(monkeypatch, stub.url, failure_threshold=1, reset_timeout=0.2)
+    stub.fault = lambda call_no, params: "503" if call_no == 1 else None
+    with pytest.raises(CircuitOpenError):
+        fetch_one(fetch_kwargs)
+    time.sleep(0.25)
+
+    # 시험 요청이 성공 / 실패를 기록하기 전에 예외 계층 밖의 오류(KeyboardInterrupt)로 끝남
+    parse = molit_client.parse_molit_xml
+    probe_started, release = threading.Event(), threading.Event()
+
+    def interrupted_parse(content):
+        if not probe_started.is_set():
+            probe_started.set()
+            release.wait(5)
+            raise KeyboardInterrupt
+        return parse(content)
+
+    monkeypatch.setattr(molit_client, "parse_molit_xml", interrupted_parse)
+    outcomes = {}
+
+    def run(name):
+        try:
+            outcomes[name] = fetch_one(fetch_kwargs)
+        except BaseException as e:
+            outcomes[name] = e
+
+    probe = threading.Thread(target=run, args=("probe",), daemon=True)
+    probe.start()
+    assert probe_started.wait(5)
+    waiter = threading.Thread(target=run, args=("waiter",), daemon=True)
+    waiter.start()
+    time.sleep(0.05)
+    assert breaker.state == "half_open" and waiter.is_alive()   # 시험 요청 결과를 기다리는 중
+
+    release.set()
+    probe.join(5)
+    waiter.join(5)
+    assert not probe.is_alive() and not waiter.is_alive()
+    assert isinstance(outcomes["probe"], KeyboardInterrupt)
+    assert isinstance(outcomes["waiter"], CircuitOpenError)
+    assert breaker.state == "open"
+
+    # 다시 reset_timeout 뒤에는 정상 시험 요청으로 닫힘
+    time.sleep(0.25)
+    assert len(fetch_one(fetch_kwargs)) == stub.default_total
+    assert breaker.state == "closed"
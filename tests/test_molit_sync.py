@@ -0,0 +1,43 @@
+"""증분 동기화 — 다시 받은 파티션만 교체하고 나머지 기존 행은 유지"""
+
+import pandas as pd
+
+from molit_client import FetchResult, fetch_molit_bulk, merge_molit_partitions, partition_keys, sync_molit_partitions
+from molit_store import MolitStore
+
+
+def frame(lawd_cd, deal_ymd, amounts):
+    return pd.DataFrame({
+        "sggCd": lawd_cd,
+        "dealYear": pd.array([int(deal_ymd[:4])] * len(amounts), dtype="Int16"),
+        "dealMonth": pd.array([int(deal_ymd[4:])] * len(amounts), dtype="Int16"),
+        "dealAmount": [float(a) for a in amounts],
+    })
+
+
+def test_merge_replaces_only_refreshed_partitions():
+    base = pd.concat([frame("11110", "202301", [1, 2]), frame("11110", "202401", [3]), frame("11140", "202401", [4])],
+                     ignore_index=True)
+    result = FetchResult(frame=pd.concat([frame("11110", "202401", [30, 31]), frame("11110", "202402", [5])],
+                                         ignore_index=True),
+                         partitions=[("11110", "202401"), ("11110", "202402")])
+
+    merged = merge_molit_partitions(base, result)
+
+    by_key = merged.groupby(partition_keys(merged))["dealAmount"].apply(sorted).to_dict()
+    assert by_key == {"11110202301": [1.0, 2.0], "11110202401": [30.0, 31.0], "11140202401": [4.0],
+                      "11110202402": [5.0]}
+
+
+def test_sync_keeps_rows_outside_the_synced_range(stub, fetch_kwargs, tmp_path):
+    store = MolitStore(str(tmp_path))
+    targets = {"종로구": "11110"}
+    first = fetch_molit_bulk(targets, ["202301", "202302"], store=store, **fetch_kwargs)
+    loaded = set(first.partitions)
+
+    result = sync_molit_partitions(store, targets, ["202401"], loaded=loaded, **fetch_kwargs)
+    merged = merge_molit_partitions(first.frame, result)
+
+    assert result.partitions == [("11110", "202401")]
+    assert sorted(partition_keys(merged).unique()) == ["11110202301", "11110202302", "11110202401"]
+    assert len(merged) == len(first.frame) + len(result.frame)
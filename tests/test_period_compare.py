@@ -0,0 +1,51 @@
+"""기간 비교 엔진 — 모든 기간에 데이터가 있는 업종이 없어도 열 구성은 같다"""
+
+import pandas as pd
+
+from business_stats import ROWS_COL
+from period_compare import PeriodComparison
+
+
+def cube(years):
+    rows = [(year, month, name) for year in years for month in (1, 2) for name in ("카페", "편의점")]
+    df = pd.DataFrame(rows, columns=["Year", "Month", "업종명"])
+    df["창업수"] = range(1, len(df) + 1)
+    df["폐업수"] = 1
+    df[ROWS_COL] = 2
+    return df
+
+
+def test_compare_values():
+    df = cube([2018, 2019, 2021])
+    engine = PeriodComparison(df, n_boot=200)
+    out = engine.compare(((2018, 2019), (2021,))).set_index("업종명")
+    assert list(out.index) == ["카페", "편의점"]
+
+    # 원본 행 기준 평균: 셀마다 행수만큼 같은 값이 있었다고 보면 합계 ÷ 행 수
+    for k, years in enumerate(((2018, 2019), (2021,))):
+        part = df[df["Year"].isin(years)].groupby("업종명")[["창업수", ROWS_COL]].sum()
+        pd.testing.assert_series_equal(out[f"평균_{k}"], part["창업수"] / part[ROWS_COL], check_names=False)
+        # 셀을 원본 행으로 펼친 뒤 groupby().mean() 과도 같다
+        rows = df[df["Year"].isin(years)].loc[lambda d: d.index.repeat(d[ROWS_COL])]
+        expanded = rows.assign(창업수=rows["창업수"] / rows[ROWS_COL]).groupby("업종명")["창업수"].mean()
+        pd.testing.assert_series_equal(out[f"평균_{k}"], expanded, check_names=False)
+
+    pd.testing.assert_series_equal(out["변화량_1"], out["평균_1"] - out["평균_0"], check_names=False)
+    pd.testing.assert_series_equal(out["변화율_1"], (out["평균_1"] - out["평균_0"]) / out["평균_0"] * 100,
+                                   check_names=False)
+    assert (out["하한_1"] <= out["변화량_1"]).all() and (out["변화량_1"] <= out["상한_1"]).all()
+    assert (out["하한_1"] < out["상한_1"]).all()
+
+    # 같은 seed 면 신뢰구간도 같다 (캐시를 거치지 않은 새 엔진으로 비교)
+    again = PeriodComparison(df, n_boot=200).compare(((2018, 2019), (2021,))).set_index("업종명")
+    pd.testing.assert_frame_equal(out, again)
+
+
+def test_compare_without_overlapping_industries_keeps_columns():
+    engine = PeriodComparison(cube([2018, 2019]), n_boot=50)
+    empty = engine.compare(((2018, 2019), (2021,)))
+    full = PeriodComparison(cube([2018, 2019, 2021]), n_boot=50).compare(((2018, 2019), (2021,)))
+    assert empty.empty
+    assert list(empty.columns) == list(full.columns)
+    # 대시보드가 하는 정렬 · 선택이 그대로 동작
+    empty.sort_values(by="변화량_1", key=abs)[["변화량_1", "변화율_1", "하한_1", "상한_1"]]